@@ -0,0 +1,150 @@
+"""
+Per-department aggregates computed in the database. Every query groups by
+department, so each returns O(departments) rows whatever the headcount.
+"""
+import datetime
+
+from django.db import connection
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from .models import Employee, PerformanceReview, Attendance, AttendanceRollup, LEAVE_STATUSES, PRESENT_STATUSES, RATINGS
+from .rollups import month_start
+
+# Exact median (mean of the middle one or two salaries) and nearest-rank
+# p90 (the lowest salary with at least 90% of the department at or below
+# it). The window functions rank salaries within each department in one pass.
+SALARY_PERCENTILES_SQL = '''
+WITH ranked AS (
+    SELECT department, salary,
+           ROW_NUMBER() OVER (PARTITION BY department ORDER BY salary) AS position,
+           COUNT(*) OVER (PARTITION BY department) AS size
+    FROM employee_employee
+    WHERE NOT archived AND salary IS NOT NULL
+)
+SELECT department,
+       AVG(CASE WHEN position IN ((size + 1) / 2, (size + 2) / 2) THEN salary END),
+       MIN(CASE WHEN position * 10 >= size * 9 THEN salary END)
+FROM ranked
+GROUP BY department
+'''
+
+
+def _number(value, places=2):
+    return round(float(value), places) if value is not None else None
+
+
+def _rate(part, whole):
+    return round(part / whole, 4) if whole else None
+
+
+def _midnight(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _whole_months(start, end):
+    starts_on_month = start is None or start.day == 1
+    ends_on_month = end is None or (end + datetime.timedelta(days=1)).day == 1
+    return starts_on_month and ends_on_month
+
+
+def headcount_and_salaries():
+    rows = (
+        Employee.objects.filter(archived=False)
+        .values('department')
+        .annotate(headcount=Count('id'), active=Count('id', filter=Q(active=True)), average_salary=Avg('salary'))
+        .order_by('department')
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(SALARY_PERCENTILES_SQL)
+        percentiles = {department: (median, p90) for department, median, p90 in cursor.fetchall()}
+
+    stats = {}
+    for row in rows:
+        median, p90 = percentiles.get(row['department'], (None, None))
+        stats[row['department']] = {
+            "headcount": row['headcount'],
+            "active": row['active'],
+            "salary": {
+                "average": _number(row['average_salary']),
+                "median": _number(median),
+                "p90": _number(p90),
+            },
+        }
+    return stats
+
+
+def ratings(start=None, end=None):
+    reviews = PerformanceReview.objects.filter(employee__archived=False)
+    if start:
+        reviews = reviews.filter(created_at__gte=_midnight(start))
+    if end:
+        reviews = reviews.filter(created_at__lt=_midnight(end + datetime.timedelta(days=1)))
+
+    stats = {}
+    rows = reviews.values('employee__department', 'rating').annotate(count=Count('id')).order_by()
+    for row in rows:
+        department = stats.setdefault(row['employee__department'], {"reviews": 0, "total": 0, "distribution": dict.fromkeys(map(str, RATINGS), 0)})
+        department["reviews"] += row['count']
+        department["total"] += row['rating'] * row['count']
+        department["distribution"][str(row['rating'])] = row['count']
+    return {
+        name: {
+            "reviews": department["reviews"],
+            "average": _number(department["total"] / department["reviews"]),
+            "distribution": department["distribution"],
+        }
+        for name, department in stats.items()
+    }
+
+
+def attendance_rates(start=None, end=None):
+    """
+    Present and leave rates over the attendance records in the window. Whole
+    months are read from the monthly rollups instead of the attendance rows.
+    """
+    if _whole_months(start, end):
+        rollups = AttendanceRollup.objects.filter(employee__archived=False)
+        if start:
+            rollups = rollups.filter(month__gte=month_start(start))
+        if end:
+            rollups = rollups.filter(month__lte=month_start(end))
+        rows = rollups.values('employee__department').annotate(
+            records=Sum('records'), present=Sum('days_present'), leave=Sum('days_leave')
+        )
+    else:
+        attendance = Attendance.objects.filter(employee__archived=False)
+        if start:
+            attendance = attendance.filter(date__gte=start)
+        if end:
+            attendance = attendance.filter(date__lte=end)
+        rows = attendance.values('employee__department').annotate(
+            records=Count('id'),
+            present=Count('id', filter=Q(status__in=PRESENT_STATUSES)),
+            leave=Count('id', filter=Q(status__in=LEAVE_STATUSES)),
+        )
+
+    return {
+        row['employee__department']: {
+            "records": row['records'],
+            "present_rate": _rate(row['present'], row['records']),
+            "leave_rate": _rate(row['leave'], row['records']),
+        }
+        for row in rows.order_by()
+    }
+
+
+def department_analytics(start=None, end=None):
+    """Headcount and salaries as of now; ratings and attendance within [start, end]."""
+    departments = headcount_and_salaries()
+    review_stats = ratings(start, end)
+    attendance_stats = attendance_rates(start, end)
+    return [
+        {
+            "department": name,
+            **stats,
+            "ratings": review_stats.get(name, {"reviews": 0, "average": None, "distribution": dict.fromkeys(map(str, RATINGS), 0)}),
+            "attendance": attendance_stats.get(name, {"records": 0, "present_rate": None, "leave_rate": None}),
+        }
+        for name, stats in departments.items()
+    ]
@@ -0,0 +1,120 @@
+"""
+ASGI-native versions of the attendance hot paths. They run on the event loop
+and use Django's async ORM, so a check-in burst doesn't queue behind the
+sync_to_async thread pool the DRF viewsets need under ASGI. Responses match
+the AttendanceViewSet actions they mirror.
+
+Check-in and check-out share employee.bulk's record_check_in/_out with the
+sync views. The async ORM has no transactions, so those run in one
+sync_to_async call to write the row and its rollup atomically.
+
+employee_attendance goes through the same cached_read as the sync action.
+The version check and the response cache are sync code, so the whole read
+is one sync_to_async call; a hit or a 304 is answered there without
+touching the attendance table.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from .authentication import ClaimsJWTAuthentication
+from .bulk import record_check_in, record_check_out
+from .cache import cached_read
+from .models import Employee, Attendance
+from .serializers import AttendanceSerializer
+from .views import AttendanceViewSet
+
+_jwt = ClaimsJWTAuthentication()
+_record_check_in = sync_to_async(record_check_in)
+_record_check_out = sync_to_async(record_check_out)
+_cached_read = sync_to_async(cached_read)
+
+
+def _respond(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(JSONRenderer().render(data), status=status_code, content_type='application/json')
+
+
+async def _authenticate(request):
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return await _jwt.aget_user(_jwt.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+def _unauthorized():
+    return _respond({"detail": "Authentication credentials were not provided."}, status.HTTP_401_UNAUTHORIZED)
+
+
+def _employee_attendance(pk):
+    employee = Employee.objects.filter(pk=pk).first()
+    if not employee:
+        return _respond({"error": "Employee not found"}, status.HTTP_404_NOT_FOUND)
+
+    attendance = list(Attendance.objects.filter(employee=employee))
+    if not attendance:
+        return _respond({"message": "No attendance records found for this employee."}, status.HTTP_404_NOT_FOUND)
+
+    for record in attendance:
+        record.employee = employee
+    return _respond(AttendanceSerializer(attendance, many=True).data)
+
+
+@require_GET
+async def employee_attendance(request, pk):
+    user = await _authenticate(request)
+    if user is None:
+        return _unauthorized()
+
+    # Cached per user, like the DRF views.
+    request.user = user
+    return await _cached_read(request, AttendanceViewSet.cache_models, lambda: _employee_attendance(pk))
+
+
+@csrf_exempt
+@require_POST
+async def check_in(request, pk):
+    if await _authenticate(request) is None:
+        return _unauthorized()
+
+    employee = await Employee.objects.filter(pk=pk).afirst()
+    if not employee:
+        return _respond({"error": "Employee not found"}, status.HTTP_404_NOT_FOUND)
+
+    try:
+        attendance = await _record_check_in(employee)
+    except ValueError as exc:
+        return _respond({"error": str(exc)}, status.HTTP_400_BAD_REQUEST)
+
+    return _respond({
+        "message": "Check-in recorded",
+        "attendance": AttendanceSerializer(attendance).data
+    }, status.HTTP_201_CREATED)
+
+
+@csrf_exempt
+@require_POST
+async def check_out(request, pk):
+    if await _authenticate(request) is None:
+        return _unauthorized()
+
+    employee = await Employee.objects.filter(pk=pk).afirst()
+    if not employee:
+        return _respond({"error": "Employee not found"}, status.HTTP_404_NOT_FOUND)
+
+    try:
+        attendance = await _record_check_out(employee)
+    except ValueError as exc:
+        return _respond({"error": str(exc)}, status.HTTP_400_BAD_REQUEST)
+
+    return _respond({
+        "message": "Check-out recorded",
+        "attendance": AttendanceSerializer(attendance).data
+    })
@@ -0,0 +1,139 @@
+"""
+JWT authentication that trusts the token's claims instead of loading the
+user row on every request. Only the user's active flag and revocation time
+are checked, from a short-lived in-process cache, so an authenticated
+request costs at most one small query per user per JWT_CLAIMS_AUTH['STATE_TTL']
+seconds. Set JWT_CLAIMS_AUTH['STRICT'] to load the full user every time.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .cache import LRUBackend
+
+User = get_user_model()
+
+CLAIMS = ('username', 'employee_id', 'is_staff', 'is_superuser')
+
+_states = None
+
+
+def _config():
+    return getattr(settings, 'JWT_CLAIMS_AUTH', {})
+
+
+def _state_cache():
+    global _states
+    if _states is None:
+        _states = LRUBackend(max_entries=_config().get('MAX_ENTRIES', 10000))
+    return _states
+
+
+def _reset_state_cache(setting, **kwargs):
+    global _states
+    if setting == 'JWT_CLAIMS_AUTH':
+        _states = None
+
+
+setting_changed.connect(_reset_state_cache)
+
+
+def forget_user_state(user_id):
+    _state_cache().delete(f'user:{user_id}')
+
+
+def _forget_saved_user(sender, instance, **kwargs):
+    forget_user_state(instance.pk)
+
+
+post_save.connect(_forget_saved_user, sender=User, dispatch_uid='claims_auth_user_saved')
+post_delete.connect(_forget_saved_user, sender=User, dispatch_uid='claims_auth_user_deleted')
+
+
+def tokens_for(user):
+    """A refresh token (and its access token) carrying the claims ClaimsUser reads."""
+    refresh = RefreshToken.for_user(user)
+    for claim in CLAIMS:
+        refresh[claim] = getattr(user, claim)
+    return refresh
+
+
+def revoke_tokens(user):
+    """Reject every token issued to `user` up to now."""
+    user.tokens_valid_after = timezone.now()
+    user.save(update_fields=['tokens_valid_after'])
+
+
+class ClaimsUser(TokenUser):
+    """A user built from token claims. It has no database row to save."""
+
+    @cached_property
+    def employee_id(self):
+        return self.token.get('employee_id', '')
+
+
+def _state_query(user_id):
+    return User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).values_list('is_active', 'tokens_valid_after')
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if _config().get('STRICT', False) or not self._has_claims(validated_token):
+            return self._check_revoked(super().get_user(validated_token), validated_token)
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        state = self._cached_state(user_id)
+        if state is None:
+            state = self._store_state(user_id, _state_query(user_id).first())
+        return self._user_from_claims(validated_token, state)
+
+    async def aget_user(self, validated_token):
+        """get_user for async views: the state query runs on the event loop."""
+        if _config().get('STRICT', False) or not self._has_claims(validated_token):
+            user = await sync_to_async(super().get_user)(validated_token)
+            return self._check_revoked(user, validated_token)
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        state = self._cached_state(user_id)
+        if state is None:
+            state = self._store_state(user_id, await _state_query(user_id).afirst())
+        return self._user_from_claims(validated_token, state)
+
+    def _has_claims(self, validated_token):
+        return jwt_settings.USER_ID_CLAIM in validated_token and all(claim in validated_token for claim in CLAIMS)
+
+    def _cached_state(self, user_id):
+        return _state_cache().get(f'user:{user_id}')
+
+    def _store_state(self, user_id, row):
+        # Missing users are cached too, so a deleted account's tokens don't
+        # query the database on every request until they expire.
+        state = row or (False, None)
+        _state_cache().set(f'user:{user_id}', state, _config().get('STATE_TTL', 30))
+        return state
+
+    def _user_from_claims(self, validated_token, state):
+        is_active, tokens_valid_after = state
+        if not is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        self._reject_if_revoked(validated_token, tokens_valid_after)
+        return ClaimsUser(validated_token)
+
+    def _check_revoked(self, user, validated_token):
+        self._reject_if_revoked(validated_token, user.tokens_valid_after)
+        return user
+
+    def _reject_if_revoked(self, validated_token, tokens_valid_after):
+        # iat is in whole seconds, so a token from the second of the
+        # revocation can't be told apart from one issued just before it and
+        # is rejected too; it only costs a login made in that same second.
+        if tokens_valid_after and validated_token.get('iat', 0) <= int(tokens_valid_after.timestamp()):
+            raise InvalidToken(_('Token has been revoked'))
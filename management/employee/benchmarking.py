@@ -0,0 +1,109 @@
+import datetime
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Employee, SalaryHistory, PerformanceReview, Attendance
+
+User = get_user_model()
+
+DEPARTMENTS = ['Engineering', 'Finance', 'Human Resources', 'Operations', 'Sales', 'Support']
+POSITIONS = ['Associate', 'Analyst', 'Specialist', 'Lead', 'Manager']
+
+
+@contextmanager
+def scratch_database(file_backed=False):
+    """
+    Run benchmarks against a throwaway test database so they never write
+    into the real one. The response cache is off so every request does the
+    work being measured, and reads skip the replicas. `file_backed` keeps a
+    SQLite test database on disk instead of in memory, for benchmarks where
+    locking and journaling matter.
+    """
+    old_name = connection.settings_dict['NAME']
+    if file_backed and connection.vendor == 'sqlite':
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with override_settings(RESPONSE_CACHE={'ENABLED': False}, DATABASE_REPLICAS=[]):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def api_client():
+    user, _ = User.objects.get_or_create(username='benchmark', defaults={'employee_id': 'benchmark'})
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def seed(employees, rows_per_employee, tables=('salary', 'reviews', 'attendance'), batch_size=5000, start=datetime.date(2020, 1, 1)):
+    """
+    Bulk-insert `employees` employees, each with `rows_per_employee` rows in
+    every table named in `tables` (salary changes, performance reviews and
+    attendance days).
+    """
+    rng = random.Random(employees * 7919 + rows_per_employee)
+    hired = timezone.make_aware(datetime.datetime.combine(start, datetime.time.min))
+    Employee.objects.bulk_create(
+        (
+            Employee(
+                name=f'Employee {i}',
+                department=rng.choice(DEPARTMENTS),
+                position=rng.choice(POSITIONS),
+                salary=Decimal(rng.randrange(20000, 150000)),
+                created_at=hired,
+            )
+            for i in range(employees)
+        ),
+        batch_size=batch_size,
+    )
+    ids = list(Employee.objects.values_list('id', flat=True))
+
+    def rows(build):
+        batch = []
+        for employee_id in ids:
+            for n in range(rows_per_employee):
+                batch.append(build(employee_id, n))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    if 'salary' in tables:
+        for batch in rows(lambda employee_id, n: SalaryHistory(
+                employee_id=employee_id, previous_salary=Decimal(20000 + n * 500), new_salary=Decimal(20500 + n * 500))):
+            SalaryHistory.objects.bulk_create(batch)
+    if 'reviews' in tables:
+        for batch in rows(lambda employee_id, n: PerformanceReview(
+                employee_id=employee_id, review='Meets expectations.', rating=rng.randint(1, 10))):
+            PerformanceReview.objects.bulk_create(batch)
+    if 'attendance' in tables:
+        for batch in rows(lambda employee_id, n: Attendance(
+                employee_id=employee_id,
+                date=start + datetime.timedelta(days=n),
+                check_in_time=datetime.time(8, rng.randrange(60)),
+                check_out_time=datetime.time(17, rng.randrange(60)),
+                status=rng.choice(['Present', 'Present', 'Present', 'Late', 'Absent', 'leave']),
+                overtime_hours=rng.choice([0, 0, 0, 0.5, 1.0, 2.0]))):
+            Attendance.objects.bulk_create(batch)
+    return ids
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
@@ -0,0 +1,375 @@
+import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware, now
+
+from .cache import models_changed
+from .leaderboard import refresh_leaderboard
+from .models import Employee, SalaryHistory, PerformanceReview, Attendance, RATINGS
+from .rollups import refresh_attendance_rollups
+
+ATTENDANCE_EVENT_KINDS = ('check_in', 'check_out')
+
+
+def overtime_for(date, check_in_time, check_out_time):
+    worked = datetime.datetime.combine(date, check_out_time) - datetime.datetime.combine(date, check_in_time)
+    return max(0, worked.total_seconds() / 3600 - 8)
+
+
+def record_check_in(employee):
+    """
+    Record today's check-in and refresh its rollup in one transaction.
+    Raises ValueError if the day already has a row. Shared by the sync and
+    async check-in views.
+    """
+    moment = now()
+    with transaction.atomic():
+        attendance, created = Attendance.objects.get_or_create(
+            employee=employee,
+            date=moment.date(),
+            defaults={'check_in_time': moment.time(), 'status': 'Present'}
+        )
+        if not created:
+            raise ValueError('Check-in already recorded')
+        refresh_attendance_rollups([(employee.id, attendance.date)])
+    return attendance
+
+
+def record_check_out(employee):
+    """
+    Record today's check-out with its overtime and refresh the rollup, in one
+    transaction. Raises ValueError if there is no check-in or already a
+    check-out.
+    """
+    moment = now()
+    with transaction.atomic():
+        attendance = Attendance.objects.select_for_update().filter(employee=employee, date=moment.date()).first()
+        if not attendance:
+            raise ValueError('No check-in record found')
+        if attendance.check_out_time:
+            raise ValueError('Check-out already recorded')
+        attendance.check_out_time = moment.time()
+        if attendance.check_in_time:
+            attendance.overtime_hours = overtime_for(attendance.date, attendance.check_in_time, attendance.check_out_time)
+        attendance.save()
+        refresh_attendance_rollups([(employee.id, attendance.date)])
+    attendance.employee = employee
+    return attendance
+
+
+def parse_attendance_event(event):
+    if not isinstance(event, dict):
+        raise ValueError('Each event must be an object.')
+
+    try:
+        employee_id = int(event['employee_id'])
+    except KeyError:
+        raise ValueError('employee_id is required.')
+    except (TypeError, ValueError):
+        raise ValueError('employee_id must be an integer.')
+
+    kind = event.get('kind')
+    if kind not in ATTENDANCE_EVENT_KINDS:
+        raise ValueError(f'kind must be one of: {", ".join(ATTENDANCE_EVENT_KINDS)}.')
+
+    timestamp = event.get('timestamp')
+    parsed = parse_datetime(timestamp) if isinstance(timestamp, str) else None
+    if parsed is None:
+        raise ValueError('timestamp must be an ISO 8601 datetime.')
+    if is_naive(parsed):
+        parsed = make_aware(parsed)
+    return employee_id, parsed.astimezone(datetime.timezone.utc), kind
+
+
+def ingest_attendance(events):
+    """
+    Apply a batch of badge-reader events. Employees and the attendance rows the
+    batch touches are each loaded with one query, new days are written with a
+    single bulk_create and check-outs on existing days with a single
+    bulk_update. Returns one result dict per event, in input order.
+    """
+    results = [None] * len(events)
+    parsed = []
+    for index, event in enumerate(events):
+        try:
+            parsed.append((index, *parse_attendance_event(event)))
+        except ValueError as exc:
+            results[index] = {'index': index, 'status': 'error', 'error': str(exc)}
+
+    employees = Employee.objects.in_bulk({employee_id for _, employee_id, _, _ in parsed})
+    accepted = []
+    for item in parsed:
+        if item[1] in employees:
+            accepted.append(item)
+        else:
+            results[item[0]] = {'index': item[0], 'status': 'error', 'error': 'Employee not found'}
+
+    # Events are applied in time order so a check-out that arrives in the same
+    # batch as its check-in still finds it.
+    accepted.sort(key=lambda item: item[2])
+
+    with transaction.atomic():
+        rows = {
+            (row.employee_id, row.date): row
+            for row in Attendance.objects.select_for_update().filter(
+                employee_id__in={item[1] for item in accepted},
+                date__in={item[2].date() for item in accepted},
+            )
+        }
+        created, updated, events_by_key = {}, {}, {}
+
+        for index, employee_id, timestamp, kind in accepted:
+            key = (employee_id, timestamp.date())
+            row = rows.get(key)
+
+            if kind == 'check_in':
+                if row is not None:
+                    results[index] = {'index': index, 'status': 'error', 'error': 'Check-in already recorded'}
+                    continue
+                row = rows[key] = created[key] = Attendance(
+                    employee_id=employee_id,
+                    date=key[1],
+                    check_in_time=timestamp.time(),
+                    status='Present',
+                )
+            else:
+                if row is None:
+                    results[index] = {'index': index, 'status': 'error', 'error': 'No check-in record found'}
+                    continue
+                if row.check_out_time:
+                    results[index] = {'index': index, 'status': 'error', 'error': 'Check-out already recorded'}
+                    continue
+                row.check_out_time = timestamp.time()
+                if row.check_in_time:
+                    row.overtime_hours = overtime_for(row.date, row.check_in_time, row.check_out_time)
+                if key not in created:
+                    updated[key] = row
+
+            events_by_key.setdefault(key, []).append((index, kind))
+
+        # A concurrent single check-in can still win the (employee, date)
+        # constraint between the read above and this insert; those rows are
+        # skipped here and reported as conflicts below.
+        Attendance.objects.bulk_create(created.values(), ignore_conflicts=True)
+        Attendance.objects.bulk_update(updated.values(), ['check_out_time', 'overtime_hours'])
+        refresh_attendance_rollups(events_by_key)
+        # Bulk writes skip post_save, so the change is recorded here.
+        models_changed(Attendance)
+
+        stored = {}
+        if created:
+            for row in Attendance.objects.filter(
+                employee_id__in={employee_id for employee_id, _ in created},
+                date__in={date for _, date in created},
+            ).only('id', 'employee_id', 'date', 'check_in_time'):
+                stored[(row.employee_id, row.date)] = row
+
+    for key, items in events_by_key.items():
+        row = updated.get(key)
+        if key in created:
+            row = stored.get(key)
+            if row is None or row.check_in_time != created[key].check_in_time:
+                for index, _ in items:
+                    results[index] = {'index': index, 'status': 'error', 'error': 'Check-in already recorded'}
+                continue
+        for index, kind in items:
+            results[index] = {
+                'index': index,
+                'status': 'created' if kind == 'check_in' else 'updated',
+                'attendance_id': row.id,
+            }
+
+    return results
+
+
+def parse_review(item):
+    if not isinstance(item, dict):
+        raise ValueError('Each review must be an object.')
+
+    try:
+        employee_id = int(item['employee_id'])
+    except KeyError:
+        raise ValueError('employee_id is required.')
+    except (TypeError, ValueError):
+        raise ValueError('employee_id must be an integer.')
+
+    review = item.get('review')
+    if not isinstance(review, str) or not review.strip():
+        raise ValueError('review is required.')
+
+    rating = item.get('rating')
+    if isinstance(rating, str) and rating.strip().isdigit():
+        rating = int(rating)
+    if isinstance(rating, bool) or not isinstance(rating, int) or rating not in RATINGS:
+        raise ValueError(f'rating must be a whole number from {RATINGS[0]} to {RATINGS[-1]}.')
+    return employee_id, review, rating
+
+
+def submit_reviews(items, batch_size=5000):
+    """
+    Create a batch of performance reviews. Every item is validated first,
+    the employees are resolved with one in_bulk query and the valid reviews
+    go out with bulk_create in one transaction, together with the
+    leaderboard entries of the employees they touch. Invalid items are
+    reported and skipped. Returns one result dict per item, in input order.
+    """
+    results = [None] * len(items)
+    parsed = []
+    for index, item in enumerate(items):
+        try:
+            parsed.append((index, *parse_review(item)))
+        except ValueError as exc:
+            results[index] = {'index': index, 'status': 'error', 'error': str(exc)}
+
+    employees = Employee.objects.only('id').in_bulk({employee_id for _, employee_id, _, _ in parsed})
+    accepted = []
+    for index, employee_id, review, rating in parsed:
+        if employee_id in employees:
+            accepted.append((index, PerformanceReview(employee_id=employee_id, review=review, rating=rating)))
+        else:
+            results[index] = {'index': index, 'status': 'error', 'error': 'Employee not found'}
+
+    if accepted:
+        reviews = [review for _, review in accepted]
+        with transaction.atomic():
+            for start in range(0, len(reviews), batch_size):
+                batch = reviews[start:start + batch_size]
+                PerformanceReview.objects.bulk_create(batch)
+                refresh_leaderboard({review.employee_id for review in batch})
+            # Bulk writes skip post_save, so the change is recorded here.
+            models_changed(PerformanceReview)
+
+    for index, review in accepted:
+        results[index] = {'index': index, 'status': 'created', 'review_id': review.pk}
+    return results
+
+
+def _decimal(value, label):
+    try:
+        parsed = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f'{label} must be a number.')
+    # NaN and Infinity parse, then fail in quantize() or a comparison.
+    if not parsed.is_finite():
+        raise ValueError(f'{label} must be a number.')
+    return parsed
+
+
+def _salary(amount, label):
+    """`amount` rounded to centavos, if Employee.salary can hold it."""
+    field = Employee._meta.get_field('salary')
+    if abs(amount) >= Decimal(10) ** (field.max_digits - field.decimal_places):
+        raise ValueError(f'{label} is too large.')
+    return amount.quantize(Decimal('0.01'))
+
+
+def _write_salaries(changed, batch_size):
+    # QuerySet.bulk_update builds a CASE expression per row and spends most of
+    # its time resolving them; a parameterised executemany sends the same
+    # values without that overhead.
+    field = Employee._meta.get_field('salary')
+    sql = 'UPDATE {} SET {} = %s WHERE {} = %s'.format(
+        connection.ops.quote_name(Employee._meta.db_table),
+        connection.ops.quote_name(field.column),
+        connection.ops.quote_name(Employee._meta.pk.column),
+    )
+    params = [(field.get_db_prep_save(salary, connection), employee_id) for employee_id, salary in changed]
+    with connection.cursor() as cursor:
+        for start in range(0, len(params), batch_size):
+            cursor.executemany(sql, params[start:start + batch_size])
+
+
+def _plan_adjustment(salaries, percentage, department, department_percentages):
+    """Validate the rule. Returns (employees to change, their new salary, the absolute targets if any)."""
+    rules = [rule for rule in (salaries, percentage, department_percentages) if rule is not None]
+    if len(rules) != 1:
+        raise ValueError('Provide exactly one of salaries, percentage or department_percentages.')
+
+    employees = Employee.objects.only('id', 'salary', 'department')
+
+    if salaries is not None:
+        if not isinstance(salaries, dict) or not salaries:
+            raise ValueError('salaries must be a non-empty object of employee id to salary.')
+        targets = {}
+        for employee_id, value in salaries.items():
+            try:
+                employee_id = int(employee_id)
+            except (TypeError, ValueError):
+                raise ValueError(f'{employee_id!r} is not a valid employee id.')
+            label = f'Salary for employee {employee_id}'
+            targets[employee_id] = _salary(_decimal(value, label), label)
+            if targets[employee_id] <= 0:
+                raise ValueError('Salary must be greater than zero.')
+        return employees.filter(id__in=targets), lambda employee: targets[employee.id], targets
+
+    if percentage is not None:
+        rates = {department: _decimal(percentage, 'percentage')}
+    else:
+        if not isinstance(department_percentages, dict) or not department_percentages:
+            raise ValueError('department_percentages must be a non-empty object of department to percentage.')
+        rates = {name: _decimal(value, f'Percentage for {name}') for name, value in department_percentages.items()}
+
+    employees = employees.filter(active=True, archived=False, salary__isnull=False)
+    if None not in rates:
+        employees = employees.filter(department__in=rates)
+    multipliers = {name: 1 + rate / 100 for name, rate in rates.items()}
+    return employees, lambda employee: _salary(
+        employee.salary * multipliers.get(employee.department, multipliers.get(None)),
+        f'The new salary of employee {employee.id}',
+    ), None
+
+
+def salary_adjustment_size(salaries=None, percentage=None, department=None, department_percentages=None):
+    """How many employees bulk_adjust_salaries would change, after the same validation."""
+    employees, _, targets = _plan_adjustment(salaries, percentage, department, department_percentages)
+    return len(targets) if targets is not None else employees.count()
+
+
+def bulk_adjust_salaries(salaries=None, percentage=None, department=None, department_percentages=None, batch_size=5000):
+    """
+    Change many salaries in one transaction. Exactly one rule applies:
+    `salaries` maps employee ids to absolute values, `percentage` raises every
+    active employee (optionally only in `department`), and
+    `department_percentages` maps department names to their own percentage.
+
+    The affected rows are locked once, every SalaryHistory row is written with
+    bulk_create and the new salaries go out as one batched statement.
+    Returns (changes, missing_ids) where changes is a list of
+    (employee_id, previous_salary, new_salary).
+    """
+    employees, new_salary, targets = _plan_adjustment(salaries, percentage, department, department_percentages)
+    employees = employees.select_for_update()
+    missing = []
+
+    with transaction.atomic():
+        changes, history, changed = [], [], []
+        for employee in employees:
+            previous, salary = employee.salary, new_salary(employee)
+            if salary <= 0:
+                raise ValueError(f'Salary for employee {employee.id} must stay greater than zero.')
+            changes.append((employee.id, previous, salary))
+            history.append(SalaryHistory(employee_id=employee.id, previous_salary=previous or 0, new_salary=salary))
+            changed.append((employee.id, salary))
+
+        if targets is not None:
+            found = {employee_id for employee_id, _, _ in changes}
+            missing = sorted(set(targets) - found)
+
+        SalaryHistory.objects.bulk_create(history, batch_size=batch_size)
+        _write_salaries(changed, batch_size)
+        models_changed(Employee, SalaryHistory)
+
+    return changes, missing
+
+
+def adjustment_summary(changes, missing):
+    """The response body for a bulk salary adjustment."""
+    return {
+        "message": f"Adjusted {len(changes)} salaries",
+        "adjusted": len(changes),
+        "previous_total": f"₱{sum(previous or 0 for _, previous, _ in changes):,.2f}",
+        "new_total": f"₱{sum(new for _, _, new in changes):,.2f}",
+        "missing_employee_ids": missing
+    }
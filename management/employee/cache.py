@@ -0,0 +1,347 @@
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.module_loading import import_string
+
+from .routers import pin_to_primary, pinned_to_primary
+from .versions import bump_table_versions, conditional
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for RedisBackend with a real server.
+    redis = None
+
+
+class LRUBackend:
+    """In-process cache. Correct only while a single process serves the API."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        # Generation counters live outside the LRU: evicting one would reset
+        # it and resurrect responses cached under its earlier values.
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout if timeout else None)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+
+class FakeRedis:
+    """The subset of the redis-py client RedisBackend uses, kept in memory for tests."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            item = self._data.get(name)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode()
+        elif isinstance(value, int):
+            value = str(value).encode()
+        with self._lock:
+            self._data[name] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def incr(self, name):
+        with self._lock:
+            value, expires = self._data.get(name, (b'0', None))
+            value = int(value) + 1
+            self._data[name] = (str(value).encode(), expires)
+            return value
+
+    def delete(self, name):
+        with self._lock:
+            return int(self._data.pop(name, None) is not None)
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisBackend:
+    """Shared cache for multi-process deployments. `url='fake://'` uses FakeRedis."""
+
+    def __init__(self, url='redis://localhost:6379/0', prefix='ems:', client=None):
+        if client is None:
+            if url.startswith('fake://'):
+                client = FakeRedis()
+            elif redis is None:
+                raise ImportError('RedisBackend requires the redis package.')
+            else:
+                client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, timeout=None):
+        self.client.set(self.prefix + key, value, ex=timeout)
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        self.client.flushdb()
+
+
+_backend = None
+
+
+def _config():
+    return getattr(settings, 'RESPONSE_CACHE', {})
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        config = _config()
+        backend_class = import_string(config.get('BACKEND', 'employee.cache.LRUBackend'))
+        _backend = backend_class(**config.get('OPTIONS', {}))
+    return _backend
+
+
+def _reset_backend(setting, **kwargs):
+    global _backend
+    if setting == 'RESPONSE_CACHE':
+        _backend = None
+
+
+setting_changed.connect(_reset_backend)
+
+
+def _generation_key(model):
+    return f'gen:{model._meta.label_lower}'
+
+
+def _settling_key(model):
+    return f'settling:{model._meta.label_lower}'
+
+
+def invalidate(*models):
+    """
+    Bump the generation of each model. Every cached response that read one of
+    them embeds the old generation in its key, so it is never served again.
+    """
+    if not _config().get('ENABLED', True):
+        return
+    backend = get_backend()
+    replica_lag = getattr(settings, 'REPLICA_PIN_SECONDS', 5) if getattr(settings, 'DATABASE_REPLICAS', []) else 0
+    for model in models:
+        backend.incr(_generation_key(model))
+        if replica_lag:
+            backend.set(_settling_key(model), 1, replica_lag)
+
+
+class _Invalidation:
+    """The on_commit callback that drops the cached responses of `models`."""
+
+    def __init__(self):
+        self.models = set()
+
+    def __call__(self):
+        invalidate(*self.models)
+
+
+def models_changed(*models):
+    """
+    Record a write to `models`: bump their table versions inside the current
+    transaction and drop cached responses once it commits, so a concurrent
+    read can't cache the old rows under the new generation. Later reads in
+    the same request go to the primary.
+
+    Each model is bumped and invalidated once per transaction and savepoint,
+    however many rows it writes. A savepoint that rolls back takes its bumps
+    and their callback with it, so the next write bumps again.
+    """
+    pin_to_primary()
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        bump_table_versions(*models)
+        invalidate(*models)
+        return
+
+    # Callbacks of this savepoint and of inner ones released into it. An
+    # outer one's bump may never commit (a test case's class-level
+    # transaction rolls back), so writes in here bump again.
+    current = set(connection.savepoint_ids)
+    pending = [
+        (savepoints, func) for savepoints, func, _ in connection.run_on_commit
+        if isinstance(func, _Invalidation) and savepoints >= current
+    ]
+    models = [model for model in dict.fromkeys(models) if not any(model in func.models for _, func in pending)]
+    if not models:
+        return
+    bump_table_versions(*models)
+    # Models join a callback of this very savepoint, so they roll back with it.
+    callback = next((func for savepoints, func in pending if savepoints == current), None)
+    if callback is None:
+        callback = _Invalidation()
+        transaction.on_commit(callback)
+    callback.models.update(models)
+
+
+def _may_store(models):
+    # A replica can still be behind a write for REPLICA_PIN_SECONDS after it
+    # commits; storing what it returns would cache the old rows under the new
+    # generation.
+    if pinned_to_primary() or not getattr(settings, 'DATABASE_REPLICAS', []):
+        return True
+    backend = get_backend()
+    return not any(backend.get(_settling_key(model)) for model in models)
+
+
+def _response_key(request, models):
+    backend = get_backend()
+    generations = ','.join(
+        f'{model._meta.label_lower}={int(backend.get(_generation_key(model)) or 0)}' for model in models
+    )
+    query = '&'.join(f'{key}={value}' for key, value in sorted(request.GET.lists()))
+    user = getattr(request.user, 'pk', None)
+    raw = f'{request.path}?{query}|user={user}|{generations}'
+    return 'resp:' + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _pack(response, etag):
+    header = f'{response.status_code}\n{response["Content-Type"]}\n{etag}\n'.encode()
+    return header + response.content
+
+
+def _unpack(value):
+    status_code, content_type, etag, content = value.split(b'\n', 3)
+    return int(status_code), content_type.decode(), etag.decode(), content
+
+
+def _etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    return etag in [tag.strip() for tag in header.split(',')] or header.strip() == '*'
+
+
+def cached(request, models, produce):
+    """
+    Serve a GET from the response cache, or call `produce()` and store its
+    rendered 200 response. Replies 304 when If-None-Match carries the ETag.
+    """
+    config = _config()
+    if request.method != 'GET' or not config.get('ENABLED', True):
+        return produce()
+
+    backend = get_backend()
+    key = _response_key(request, models)
+    hit = backend.get(key)
+    if hit is not None:
+        status_code, content_type, etag, content = _unpack(hit)
+        if _etag_matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, status=status_code, content_type=content_type)
+        response['ETag'] = etag
+        response['X-Cache'] = 'HIT'
+        return response
+
+    may_store = _may_store(models)
+    response = produce()
+    if response.status_code != 200 or response.streaming:
+        return response
+
+    def store(rendered):
+        etag = '"%s"' % hashlib.sha1(rendered.content).hexdigest()
+        if may_store:
+            backend.set(key, _pack(rendered, etag), config.get('TIMEOUT', 300))
+        if not rendered.has_header('ETag'):
+            rendered['ETag'] = etag
+        rendered['X-Cache'] = 'MISS'
+        if _etag_matches(request, etag):
+            not_modified = HttpResponseNotModified()
+            not_modified['ETag'] = etag
+            not_modified['X-Cache'] = 'MISS'
+            return not_modified
+        return rendered
+
+    if hasattr(response, 'add_post_render_callback'):
+        response.add_post_render_callback(store)
+        return response
+    # A plain HttpResponse is rendered already.
+    return store(response)
+
+
+def cached_read(request, models, produce):
+    """Conditional GET on the table versions first, then the response cache."""
+    return conditional(request, models, lambda: cached(request, models, produce))
+
+
+def cache_response(*models):
+    """Cache a viewset action; defaults to the viewset's `cache_models`."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            return cached_read(request, models or self.cache_models, lambda: func(self, request, *args, **kwargs))
+        return wrapper
+
+    return decorator
+
+
+class CachedReadMixin:
+    """Caches list and retrieve against the models in `cache_models`."""
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return cached_read(request, self.cache_models, lambda: super(CachedReadMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_read(request, self.cache_models, lambda: super(CachedReadMixin, self).retrieve(request, *args, **kwargs))
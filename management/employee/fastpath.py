@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .metrics import measure_serialization
+
+
+class FastPathUnsupported(Exception):
+    pass
+
+
+class _Row(dict):
+    """A values() row that SerializerMethodFields can read like a model instance."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+# Field types whose to_representation is the identity for the Python values
+# the matching model fields come back as from values().
+_PASSTHROUGH = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class FieldPlan:
+    """
+    A read-only serializer compiled once into a list of (key, column,
+    converter) steps that runs over values() rows. The output dicts have the
+    same keys, order and value types as the serializer's own, so they render
+    to identical JSON.
+    """
+
+    def __init__(self, serializer):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        model = serializer.Meta.model
+
+        self.columns, self.steps = [], []
+        self.uses_methods = False
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.SerializerMethodField):
+                try:
+                    model._meta.get_field(field.field_name)
+                except FieldDoesNotExist:
+                    raise FastPathUnsupported(f'{field.field_name} is not a model field')
+                self._add_column(field.field_name)
+                self.steps.append((field.field_name, None, getattr(serializer, field.method_name)))
+                self.uses_methods = True
+                continue
+
+            if isinstance(field, serializers.BaseSerializer) or field.source == '*':
+                raise FastPathUnsupported(f'{field.field_name} needs the model instance')
+
+            column = self._column_for(model, field.source.split('.'))
+            self._add_column(column)
+            converter = None if isinstance(field, _PASSTHROUGH) else field.to_representation
+            self.steps.append((field.field_name, column, converter))
+
+    def _column_for(self, model, path):
+        current = model
+        for position, attr in enumerate(path):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise FastPathUnsupported(f'{".".join(path)} is not a model field')
+            if model_field.many_to_many or model_field.one_to_many:
+                raise FastPathUnsupported(f'{".".join(path)} is a to-many relation')
+            if model_field.is_relation and position < len(path) - 1:
+                current = model_field.related_model
+        return '__'.join(path)
+
+    def _add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+
+    def serialize(self, rows):
+        with measure_serialization():
+            return self._serialize(rows)
+
+    def _serialize(self, rows):
+        steps, uses_methods = self.steps, self.uses_methods
+        data = []
+        for row in rows:
+            if uses_methods:
+                row = _Row(row)
+            item = {}
+            for key, column, converter in steps:
+                if column is None:
+                    item[key] = converter(row)
+                    continue
+                value = row[column]
+                if value is None or converter is None:
+                    item[key] = value
+                else:
+                    item[key] = converter(value)
+            data.append(item)
+        return data
+
+
+_plans = {}
+
+
+def compile_plan(serializer):
+    child = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+    key = (type(child), tuple(child.fields))
+    if key not in _plans:
+        _plans[key] = FieldPlan(child)
+    return _plans[key]
+
+
+class FastListMixin:
+    """
+    Opt-in (settings.FAST_READ_SERIALIZERS) list() that reads values() rows
+    and formats them through a compiled FieldPlan instead of instantiating a
+    model and running the full serializer per row. Serializers the plan can't
+    express fall back to the normal path.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'FAST_READ_SERIALIZERS', False):
+            return super().list(request, *args, **kwargs)
+
+        try:
+            plan = compile_plan(self.get_serializer())
+        except FastPathUnsupported:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = list(plan.columns)
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            # Cursor pagination reads its position from the row.
+            for field in self.paginator.get_ordering(request, queryset, self):
+                if field.lstrip('-') not in columns:
+                    columns.append(field.lstrip('-'))
+        rows = queryset.values(*columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.serialize(page))
+        return Response(plan.serialize(rows))
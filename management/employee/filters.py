@@ -0,0 +1,130 @@
+import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+def boolean(value):
+    if value.lower() in ('true', '1', 'yes'):
+        return True
+    if value.lower() in ('false', '0', 'no'):
+        return False
+    raise ValueError('Enter true or false.')
+
+
+def integer(value):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError('Enter a whole number.')
+
+
+def decimal(value):
+    try:
+        parsed = Decimal(value)
+    except InvalidOperation:
+        raise ValueError('Enter a number.')
+    # NaN and Infinity parse, but can't be compared with or stored.
+    if not parsed.is_finite():
+        raise ValueError('Enter a number.')
+    return parsed
+
+
+def date(value):
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError('Enter a valid date (YYYY-MM-DD).')
+    return parsed
+
+
+def month(value):
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise ValueError('Enter a month as YYYY-MM.')
+
+
+def moment(value):
+    """An ISO 8601 datetime; naive values are in the current time zone."""
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError('Enter a valid date and time (ISO 8601).')
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def day_start(value):
+    """Midnight at the start of the date, for `datetime_field__gte`."""
+    return timezone.make_aware(datetime.datetime.combine(date(value), datetime.time.min))
+
+
+def next_day_start(value):
+    """Midnight after the date, so `datetime_field__lt` includes the whole day."""
+    return day_start(value) + datetime.timedelta(days=1)
+
+
+class QueryParamFilter(BaseFilterBackend):
+    """
+    Filters by the query parameters a viewset declares in `filter_params`,
+    a mapping of parameter name to (lookup, parser). Parsers raise
+    ValueError with the message returned to the client.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filters = {}
+        for param, (lookup, parse) in getattr(view, 'filter_params', {}).items():
+            value = request.query_params.get(param)
+            if value is None or value == '':
+                continue
+            try:
+                filters[lookup] = parse(value)
+            except ValueError as error:
+                raise serializers.ValidationError({param: [str(error)]})
+        return queryset.filter(**filters) if filters else queryset
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    `?ordering=` over the viewset's `ordering_fields` only (each one backed by
+    an index), with the primary key appended so ties keep a fixed order.
+    """
+
+    def get_valid_fields(self, queryset, view, context=None):
+        return [(field, field) for field in getattr(view, 'ordering_fields', ())]
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering = [*ordering, '-id' if ordering[0].startswith('-') else 'id']
+        return ordering
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=id,name` on GET narrows the serializer to those fields, and with
+    it the columns PlannedQuerysetMixin selects.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.request.query_params.get('fields') if self.request.method in ('GET', 'HEAD') else None
+        if not requested:
+            return serializer
+
+        child = getattr(serializer, 'child', serializer)
+        names = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = [name for name in names if name not in child.fields]
+        if unknown:
+            raise serializers.ValidationError({"fields": [f"Unknown fields: {', '.join(unknown)}."]})
+        for name in list(child.fields):
+            if name not in names:
+                child.fields.pop(name)
+        return serializer
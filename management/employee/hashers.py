@@ -0,0 +1,40 @@
+"""
+Django's password hashers with their cost read from settings.PASSWORD_HASHER_COST,
+so the work factor can be tuned per deployment. The algorithm names are
+unchanged: existing hashes keep verifying, and a hash made at another cost
+(or with a hasher that is no longer first in PASSWORD_HASHERS) is rewritten
+by Django the next time that user logs in.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _cost(algorithm, name, default):
+    return getattr(settings, 'PASSWORD_HASHER_COST', {}).get(algorithm, {}).get(name, default)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return _cost('argon2', 'time_cost', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _cost('argon2', 'memory_cost', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _cost('argon2', 'parallelism', hashers.Argon2PasswordHasher.parallelism)
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    @property
+    def rounds(self):
+        return _cost('bcrypt', 'rounds', hashers.BCryptSHA256PasswordHasher.rounds)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return _cost('pbkdf2', 'iterations', hashers.PBKDF2PasswordHasher.iterations)
+
@@ -0,0 +1,322 @@
+"""
+Background jobs for work that is too big for a request.
+
+A view calls enqueue(), which stores a Job row, and answers 202 with the
+job's URL. When the transaction commits, a coordinator thread in the same
+process:
+- claims the job with one conditional UPDATE (queued -> running), so two
+  runners never share a job
+- asks the job's handler to split the work into chunks
+- runs the chunks in parallel on the worker pool, processes by default
+- adds each finished chunk to Job.done and stores the combined result
+
+There's no broker: the jobs table is the queue. With JOBS['RUN_IN_PROCESS']
+off, web processes only enqueue and `manage.py run_jobs` runs the jobs.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .bulk import adjustment_summary, bulk_adjust_salaries
+from .cache import models_changed
+from .exports import (
+    ATTENDANCE_COLUMNS, EMPLOYEE_COLUMNS, SALARY_HISTORY_COLUMNS, export_options, filter_export, write_rows,
+)
+from .models import Attendance, AttendanceRollup, Employee, Job, SalaryHistory
+from . import workers
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'RUN_IN_PROCESS': True,
+    # Run jobs in the committing thread, chunk by chunk (tests, scripts).
+    'EAGER': False,
+    'POOL': 'process',
+    'WORKERS': None,
+    'CONCURRENT_JOBS': 2,
+    'CHUNK_SIZE': 5000,
+    'INLINE_LIMIT': 10000,
+    'EXPORT_DIR': None,
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'JOBS', {})}
+
+
+def inline_limit():
+    """Rows an operation may touch in the request before it becomes a job."""
+    return _config()['INLINE_LIMIT']
+
+
+HANDLERS = {}
+
+
+def register(handler):
+    HANDLERS[handler.kind] = handler()
+    return handler
+
+
+class Handler:
+    """
+    One kind of job. `chunks` and `finish` run in the coordinator;
+    `process` runs in a worker, possibly another process, so chunks and
+    their results must be picklable.
+    """
+    kind = None
+    # Written by the chunks; their cached responses are dropped afterwards.
+    models = ()
+
+    def chunks(self, job):
+        """(chunk, units of work) pairs."""
+        raise NotImplementedError
+
+    def process(self, params, chunk):
+        raise NotImplementedError
+
+    def finish(self, job, results):
+        """The job's result, from the chunk results in chunk order."""
+        return results
+
+
+def id_ranges(queryset, size):
+    """
+    Split `queryset` into (first id, last id, rows) ranges of `size` rows,
+    reading only the ids, in one pass.
+    """
+    ranges = []
+    first = last = None
+    count = 0
+    for pk in queryset.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=size):
+        if first is None:
+            first = pk
+        last, count = pk, count + 1
+        if count == size:
+            ranges.append((first, last, count))
+            first, count = None, 0
+    if count:
+        ranges.append((first, last, count))
+    return ranges
+
+
+@register
+class DeleteAttendance(Handler):
+    kind = 'delete_all_attendance'
+    models = (Attendance,)
+
+    def chunks(self, job):
+        rows = Attendance.objects.filter(employee_id=job.params['employee_id'])
+        return [((first, last), count) for first, last, count in id_ranges(rows, _config()['CHUNK_SIZE'])]
+
+    def process(self, params, chunk):
+        first, last = chunk
+        with transaction.atomic():
+            deleted, _ = Attendance.objects.filter(employee_id=params['employee_id'], id__gte=first, id__lte=last).delete()
+        return deleted
+
+    def finish(self, job, results):
+        AttendanceRollup.objects.filter(employee_id=job.params['employee_id']).delete()
+        return {"employee_id": job.params['employee_id'], "deleted": sum(results)}
+
+
+# Target: (queryset, columns, file name, date field, department field), as
+# the viewsets' export actions use them.
+EXPORTS = {
+    'employees': (lambda: Employee.objects.filter(archived=False), EMPLOYEE_COLUMNS, 'employees', None, 'department'),
+    'salary': (
+        lambda: SalaryHistory.objects.filter(employee__archived=False), SALARY_HISTORY_COLUMNS, 'salary_history',
+        'changed_at__date', 'employee__department',
+    ),
+    'attendance': (lambda: Attendance.objects.filter(employee__archived=False), ATTENDANCE_COLUMNS, 'attendance', 'date', 'employee__department'),
+}
+
+
+def export_dir():
+    return Path(_config()['EXPORT_DIR'] or Path(settings.BASE_DIR) / 'exports')
+
+
+@register
+class Export(Handler):
+    """Each chunk writes its rows to a part file; finish joins them in order."""
+    kind = 'export'
+
+    def _queryset(self, params):
+        queryset, _, _, date_field, department_field = EXPORTS[params['target']]
+        options, _ = export_options(params, dated=date_field is not None)
+        return filter_export(queryset(), options, date_field, department_field), options['output']
+
+    def chunks(self, job):
+        queryset, _ = self._queryset(job.params)
+        directory = export_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        return [
+            ((first, last, str(directory / f'job-{job.pk}.{index}.part')), count)
+            for index, (first, last, count) in enumerate(id_ranges(queryset, _config()['CHUNK_SIZE']))
+        ]
+
+    def process(self, params, chunk):
+        first, last, path = chunk
+        queryset, output = self._queryset(params)
+        columns = EXPORTS[params['target']][1]
+        rows = queryset.filter(pk__gte=first, pk__lte=last).order_by('pk').values_list(*[lookup for _, lookup in columns])
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            write_rows(file, rows.iterator(), [header for header, _ in columns], output, header=False)
+        return path
+
+    def finish(self, job, results):
+        _, columns, filename, _, _ = EXPORTS[job.params['target']]
+        output = job.params['output']
+        path = export_dir() / f'job-{job.pk}.{output}'
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            write_rows(file, [], [header for header, _ in columns], output)
+            for part in results:
+                with open(part, encoding='utf-8', newline='') as chunk:
+                    while block := chunk.read(1 << 20):
+                        file.write(block)
+                os.remove(part)
+        return {"file": path.name, "filename": f"{filename}.{output}", "rows": job.total, "bytes": path.stat().st_size}
+
+
+@register
+class AdjustSalaries(Handler):
+    """
+    One chunk: the adjustment locks and rewrites every affected row in a
+    single transaction, and splitting it would let half a raise commit.
+    """
+    kind = 'bulk_adjust_salaries'
+    models = (Employee, SalaryHistory)
+
+    def chunks(self, job):
+        return [(None, job.params.get('size', 1))]
+
+    def process(self, params, chunk):
+        rules = {key: params.get(key) for key in ('salaries', 'percentage', 'department', 'department_percentages')}
+        return adjustment_summary(*bulk_adjust_salaries(**rules))
+
+    def finish(self, job, results):
+        return results[0]
+
+
+# Pools are created on first use and live as long as the process.
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _reset_pools(setting, **kwargs):
+    if setting == 'JOBS':
+        with _pools_lock:
+            for pool in _pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            _pools.clear()
+
+
+setting_changed.connect(_reset_pools)
+
+
+def _pool(name):
+    with _pools_lock:
+        if name not in _pools:
+            config = _config()
+            if name == 'coordinator':
+                _pools[name] = ThreadPoolExecutor(config['CONCURRENT_JOBS'], thread_name_prefix='job')
+            elif config['POOL'] == 'process':
+                # Spawned, not forked: a fork would share the parent's open database connections.
+                _pools[name] = ProcessPoolExecutor(
+                    config['WORKERS'] or os.cpu_count(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=workers.setup,
+                    initargs=({alias: connections[alias].settings_dict['NAME'] for alias in connections},),
+                )
+            else:
+                _pools[name] = ThreadPoolExecutor(config['WORKERS'] or os.cpu_count(), thread_name_prefix='job-worker')
+        return _pools[name]
+
+
+def _process_chunk(kind, params, chunk):
+    close_old_connections()
+    try:
+        return HANDLERS[kind].process(params, chunk)
+    finally:
+        close_old_connections()
+
+
+def enqueue(kind, params, user=None):
+    """Store a job and start it once the current transaction commits. Returns the Job."""
+    if kind not in HANDLERS:
+        raise ValueError(f'Unknown job kind {kind!r}.')
+    job = Job.objects.create(kind=kind, params=params, requested_by_id=getattr(user, 'pk', None))
+    config = _config()
+    if config['EAGER']:
+        transaction.on_commit(lambda: run_job(job.pk, inline=True))
+    elif config['RUN_IN_PROCESS']:
+        transaction.on_commit(lambda: _pool('coordinator').submit(run_job, job.pk))
+    return job
+
+
+def _run_chunks(job, handler, chunks, inline):
+    results = [None] * len(chunks)
+    if inline:
+        for index, (chunk, units) in enumerate(chunks):
+            results[index] = handler.process(job.params, chunk)
+            Job.objects.filter(pk=job.pk).update(done=F('done') + units)
+        return results
+
+    futures = {
+        _pool('workers').submit(_process_chunk, job.kind, job.params, chunk): (index, units)
+        for index, (chunk, units) in enumerate(chunks)
+    }
+    try:
+        for future in as_completed(futures):
+            index, units = futures[future]
+            results[index] = future.result()
+            Job.objects.filter(pk=job.pk).update(done=F('done') + units)
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    return results
+
+
+def run_job(job_id, inline=False):
+    """
+    Claim a queued job and run it to the end. Chunks go to the worker pool
+    unless `inline`. Returns False if the job wasn't queued any more.
+    """
+    # Workers can't reach an in-memory database, and threads writing to a
+    # shared-cache one lock each other out.
+    inline = inline or connections[DEFAULT_DB_ALIAS].is_in_memory_db()
+    close_old_connections()
+    try:
+        if not Job.objects.filter(pk=job_id, status='queued').update(status='running', started_at=timezone.now()):
+            return False
+        job = Job.objects.get(pk=job_id)
+        handler = HANDLERS.get(job.kind)
+        try:
+            if handler is None:
+                raise ValueError(f'Unknown job kind {job.kind!r}.')
+            chunks = list(handler.chunks(job))
+            job.total = sum(units for _, units in chunks)
+            Job.objects.filter(pk=job.pk).update(total=job.total)
+            result = handler.finish(job, _run_chunks(job, handler, chunks, inline))
+        except Exception as exc:
+            logger.exception('Job %s (%s) failed', job.pk, job.kind)
+            Job.objects.filter(pk=job.pk).update(status='failed', error=str(exc) or type(exc).__name__, finished_at=timezone.now())
+        else:
+            Job.objects.filter(pk=job.pk).update(status='succeeded', result=result, done=F('total'), finished_at=timezone.now())
+        if handler is not None and handler.models:
+            # Chunks may have committed even if the job failed.
+            with transaction.atomic():
+                models_changed(*handler.models)
+        return True
+    finally:
+        close_old_connections()
@@ -0,0 +1,125 @@
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, OuterRef, Subquery, Sum, When, Value
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .cache import models_changed
+from .models import Employee, LeaderboardEntry, PerformanceReview
+
+ENTRY_FIELDS = ['department', 'review_count', 'rating_total', 'average_rating', 'latest_rating', 'latest_review_at']
+
+RANKING = ('-average_rating', '-review_count', 'employee_id')
+
+
+def _entries(employees, chunk_size=5000):
+    """Aggregate the reviews of an Employee queryset into unsaved entries."""
+    latest = PerformanceReview.objects.filter(employee=OuterRef('pk')).order_by('-created_at', '-id')
+    rows = (
+        employees.annotate(
+            review_count=Count('reviews'),
+            rating_total=Sum('reviews__rating'),
+            latest_rating=Subquery(latest.values('rating')[:1]),
+            latest_review_at=Subquery(latest.values('created_at')[:1]),
+        )
+        .filter(review_count__gt=0)
+        .values('id', 'department', 'review_count', 'rating_total', 'latest_rating', 'latest_review_at')
+        .order_by()
+    )
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield LeaderboardEntry(
+            employee_id=row['id'],
+            department=row['department'],
+            review_count=row['review_count'],
+            rating_total=row['rating_total'],
+            average_rating=row['rating_total'] / row['review_count'],
+            latest_rating=row['latest_rating'],
+            latest_review_at=row['latest_review_at'],
+        )
+
+
+def refresh_leaderboard(employee_ids):
+    """
+    Recompute the entries of the employees whose reviews just changed. The
+    cost is bounded by those employees' reviews, not the whole table.
+
+    The entries are locked (created first if missing) before the reviews
+    are read, as refresh_attendance_rollups does, so a record_review
+    increment can't land between the read and the write and be overwritten.
+    """
+    employee_ids = set(employee_ids)
+    if not employee_ids:
+        return
+
+    with transaction.atomic():
+        # Placeholders, overwritten or deleted below. Sorted, so concurrent
+        # refreshes lock rows in the same order.
+        placeholder_at = timezone.now()
+        LeaderboardEntry.objects.bulk_create(
+            [LeaderboardEntry(employee_id=pk, latest_rating=0, latest_review_at=placeholder_at) for pk in sorted(employee_ids)],
+            ignore_conflicts=True,
+        )
+        list(LeaderboardEntry.objects.select_for_update().filter(employee_id__in=employee_ids).order_by('employee_id').values_list('pk'))
+
+        entries = list(_entries(Employee.objects.filter(id__in=employee_ids)))
+        emptied = employee_ids - {entry.employee_id for entry in entries}
+        LeaderboardEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['employee'],
+            update_fields=ENTRY_FIELDS,
+        )
+        if emptied:
+            LeaderboardEntry.objects.filter(employee_id__in=emptied).delete()
+
+
+def record_review(review):
+    """
+    Fold a newly created review into its employee's entry with one UPDATE;
+    the first review of an employee creates the entry instead.
+    """
+    updated = LeaderboardEntry.objects.filter(employee_id=review.employee_id).update(
+        review_count=F('review_count') + 1,
+        rating_total=F('rating_total') + review.rating,
+        average_rating=Cast(F('rating_total') + review.rating, FloatField()) / (F('review_count') + 1),
+        latest_rating=Case(When(latest_review_at__gt=review.created_at, then=F('latest_rating')), default=Value(review.rating)),
+        latest_review_at=Case(When(latest_review_at__gt=review.created_at, then=F('latest_review_at')), default=Value(review.created_at)),
+    )
+    if not updated:
+        refresh_leaderboard([review.employee_id])
+
+
+def move_department(employee):
+    LeaderboardEntry.objects.filter(employee=employee).exclude(department=employee.department).update(department=employee.department)
+
+
+def top_performers(limit, department=None, min_rating=None):
+    """The `limit` best entries by average rating; one index range scan."""
+    entries = LeaderboardEntry.objects.filter(employee__archived=False)
+    if department:
+        entries = entries.filter(department=department)
+    if min_rating is not None:
+        entries = entries.filter(average_rating__gte=min_rating)
+    return entries.select_related('employee').only(
+        'employee__name', *[field for field in ENTRY_FIELDS if field != 'rating_total']
+    ).order_by(*RANKING)[:limit]
+
+
+def rebuild_leaderboard(batch_size=5000):
+    """
+    Throw every entry away and rebuild them from PerformanceReview, then drop
+    the rankings served from the old ones. Returns the row count.
+    """
+    count = 0
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        batch = []
+        for entry in _entries(Employee.objects.all(), batch_size):
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                LeaderboardEntry.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        LeaderboardEntry.objects.bulk_create(batch)
+        count += len(batch)
+        models_changed(LeaderboardEntry)
+    return count
@@ -0,0 +1,104 @@
+"""
+Coalesced last_login writes. A user's first login in a process is written
+straight away; later ones inside settings.LAST_LOGIN_INTERVAL are buffered
+and written together, one UPDATE batch for every due user, by whichever
+login next finds the buffer due (or at process exit).
+
+Users whose last write is over an interval old are forgotten once an
+interval, so the bookkeeping is bounded by the users who logged in lately.
+"""
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+
+User = get_user_model()
+
+_lock = threading.Lock()
+_pending = {}
+_written = {}
+_next_flush = 0.0
+_next_prune = 0.0
+
+
+def _interval():
+    return getattr(settings, 'LAST_LOGIN_INTERVAL', 300)
+
+
+def record_login(user):
+    """Set `user.last_login` now; the database catches up within the interval."""
+    global _next_flush, _next_prune
+    user.last_login = timezone.now()
+    clock = time.monotonic()
+    with _lock:
+        if clock >= _next_prune:
+            _prune(clock)
+            _next_prune = clock + _interval()
+        last = _written.get(user.pk)
+        if last is not None and clock - last < _interval():
+            _pending[user.pk] = user.last_login
+            write_now = False
+        else:
+            _written[user.pk] = clock
+            _pending.pop(user.pk, None)
+            write_now = True
+        flush_due = _pending and clock >= _next_flush
+        if flush_due:
+            _next_flush = clock + min(_interval(), 60)
+
+    if write_now:
+        _write({user.pk: user.last_login})
+    if flush_due:
+        flush_last_logins()
+
+
+def _prune(clock):
+    # A write over an interval ago lets the next login write straight away,
+    # as if there had been none. Buffered users stay until they're flushed.
+    for user_id in [user_id for user_id, last in _written.items() if clock - last >= _interval() and user_id not in _pending]:
+        del _written[user_id]
+
+
+def flush_last_logins(force=False):
+    """Write buffered logins whose users are due (all of them with `force`). Returns the count."""
+    clock = time.monotonic()
+    with _lock:
+        due = {
+            user_id: last_login for user_id, last_login in _pending.items()
+            if force or clock - _written.get(user_id, 0) >= _interval()
+        }
+        for user_id in due:
+            del _pending[user_id]
+            _written[user_id] = clock
+    _write(due)
+    return len(due)
+
+
+def _write(logins):
+    # A plain UPDATE rather than save(): no model signals, and one
+    # executemany for the whole batch.
+    if not logins:
+        return
+    field = User._meta.get_field('last_login')
+    sql = 'UPDATE {} SET {} = %s WHERE {} = %s'.format(
+        connection.ops.quote_name(User._meta.db_table),
+        connection.ops.quote_name(field.column),
+        connection.ops.quote_name(User._meta.pk.column),
+    )
+    params = [(field.get_db_prep_save(last_login, connection), user_id) for user_id, last_login in logins.items()]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def _flush_at_exit():
+    try:
+        flush_last_logins(force=True)
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
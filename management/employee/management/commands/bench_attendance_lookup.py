@@ -0,0 +1,48 @@
+import datetime
+import random
+
+from django.core.management.base import BaseCommand
+
+from employee.benchmarking import scratch_database, seed, timed
+from employee.models import Attendance, LEAVE_STATUSES
+
+START = datetime.date(2020, 1, 1)
+
+
+def lookups(employee_ids, days, rng):
+    employee_id = rng.choice(employee_ids)
+    date = START + datetime.timedelta(days=rng.randrange(days))
+    return {
+        'employee + date': Attendance.objects.filter(employee_id=employee_id, date=date),
+        'employee + status': Attendance.objects.filter(employee_id=employee_id, status='Absent'),
+        'employee leave rows': Attendance.objects.filter(employee_id=employee_id, status__in=LEAVE_STATUSES),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Measure Attendance lookup latency on (employee, date) and (employee, status) as the table grows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000, 1000000])
+        parser.add_argument('--days', type=int, default=365, help='Attendance days per employee.')
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def handle(self, *args, **options):
+        days = options['days']
+        for size in options['sizes']:
+            with scratch_database():
+                employee_ids = seed(max(1, size // days), days, tables=('attendance',))
+                rng = random.Random(size)
+                self.stdout.write(f'\n{Attendance.objects.count()} attendance rows')
+
+                for name, queryset in lookups(employee_ids, days, rng).items():
+                    self.stdout.write(f'  plan for {name}: {queryset.explain()}')
+
+                totals = {}
+                for _ in range(options['iterations']):
+                    for name, queryset in lookups(employee_ids, days, rng).items():
+                        _, elapsed = timed(list, queryset)
+                        totals[name] = totals.get(name, 0) + elapsed
+
+                for name, total in totals.items():
+                    self.stdout.write(f'  {name:<22}{total / options["iterations"] * 1000:8.3f} ms')
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from employee.authentication import ClaimsJWTAuthentication, tokens_for
+from employee.benchmarking import scratch_database, seed, timed
+from employee.views import EmployeeViewSet
+
+User = get_user_model()
+
+CASES = [
+    ('database user', JWTAuthentication),
+    ('token claims', ClaimsJWTAuthentication),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure requests/sec and queries per request on GET /api/employees/<id>/ authenticated '
+        'by loading the user row (simplejwt) against building it from token claims.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000)
+        parser.add_argument('--employees', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        with scratch_database():
+            ids = seed(options['employees'], 0, tables=())
+            user = User.objects.create_user('benchmark', password='benchmark', employee_id='benchmark')
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for(user).access_token}')
+            paths = [f'/api/employees/{ids[n % len(ids)]}/' for n in range(count)]
+
+            default_classes = EmployeeViewSet.authentication_classes
+            try:
+                for label, authentication_class in CASES:
+                    EmployeeViewSet.authentication_classes = [authentication_class]
+                    client.get(paths[0])  # warm up
+
+                    queries = []
+                    with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+                        client.get(paths[-1])
+                    _, elapsed = timed(lambda: [client.get(path) for path in paths])
+                    self.stdout.write(
+                        f'{label:<15}{count / elapsed:9.1f} req/s   {len(queries)} queries/request'
+                    )
+            finally:
+                EmployeeViewSet.authentication_classes = default_classes
@@ -0,0 +1,72 @@
+import datetime
+import threading
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+from django.test.utils import override_settings
+
+from employee.benchmarking import scratch_database, seed
+from employee.models import Employee, Attendance
+
+
+def _writer(employee_ids, day_offset, deadline, counts, lock):
+    done = errors = 0
+    start = datetime.date(2020, 1, 1) + datetime.timedelta(days=day_offset)
+    try:
+        while time.monotonic() < deadline:
+            employee_id = employee_ids[done % len(employee_ids)]
+            try:
+                with transaction.atomic():
+                    Attendance.objects.create(
+                        employee_id=employee_id,
+                        date=start + datetime.timedelta(days=done // len(employee_ids)),
+                        check_in_time=datetime.time(8, 0),
+                    )
+                    Employee.objects.filter(pk=employee_id).update(salary=Decimal(20000 + done))
+                done += 1
+            except OperationalError:
+                errors += 1
+    finally:
+        connections.close_all()
+        with lock:
+            counts['writes'] += done
+            counts['errors'] += errors
+
+
+class Command(BaseCommand):
+    help = 'Measure concurrent write throughput (check-in insert + salary update per transaction) on the configured backend.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', nargs='+', type=int, default=[1, 4, 16])
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--no-pragmas', action='store_true', help='Skip SQLITE_PRAGMAS, to compare with stock SQLite.')
+
+    def handle(self, *args, **options):
+        pragmas = {} if options['no_pragmas'] else None
+        with override_settings(**({'SQLITE_PRAGMAS': pragmas} if pragmas is not None else {})):
+            with scratch_database(file_backed=True):
+                ids = seed(options['employees'], 0, tables=())
+                self.stdout.write(f'{connection.vendor} ({connection.settings_dict["ENGINE"]})')
+                for index, threads in enumerate(options['threads']):
+                    counts, lock = {'writes': 0, 'errors': 0}, threading.Lock()
+                    deadline = time.monotonic() + options['seconds']
+                    workers = [
+                        threading.Thread(
+                            target=_writer,
+                            # Every thread gets its own employees and dates so
+                            # the only contention is the database's own locking.
+                            args=(ids[n::threads], (index * 64 + n) * 1000, deadline, counts, lock),
+                        )
+                        for n in range(threads)
+                    ]
+                    for worker in workers:
+                        worker.start()
+                    for worker in workers:
+                        worker.join()
+                    self.stdout.write(
+                        f'  {threads:>3} threads  {counts["writes"] / options["seconds"]:9.1f} writes/s  '
+                        f'{counts["errors"]} lock errors'
+                    )
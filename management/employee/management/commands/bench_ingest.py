@@ -0,0 +1,45 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from employee.benchmarking import scratch_database, seed, api_client, timed
+
+
+class Command(BaseCommand):
+    help = 'Compare attendance throughput of the per-request check_in/check_out path with the bulk ingest endpoint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=2000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            ids = seed(options['employees'], 0, tables=())
+            client = api_client()
+
+            def per_request():
+                for employee_id in ids:
+                    client.post(f'/api/attendance/{employee_id}/check_in/')
+                    client.post(f'/api/attendance/{employee_id}/check_out/')
+
+            _, single_elapsed = timed(per_request)
+
+            day = now() - datetime.timedelta(days=1)
+            events = []
+            for employee_id in ids:
+                events.append({'employee_id': employee_id, 'timestamp': day.replace(hour=8).isoformat(), 'kind': 'check_in'})
+                events.append({'employee_id': employee_id, 'timestamp': day.replace(hour=18).isoformat(), 'kind': 'check_out'})
+
+            def bulk():
+                for start in range(0, len(events), options['batch_size']):
+                    response = client.post('/api/attendance/ingest/', events[start:start + options['batch_size']], format='json')
+                    assert response.data['errors'] == 0, response.data
+
+            _, bulk_elapsed = timed(bulk)
+
+        count = len(ids) * 2
+        single_rate, bulk_rate = count / single_elapsed, count / bulk_elapsed
+        self.stdout.write(f'per-request: {count} events in {single_elapsed:.2f}s ({single_rate:,.0f} events/s)')
+        self.stdout.write(f'bulk ingest: {count} events in {bulk_elapsed:.2f}s ({bulk_rate:,.0f} events/s)')
+        self.stdout.write(f'speed-up:    {bulk_rate / single_rate:.1f}x')
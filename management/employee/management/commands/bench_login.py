@@ -0,0 +1,66 @@
+import importlib.util
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from employee.benchmarking import scratch_database, timed
+from employee.logins import flush_last_logins
+
+User = get_user_model()
+
+PASSWORD = 'benchmark-password-1'
+
+CASES = [
+    ('pbkdf2 (django default)', 'django.contrib.auth.hashers.PBKDF2PasswordHasher', None),
+    ('pbkdf2 (tuned)', 'employee.hashers.PBKDF2PasswordHasher', None),
+    ('bcrypt', 'employee.hashers.BCryptSHA256PasswordHasher', 'bcrypt'),
+    ('argon2', 'employee.hashers.Argon2PasswordHasher', 'argon2'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure POST /api/auth/login/ throughput on one core for each password hasher, '
+        'and how many last_login writes reach the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=50, help='Logins per hasher.')
+        parser.add_argument('--users', type=int, default=5, help='Users to spread the logins over.')
+
+    def handle(self, *args, **options):
+        count = options['logins']
+        with scratch_database():
+            for label, hasher, library in CASES:
+                if library and importlib.util.find_spec(library) is None:
+                    self.stdout.write(f'{label:<26}skipped ({library} is not installed)')
+                    continue
+                with override_settings(PASSWORD_HASHERS=[hasher, *settings.PASSWORD_HASHERS]):
+                    usernames = []
+                    for n in range(options['users']):
+                        user = User.objects.create_user(f'{label}-{n}', password=PASSWORD, employee_id=f'{label[:12]}-{n}')
+                        usernames.append(user.username)
+                    client = APIClient()
+
+                    def login(username):
+                        response = client.post('/api/auth/login/', {'username': username, 'password': PASSWORD}, format='json')
+                        assert response.status_code == 200, response.content
+
+                    writes = []
+
+                    def count_writes(execute, sql, *args):
+                        if sql.startswith('UPDATE') and 'last_login' in sql:
+                            writes.append(sql)
+                        return execute(sql, *args)
+
+                    with connection.execute_wrapper(count_writes):
+                        _, elapsed = timed(lambda: [login(usernames[n % len(usernames)]) for n in range(count)])
+                    flush_last_logins(force=True)
+                self.stdout.write(
+                    f'{label:<26}{count / elapsed:8.1f} logins/s/core   {elapsed / count * 1000:7.1f} ms/login   '
+                    f'{len(writes)} last_login writes for {count} logins'
+                )
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from employee import metrics
+from employee.benchmarking import scratch_database, seed, api_client, timed
+
+ENDPOINTS = [
+    '/api/employees/',
+    '/api/employees/?page_size=200',
+    '/api/salary/',
+    '/api/attendance/',
+    '/api/performance/top_performers/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Estimate the overhead of MetricsMiddleware: its cost per request and per query, '
+        'against the measured latency and query count of the list endpoints.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=2000)
+        parser.add_argument('--rounds', type=int, default=100)
+        parser.add_argument('--iterations', type=int, default=50000, help='Calls when timing the instrumentation alone.')
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            seed(options['employees'], 3)
+            client = api_client()
+            metrics.get_registry().clear()
+            for _ in range(options['rounds']):
+                for url in ENDPOINTS:
+                    client.get(url)
+            series = metrics.get_registry().snapshot().values()
+            requests = sum(entry['count'] for entry in series)
+            latency = sum(entry['latency_seconds'] for entry in series) / requests
+            queries = sum(entry['queries'] for entry in series) / requests
+
+        iterations = options['iterations']
+        request = RequestFactory().get(ENDPOINTS[0])
+        request.resolver_match = resolve(ENDPOINTS[0])
+        response = HttpResponse(b'x' * 20000)
+        middleware = metrics.MetricsMiddleware(lambda request: response)
+        bare = lambda request: response
+        _, with_middleware = timed(lambda: [middleware(request) for _ in range(iterations)])
+        _, without_middleware = timed(lambda: [bare(request) for _ in range(iterations)])
+        per_request = (with_middleware - without_middleware) / iterations
+
+        execute = lambda sql, params, many, context: None
+        token = metrics._current.set(metrics.RequestMetrics(keep_statements=False))
+        try:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                metrics.record_queries(execute, 'SELECT 1', (), False, {})
+            wrapped = time.perf_counter() - started
+        finally:
+            metrics._current.reset(token)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            execute('SELECT 1', (), False, {})
+        per_query = (wrapped - (time.perf_counter() - started)) / iterations
+
+        overhead = per_request + per_query * queries
+        self.stdout.write(f'average request:    {latency * 1000:8.3f} ms, {queries:.1f} queries')
+        self.stdout.write(f'middleware:         {per_request * 1e6:8.1f} us/request')
+        self.stdout.write(f'query wrapper:      {per_query * 1e6:8.2f} us/query')
+        self.stdout.write(f'overhead:           {overhead / latency * 100:8.2f}% of request time')
@@ -0,0 +1,85 @@
+import datetime
+import random
+
+from django.core.management.base import BaseCommand
+
+from employee import payroll
+from employee.benchmarking import scratch_database, seed, timed
+from employee.models import AttendanceRollup, Employee, Payslip
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the payroll engine over --employees x --months employee-months: loading the columns, '
+        'computing pay and writing payslips, against a per-object ORM loop on one month.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=100000)
+        parser.add_argument('--months', type=int, default=10)
+        parser.add_argument('--baseline-employees', type=int, default=5000, help='Employees in the ORM-loop month.')
+        parser.add_argument('--skip-write', action='store_true', help='Only load and compute.')
+
+    def handle(self, *args, **options):
+        engine = 'numpy' if payroll.numpy is not None else 'python loop (numpy not installed)'
+        rng = random.Random(0)
+        months = [datetime.date(2024, 1, 1).replace(month=1 + n % 12, year=2024 + n // 12) for n in range(options['months'])]
+
+        with scratch_database():
+            ids = seed(options['employees'], 0, tables=())
+            for month in months:
+                AttendanceRollup.objects.bulk_create(
+                    (
+                        AttendanceRollup(
+                            employee_id=employee_id, month=month, records=22,
+                            overtime_hours=rng.choice([0, 0, 1.5, 4, 10]), days_leave_approved=rng.choice([0, 0, 0, 1, 3]),
+                        )
+                        for employee_id in ids
+                    ),
+                    batch_size=5000,
+                )
+
+            totals = {'load': 0, 'compute': 0, 'write': 0}
+            for month in months:
+                period, elapsed = timed(payroll.load_period, month)
+                totals['load'] += elapsed
+                columns, elapsed = timed(payroll.compute_pay, *period)
+                totals['compute'] += elapsed
+                if not options['skip_write']:
+                    _, elapsed = timed(payroll.write_payslips, month, columns)
+                    totals['write'] += elapsed
+
+            _, baseline = timed(self.orm_loop, months[0], options['baseline_employees'])
+            written = Payslip.objects.count()
+
+        employee_months = len(ids) * len(months)
+        engine_total = sum(totals.values())
+        self.stdout.write(f'engine:  {engine}')
+        self.stdout.write(f'{employee_months:,} employee-months ({written:,} payslips written)')
+        for phase, elapsed in totals.items():
+            self.stdout.write(f'  {phase:<8}{elapsed:8.2f}s')
+        self.stdout.write(f'  {"total":<8}{engine_total:8.2f}s   ({employee_months / engine_total:,.0f} employee-months/s)')
+        per_employee = baseline / options['baseline_employees']
+        self.stdout.write(
+            f'ORM loop: {per_employee * 1e6:.0f} us/employee-month, '
+            f'~{per_employee * employee_months:,.0f}s for the same work ({per_employee * employee_months / engine_total:.0f}x slower)'
+        )
+
+    def orm_loop(self, month, limit):
+        """The old approach: one object at a time, rates and deductions in Python."""
+        config = payroll._config()
+        for employee in Employee.objects.filter(archived=False, salary__isnull=False).order_by('id')[:limit]:
+            rollup = AttendanceRollup.objects.filter(employee=employee, month=month).first()
+            salary = float(employee.salary)
+            daily = salary / config['WORKING_DAYS']
+            hours = rollup.overtime_hours if rollup else 0
+            days = rollup.days_leave_approved if rollup else 0
+            overtime_pay = round(hours * daily / config['HOURS_PER_DAY'] * config['OVERTIME_MULTIPLIER'], 2)
+            deduction = round(min(max(days - config['PAID_LEAVE_DAYS'], 0) * daily, salary), 2)
+            Payslip.objects.update_or_create(
+                employee=employee, month=month,
+                defaults={
+                    'base_pay': round(salary, 2), 'overtime_hours': hours, 'overtime_pay': overtime_pay,
+                    'leave_days': days, 'leave_deduction': deduction, 'gross_pay': round(salary + overtime_pay - deduction, 2),
+                },
+            )
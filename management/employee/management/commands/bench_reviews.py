@@ -0,0 +1,51 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from employee.benchmarking import scratch_database, seed, api_client, timed
+from employee.models import PerformanceReview
+
+
+class Command(BaseCommand):
+    help = 'Compare review throughput of the per-request submit_performance_review path with the bulk_submit endpoint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=2000)
+        parser.add_argument('--reviews', type=int, default=2, help='Reviews per employee on each path.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        with scratch_database():
+            ids = seed(options['employees'], 0, tables=())
+            client = api_client()
+            reviews = [
+                {'employee_id': employee_id, 'review': 'Meets expectations.', 'rating': rng.randint(1, 10)}
+                for _ in range(options['reviews'])
+                for employee_id in ids
+            ]
+
+            def per_request():
+                for item in reviews:
+                    response = client.post(
+                        f"/api/performance/{item['employee_id']}/submit_performance_review/",
+                        {'review': item['review'], 'rating': item['rating']},
+                        format='json',
+                    )
+                    assert response.status_code == 201, response.data
+
+            _, single_elapsed = timed(per_request)
+
+            def bulk():
+                for start in range(0, len(reviews), options['batch_size']):
+                    response = client.post('/api/performance/bulk_submit/', reviews[start:start + options['batch_size']], format='json')
+                    assert response.data['errors'] == 0, response.data
+
+            _, bulk_elapsed = timed(bulk)
+            assert PerformanceReview.objects.count() == 2 * len(reviews)
+
+        count = len(reviews)
+        single_rate, bulk_rate = count / single_elapsed, count / bulk_elapsed
+        self.stdout.write(f'per-request: {count} reviews in {single_elapsed:.2f}s ({single_rate:,.0f} reviews/s)')
+        self.stdout.write(f'bulk submit: {count} reviews in {bulk_elapsed:.2f}s ({bulk_rate:,.0f} reviews/s)')
+        self.stdout.write(f'speed-up:    {bulk_rate / single_rate:.1f}x')
@@ -0,0 +1,53 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from employee.benchmarking import scratch_database, seed
+from employee.search import get_backend, rebuild_search_index, search_employees
+
+QUERIES = [
+    ('prefix', 'emp'),
+    ('prefix', 'employee 4242'),
+    ('prefix', 'eng lead'),
+    ('fulltext', 'finance analyst'),
+    ('fulltext', 'employee 123456'),
+    ('fuzzy', 'enginering'),
+    ('fuzzy', 'emplyee 99'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Measure employee search latency (p50/p99) per mode on the database backend and the in-process index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--in-process', action='store_true', help='Also measure the in-process index.')
+
+    def handle(self, *args, **options):
+        backends = [None]
+        if options['in_process']:
+            backends.append('employee.search.InProcessSearch')
+        with scratch_database():
+            seed(options['employees'], 0, tables=())
+            for path in backends:
+                with override_settings(EMPLOYEE_SEARCH_BACKEND=path):
+                    started = time.perf_counter()
+                    count = rebuild_search_index()
+                    self.stdout.write(
+                        f'\n{type(get_backend()).__name__}: indexed {count} employees in {time.perf_counter() - started:.1f}s'
+                    )
+                    for mode, query in QUERIES:
+                        latencies = []
+                        for _ in range(options['repeat']):
+                            started = time.perf_counter()
+                            hits = search_employees(query, mode, 20)
+                            latencies.append(time.perf_counter() - started)
+                        latencies.sort()
+                        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                        self.stdout.write(
+                            f'  {mode:<9}{query!r:<20}{len(hits):>3} hits   '
+                            f'p50 {statistics.median(latencies) * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms'
+                        )
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from employee.benchmarking import scratch_database, seed, timed
+from employee.fastpath import compile_plan
+from employee.models import Employee, SalaryHistory, PerformanceReview, Attendance
+from employee.planning import plan_queryset
+from employee.serializers import EmployeeSerializer, SalaryHistorySerializer, PerformanceReviewSerializer, AttendanceSerializer
+
+CASES = [
+    ('employees', Employee, EmployeeSerializer),
+    ('salary history', SalaryHistory, SalaryHistorySerializer),
+    ('performance', PerformanceReview, PerformanceReviewSerializer),
+    ('attendance', Attendance, AttendanceSerializer),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare the fast-path FieldPlan serializer with the DRF serializers and check the JSON is byte-identical.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 100000, 1000000])
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        for size in options['sizes']:
+            with scratch_database():
+                seed(size, 1)
+                self.stdout.write(f'\n{size} rows per table')
+                for name, model, serializer_class in CASES:
+                    queryset = model.objects.order_by('pk')
+
+                    def drf():
+                        return renderer.render(serializer_class(plan_queryset(queryset, serializer_class), many=True).data)
+
+                    def fast():
+                        plan = compile_plan(serializer_class())
+                        return renderer.render(plan.serialize(queryset.values(*plan.columns)))
+
+                    expected, drf_elapsed = timed(drf)
+                    actual, fast_elapsed = timed(fast)
+                    if actual != expected:
+                        raise CommandError(f'{name}: fast-path output differs from {serializer_class.__name__}')
+                    self.stdout.write(
+                        f'  {name:<16}drf {drf_elapsed:8.3f}s   fast {fast_elapsed:8.3f}s   {drf_elapsed / fast_elapsed:5.1f}x'
+                    )
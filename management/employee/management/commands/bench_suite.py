@@ -0,0 +1,362 @@
+import datetime
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import resolve
+
+from employee.authentication import tokens_for
+from employee.benchmarking import scratch_database, api_client
+from employee.models import Employee, SalaryHistory, PerformanceReview, Attendance, Job, LEAVE_STATUSES
+from employee.seeding import seed_data
+from employee.urls import router
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+
+# Seeded data ends here so every run sees the same rows and dates.
+END = datetime.date(2025, 6, 30)
+FREE_DAY = '2025-07-07'
+
+# (name, method, path, body, setup). Paths and bodies are formatted with the
+# ids picked by _fixtures. `setup` requests run first in the same rolled-back
+# transaction and aren't measured.
+CASES = [
+    ('auth register', 'post', '/api/auth/register/', {'username': 'bench-new', 'email': 'bench@example.com', 'password': 'a-long-passphrase', 'password2': 'a-long-passphrase'}, ()),
+    ('auth login', 'post', '/api/auth/login/', {'username': 'benchmark', 'password': 'benchmark-password'}, ()),
+    ('auth logout', 'post', '/api/auth/logout/', None, ()),
+
+    ('employees list', 'get', '/api/employees/', None, ()),
+    ('employees list filtered', 'get', '/api/employees/?department=Engineering&ordering=-salary&page_size=100', None, ()),
+    ('employees list sparse', 'get', '/api/employees/?fields=id,name', None, ()),
+    ('employees retrieve', 'get', '/api/employees/{employee}/', None, ()),
+    ('employees create', 'post', '/api/employees/', {'name': 'Bench Mark', 'department': 'Engineering', 'position': 'Analyst', 'salary': '40000.00'}, ()),
+    ('employees update', 'put', '/api/employees/{employee}/', {'name': 'Bench Mark', 'department': 'Sales', 'position': 'Lead', 'salary': '90000.00'}, ()),
+    ('employees partial_update', 'patch', '/api/employees/{employee}/', {'position': 'Lead'}, ()),
+    ('employees destroy', 'delete', '/api/employees/{employee}/', None, ()),
+    ('employees archived', 'get', '/api/employees/archived/', None, ()),
+    ('employees export', 'get', '/api/employees/export/', None, ()),
+    ('employees export background', 'get', '/api/employees/export/?background=true', None, ()),
+    ('employees search', 'get', '/api/employees/search/?q=mari', None, ()),
+    ('employees request_department_transfer', 'patch', '/api/employees/{employee}/request_department_transfer/', {'new_department': 'Finance'}, ()),
+    ('employees approve_transfer', 'patch', '/api/employees/{employee}/approve_transfer/', {'approval': 'approve'}, ()),
+    ('employees deactivate', 'patch', '/api/employees/{employee}/deactivate/', None, ()),
+    ('employees restore', 'patch', '/api/employees/{employee}/restore/', None, ()),
+    ('employees archive', 'patch', '/api/employees/{employee}/archive/', None, ()),
+    ('employees unarchive', 'patch', '/api/employees/{employee}/unarchive/', None, (('patch', '/api/employees/{employee}/archive/', None),)),
+
+    ('salary list', 'get', '/api/salary/', None, ()),
+    ('salary retrieve', 'get', '/api/salary/{salary}/', None, ()),
+    ('salary partial_update', 'patch', '/api/salary/{salary}/', {'employee': '{employee}'}, ()),
+    ('salary destroy', 'delete', '/api/salary/{salary}/', None, ()),
+    ('salary salary_history', 'get', '/api/salary/{employee}/salary_history/', None, ()),
+    ('salary adjust_salary', 'patch', '/api/salary/{employee}/adjust_salary/', {'new_salary': 99000}, ()),
+    ('salary export', 'get', '/api/salary/export/', None, ()),
+    ('salary as_of', 'get', '/api/salary/as_of/?date=2025-03-31', None, ()),
+    ('salary payroll', 'get', '/api/salary/payroll/?start=2025-01&end=2025-06', None, ()),
+    ('salary bulk_adjust', 'post', '/api/salary/bulk_adjust/', {'percentage': 3, 'department': 'Engineering'}, ()),
+
+    ('performance list', 'get', '/api/performance/', None, ()),
+    ('performance retrieve', 'get', '/api/performance/{review}/', None, ()),
+    ('performance create', 'post', '/api/performance/', {'employee': '{employee}', 'review': 'Meets expectations.', 'rating': 7}, ()),
+    ('performance update', 'put', '/api/performance/{review}/', {'employee': '{employee}', 'review': 'Exceeds expectations.', 'rating': 9}, ()),
+    ('performance partial_update', 'patch', '/api/performance/{review}/', {'rating': 8}, ()),
+    ('performance destroy', 'delete', '/api/performance/{review}/', None, ()),
+    ('performance performance_reviews', 'get', '/api/performance/{employee}/performance_reviews/', None, ()),
+    ('performance submit_performance_review', 'post', '/api/performance/{employee}/submit_performance_review/', {'review': 'Strong quarter.', 'rating': 8}, ()),
+    ('performance bulk_submit', 'post', '/api/performance/bulk_submit/', {'reviews': '{reviews}'}, ()),
+    ('performance top_performers', 'get', '/api/performance/top_performers/', None, ()),
+    ('performance top_performers department', 'get', '/api/performance/top_performers/?department=Engineering&limit=50', None, ()),
+    ('performance remove_performance_record', 'delete', '/api/performance/{employee}/remove_performance_record/', {'review_id': '{review}'}, ()),
+
+    ('attendance list', 'get', '/api/attendance/', None, ()),
+    ('attendance list filtered', 'get', '/api/attendance/?status=Late&page_size=100', None, ()),
+    ('attendance retrieve', 'get', '/api/attendance/{attendance}/', None, ()),
+    ('attendance create', 'post', '/api/attendance/', {'employee': '{employee}', 'date': FREE_DAY, 'status': 'Present'}, ()),
+    ('attendance update', 'put', '/api/attendance/{attendance}/', {'employee': '{employee}', 'date': '{day}', 'status': 'Late'}, ()),
+    ('attendance partial_update', 'patch', '/api/attendance/{attendance}/', {'status': 'Late'}, ()),
+    ('attendance destroy', 'delete', '/api/attendance/{attendance}/', None, ()),
+    ('attendance employee_attendance', 'get', '/api/attendance/{employee}/employee_attendance/', None, ()),
+    ('attendance check_in', 'post', '/api/attendance/{employee}/check_in/', None, ()),
+    ('attendance check_out', 'post', '/api/attendance/{employee}/check_out/', None, (('post', '/api/attendance/{employee}/check_in/', None),)),
+    ('attendance export', 'get', '/api/attendance/export/?start=2025-06-01&end=2025-06-30', None, ()),
+    ('attendance ingest', 'post', '/api/attendance/ingest/', {'events': '{events}'}, ()),
+    ('attendance overtime_hours', 'get', '/api/attendance/{employee}/overtime_hours/', None, ()),
+    ('attendance overtime_summary', 'get', '/api/attendance/overtime_summary/?start=2025-01&end=2025-06', None, ()),
+    ('attendance leave_history', 'get', '/api/attendance/{employee}/leave_history/', None, ()),
+    ('attendance request_leave', 'post', '/api/attendance/{employee}/request_leave/', {'date': FREE_DAY}, ()),
+    ('attendance approve_leave', 'patch', '/api/attendance/{employee}/approve_leave/', {'date': FREE_DAY, 'approval': 'approve'},
+        (('post', '/api/attendance/{employee}/request_leave/', {'date': FREE_DAY}),)),
+    ('attendance delete_attendance', 'delete', '/api/attendance/{employee}/delete_attendance/', {'dates': ['{day}']}, ()),
+    ('attendance delete_all_attendance', 'delete', '/api/attendance/{employee}/delete_all_attendance/', None, ()),
+
+    ('analytics departments', 'get', '/api/analytics/departments/', None, ()),
+    ('analytics departments window', 'get', '/api/analytics/departments/?start=2025-01-01&end=2025-03-31', None, ()),
+
+    ('async employee_attendance', 'get', '/api/async/attendance/{employee}/employee_attendance/', None, ()),
+    ('async check_in', 'post', '/api/async/attendance/{employee}/check_in/', None, ()),
+    ('async check_out', 'post', '/api/async/attendance/{employee}/check_out/', None, (('post', '/api/async/attendance/{employee}/check_in/', None),)),
+
+    ('jobs list', 'get', '/api/jobs/', None, ()),
+    ('jobs retrieve', 'get', '/api/jobs/{job}/', None, ()),
+
+    ('metrics', 'get', '/metrics', None, ()),
+]
+
+STANDARD_ACTIONS = ('list', 'create', 'retrieve', 'update', 'partial_update', 'destroy')
+
+# SalaryHistorySerializer renders the amounts as read-only strings, so a
+# salary record can't be written through the plain endpoints; salary
+# changes go through adjust_salary and bulk_adjust.
+# A job download only sends a file that an export job wrote.
+NOT_BENCHMARKED = {('SalaryViewSet', 'create'), ('SalaryViewSet', 'update'), ('JobViewSet', 'download')}
+
+
+def _fixtures():
+    """Ids and payloads the cases refer to, from the freshly seeded data."""
+    # Someone with a salary history and leave on record, so no detail action comes back empty.
+    employee = (
+        Employee.objects.filter(archived=False, active=True, salary_history__isnull=False, attendance__status__in=LEAVE_STATUSES)
+        .order_by('id').first()
+    )
+    others = list(Employee.objects.filter(archived=False).exclude(pk=employee.pk).order_by('id').values_list('id', flat=True)[:100])
+    return {
+        'employee': employee.pk,
+        'salary': SalaryHistory.objects.filter(employee=employee).values_list('id', flat=True).first(),
+        'review': PerformanceReview.objects.filter(employee=employee).values_list('id', flat=True).first(),
+        'attendance': Attendance.objects.filter(employee=employee).order_by('-date').values_list('id', flat=True).first(),
+        'day': str(Attendance.objects.filter(employee=employee).order_by('-date').values_list('date', flat=True).first()),
+        'job': Job.objects.create(
+            kind='export', params={'target': 'employees', 'output': 'csv'}, status='succeeded', total=1, done=1,
+            result={'file': 'job-0.csv', 'filename': 'employees.csv', 'rows': 1, 'bytes': 1},
+            requested_by=get_user_model().objects.get(username='benchmark'),
+        ).pk,
+        'reviews': [{'employee_id': pk, 'review': 'Meets expectations.', 'rating': 6} for pk in others],
+        'events': [
+            {'employee_id': pk, 'kind': kind, 'timestamp': f'{FREE_DAY}T{hour}:00:00'}
+            for pk in others for kind, hour in (('check_in', '09'), ('check_out', '18'))
+        ],
+    }
+
+
+def _fill(value, fixtures):
+    if isinstance(value, str):
+        if value.startswith('{') and value.endswith('}') and value[1:-1] in fixtures:
+            # A lone placeholder keeps the fixture's type (an id or a list).
+            return fixtures[value[1:-1]]
+        return value.format(**fixtures)
+    if isinstance(value, list):
+        return [_fill(item, fixtures) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, fixtures) for key, item in value.items()}
+    return value
+
+
+def _send(client, method, path, body):
+    response = getattr(client, method)(path, body, format='json') if body is not None else getattr(client, method)(path)
+    # Streamed exports do their work while the body is read.
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def _covered(cases):
+    """(view, action) pairs the cases reach, resolved the way the router dispatches them."""
+    covered = set()
+    for _, method, path, _, _ in cases:
+        match = resolve(path.split('?')[0].format(employee=1, salary=1, review=1, attendance=1, job=1))
+        actions = getattr(match.func, 'actions', None)
+        if actions:
+            covered.add((match.func.cls.__name__, actions[method]))
+    return covered
+
+
+def _registered():
+    actions = set()
+    for _, viewset, _ in router.registry:
+        for name in STANDARD_ACTIONS:
+            if hasattr(viewset, name):
+                actions.add((viewset.__name__, name))
+        for extra in viewset.get_extra_actions():
+            actions.add((viewset.__name__, extra.__name__))
+    return actions
+
+
+class Command(BaseCommand):
+    help = (
+        'Run every list, detail and custom action through the test client against freshly seeded data, '
+        'recording latency, query count and peak memory, and compare them with a stored baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=500)
+        parser.add_argument('--days', type=int, default=130, help='Working days of attendance per employee.')
+        parser.add_argument('--repeat', type=int, default=15, help='Timed runs per case, after one warm-up run.')
+        parser.add_argument('--only', help='Run only the cases whose name contains this text.')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline.')
+        parser.add_argument(
+            '--latency-tolerance', type=float, default=1.0,
+            help='Allowed slowdown of the fastest run, as a fraction. Timings of a few ms vary by tens of percent between runs.',
+        )
+        parser.add_argument('--latency-floor', type=float, default=2.0, help='Slowdowns under this many ms are ignored.')
+        parser.add_argument('--memory-tolerance', type=float, default=0.25, help='Allowed peak memory growth, as a fraction.')
+
+    def handle(self, *args, **options):
+        cases = [case for case in CASES if not options['only'] or options['only'] in case[0]]
+        missing = _registered() - _covered(CASES) - NOT_BENCHMARKED
+        for view, action in sorted(missing):
+            self.stderr.write(self.style.WARNING(f'No benchmark case for {view}.{action}'))
+
+        scale = {'employees': options['employees'], 'days': options['days']}
+        # Keep the token auth's user-state cache warm for the whole run, as it
+        # is in steady state, so query counts don't depend on timing.
+        claims_auth = {**getattr(settings, 'JWT_CLAIMS_AUTH', {}), 'STATE_TTL': 3600}
+        with scratch_database(), override_settings(JWT_CLAIMS_AUTH=claims_auth):
+            seed_data(options['employees'], days=options['days'], end=END)
+            client = api_client()
+            user = get_user_model().objects.get(username='benchmark')
+            user.set_password('benchmark-password')
+            # Staff, so /metrics answers it.
+            user.is_staff = True
+            user.save()
+            # A real token, so authentication is measured too and the async views accept it.
+            client.force_authenticate(None)
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for(user).access_token}')
+            fixtures = _fixtures()
+            self.stdout.write(f'{"case":<48}{"status":>6}{"min ms":>9}{"median":>9}{"p95":>9}{"queries":>10}{"peak":>13}')
+            results = {}
+            for name, method, path, body, setup in cases:
+                results[name] = self._measure(client, fixtures, method, path, body, setup, options['repeat'])
+                self._report(name, results[name])
+
+        if options['save_baseline']:
+            self._save(options['baseline'], scale, results, partial=bool(options['only']))
+            return
+        self._compare(options, scale, results)
+
+    def _measure(self, client, fixtures, method, path, body, setup, repeat):
+        path, body = _fill(path, fixtures), _fill(body, fixtures)
+        setup = [(step_method, _fill(step_path, fixtures), _fill(step_body, fixtures)) for step_method, step_path, step_body in setup]
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries[-1] += 1
+            return execute(sql, params, many, context)
+
+        def run():
+            # Writes are rolled back, so every run starts from the seeded data.
+            with transaction.atomic():
+                for step in setup:
+                    response = _send(client, *step)
+                    if response.status_code >= 400:
+                        raise CommandError(f'Setup request {step[0].upper()} {step[1]} returned {response.status_code}')
+                queries.append(0)
+                with connection.execute_wrapper(count):
+                    started = time.perf_counter()
+                    response = _send(client, method, path, body)
+                    elapsed = time.perf_counter() - started
+                transaction.set_rollback(True)
+            if response.status_code >= 500:
+                raise CommandError(f'{method.upper()} {path} returned {response.status_code}')
+            return response.status_code, elapsed
+
+        run()
+        queries.clear()
+        timings = []
+        # A collection landing in one run would dominate its timing.
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                status_code, elapsed = run()
+                timings.append(elapsed * 1000)
+        finally:
+            gc.enable()
+
+        # Tracing slows everything down, so memory gets a run of its own.
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        timings.sort()
+        return {
+            'status': status_code,
+            'min_ms': round(timings[0], 3),
+            'median_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(timings[min(len(timings) - 1, round(len(timings) * 0.95) - 1)], 3),
+            # In-process buffers (e.g. of last logins) flush now and then.
+            'queries': statistics.mode(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def _report(self, name, result):
+        self.stdout.write(
+            f'{name:<48}{result["status"]:>6}{result["min_ms"]:>9.2f}{result["median_ms"]:>9.2f}{result["p95_ms"]:>9.2f}'
+            f'{result["queries"]:>10}{result["peak_kb"]:>10.1f} KB'
+        )
+
+    def _save(self, path, scale, results, partial=False):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if partial and path.exists():
+            # Re-recording some cases keeps the rest of the baseline.
+            previous = json.loads(path.read_text())
+            if previous['scale'] == scale:
+                results = {**previous['cases'], **results}
+        baseline = {
+            'scale': scale,
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'machine': platform.machine(),
+            },
+            'cases': results,
+        }
+        path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        self.stdout.write(self.style.SUCCESS(f'Saved the baseline for {len(results)} cases to {path}.'))
+
+    def _compare(self, options, scale, results):
+        path = Path(options['baseline'])
+        if not path.exists():
+            self.stdout.write(f'No baseline at {path}; run with --save-baseline to record one.')
+            return
+        baseline = json.loads(path.read_text())
+        if baseline['scale'] != scale:
+            raise CommandError(f'The baseline was recorded at {baseline["scale"]}, not {scale}.')
+
+        regressions = []
+        for name, result in results.items():
+            before = baseline['cases'].get(name)
+            if before is None:
+                self.stdout.write(f'{name}: new case, not in the baseline')
+                continue
+            if result['status'] != before['status']:
+                regressions.append(f'{name}: status {before["status"]} -> {result["status"]}')
+            # Query counts are deterministic, so any increase counts.
+            if result['queries'] > before['queries']:
+                regressions.append(f'{name}: {before["queries"]} -> {result["queries"]} queries')
+            # The fastest run is the one least disturbed by the rest of the machine.
+            slower = result['min_ms'] - before['min_ms']
+            if slower > options['latency_floor'] and result['min_ms'] > before['min_ms'] * (1 + options['latency_tolerance']):
+                regressions.append(f'{name}: fastest run {before["min_ms"]:.2f} -> {result["min_ms"]:.2f} ms')
+            if result['peak_kb'] > before['peak_kb'] * (1 + options['memory_tolerance']) and result['peak_kb'] - before['peak_kb'] > 64:
+                regressions.append(f'{name}: peak memory {before["peak_kb"]:.0f} -> {result["peak_kb"]:.0f} KB')
+
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} cases within the baseline.'))
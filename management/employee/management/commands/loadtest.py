@@ -0,0 +1,156 @@
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from employee.authentication import tokens_for
+
+ACTIONS = {
+    'employee_attendance': 'GET',
+    'check_in': 'POST',
+    'check_out': 'POST',
+}
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Server closed the connection')
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value:
+            chunked = True
+        elif name == 'connection' and value == 'close':
+            close = True
+
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(length)
+    return int(status_line.split()[1]), close
+
+
+async def _worker(host, port, method, paths, token, latencies, statuses):
+    reader = writer = None
+    while paths:
+        path = paths.pop()
+        if writer is None:
+            reader, writer = await asyncio.open_connection(host, port)
+        request = (
+            f'{method} {path} HTTP/1.1\r\nHost: {host}\r\nAuthorization: Bearer {token}\r\n'
+            f'Content-Length: 0\r\nConnection: keep-alive\r\n\r\n'
+        )
+        started = time.perf_counter()
+        writer.write(request.encode())
+        await writer.drain()
+        status_code, close = await _read_response(reader)
+        latencies.append(time.perf_counter() - started)
+        statuses[status_code] += 1
+        if close:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _run(url, method, paths, token, concurrency):
+    parts = urlsplit(url)
+    latencies, statuses = [], Counter()
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        _worker(parts.hostname, parts.port or 80, method, paths, token, latencies, statuses)
+        for _ in range(concurrency)
+    ])
+    return latencies, statuses, time.perf_counter() - started
+
+
+def _wait_for_port(host, port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f'Server did not start on {host}:{port}')
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the attendance hot paths: the DRF (sync) actions against their ASGI-native '
+        'versions under /api/async/, reporting p50/p99 latency and requests/sec.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the ASGI server.')
+        parser.add_argument('--sync-url', help='Base URL for the sync paths, e.g. a WSGI server. Defaults to --url.')
+        parser.add_argument('--serve', action='store_true', help='Start uvicorn on --url for the duration of the run.')
+        parser.add_argument('--username', required=True, help='User to issue the access token for.')
+        parser.add_argument('--action', choices=sorted(ACTIONS), default='employee_attendance')
+        parser.add_argument('--employee-ids', default='1-100', help='Range of employee ids to spread requests over.')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per path (read actions only).')
+        parser.add_argument('--concurrency', type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user named {options["username"]}')
+        token = str(tokens_for(user).access_token)
+
+        first, _, last = options['employee_ids'].partition('-')
+        ids = list(range(int(first), int(last or first) + 1))
+        action, method = options['action'], ACTIONS[options['action']]
+        if method == 'GET':
+            sync_ids = async_ids = [ids[n % len(ids)] for n in range(options['requests'])]
+        else:
+            # Each employee can only check in (or out) once a day, so the two
+            # runs get disjoint halves of the range.
+            sync_ids, async_ids = ids[:len(ids) // 2], ids[len(ids) // 2:]
+
+        server = None
+        if options['serve']:
+            parts = urlsplit(options['url'])
+            server = subprocess.Popen(
+                [sys.executable, '-m', 'uvicorn', 'management.asgi:application',
+                 '--host', parts.hostname, '--port', str(parts.port or 80), '--log-level', 'warning'],
+            )
+            _wait_for_port(parts.hostname, parts.port or 80)
+
+        try:
+            runs = [
+                ('sync (DRF)', options['sync_url'] or options['url'], [f'/api/attendance/{pk}/{action}/' for pk in sync_ids]),
+                ('async', options['url'], [f'/api/async/attendance/{pk}/{action}/' for pk in async_ids]),
+            ]
+            for label, url, paths in runs:
+                count = len(paths)
+                latencies, statuses, elapsed = asyncio.run(_run(url, method, paths, token, options['concurrency']))
+                latencies.sort()
+                p50 = statistics.median(latencies) * 1000
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+                self.stdout.write(
+                    f'{label:<12}{count:>7} requests  {count / elapsed:9.1f} req/s  '
+                    f'p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  statuses {dict(statuses)}'
+                )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
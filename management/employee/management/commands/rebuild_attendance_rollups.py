@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employee.rollups import rebuild_attendance_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-employee monthly attendance rollups from the Attendance table.'
+
+    def handle(self, *args, **options):
+        count = rebuild_attendance_rollups()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} attendance rollups.'))
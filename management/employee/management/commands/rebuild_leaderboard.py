@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employee.leaderboard import rebuild_leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the top-performers leaderboard from the PerformanceReview table.'
+
+    def handle(self, *args, **options):
+        count = rebuild_leaderboard()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} leaderboard entries.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employee.search import get_backend, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the employee search index from the Employee table (after bulk loads that skip signals).'
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} employees with {type(get_backend()).__name__}.'))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employee.jobs import run_job
+from employee.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs, oldest first. For deployments with JOBS["RUN_IN_PROCESS"] off.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new jobs instead of exiting when the queue is empty.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls with --loop.')
+        parser.add_argument(
+            '--requeue-running', action='store_true',
+            help='First put jobs left running by a runner that died back in the queue. Only safe when no other runner is up.',
+        )
+        parser.add_argument('--inline', action='store_true', help='Run chunks one after another in this process instead of on the worker pool.')
+
+    def handle(self, *args, **options):
+        if options['requeue_running']:
+            count = Job.objects.filter(status='running').update(status='queued', done=0, started_at=None)
+            self.stdout.write(f'Requeued {count} running jobs.')
+
+        ran = 0
+        while True:
+            job = Job.objects.filter(status='queued').order_by('id').values_list('id', 'kind').first()
+            if job is None:
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+                continue
+            if run_job(job[0], inline=options['inline']):
+                ran += 1
+                status = Job.objects.values_list('status', flat=True).get(pk=job[0])
+                self.stdout.write(f'Job {job[0]} ({job[1]}): {status}')
+        self.stdout.write(self.style.SUCCESS(f'Ran {ran} jobs.'))
@@ -0,0 +1,30 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employee import filters
+from employee.payroll import run_payroll
+from employee.rollups import month_start
+
+
+class Command(BaseCommand):
+    help = "Compute a month's payslips for every employee (salary, overtime premiums and leave deductions)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help='YYYY-MM. Defaults to last month.')
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                month = filters.month(options['month'])
+            except ValueError as error:
+                raise CommandError(str(error))
+        else:
+            month = month_start(month_start(timezone.localdate()) - datetime.timedelta(days=1))
+
+        summary = run_payroll(month)
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['month']}: {summary['payslips']} payslips, gross {summary['gross_total']:,}, "
+            f"overtime {summary['overtime_total']:,}, leave deductions {summary['leave_deductions']:,}"
+        ))
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employee import filters
+from employee.seeding import clear_data, seed_data
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with realistic synthetic employees, salary history, reviews and attendance, '
+        'e.g. --employees 10000 --days 1000 for 10M attendance rows.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--days', type=int, default=260, help='Working days of attendance per employee.')
+        parser.add_argument('--salary-changes', type=int, default=3, help='Average salary changes per employee.')
+        parser.add_argument('--reviews', type=int, default=4, help='Performance reviews per employee.')
+        parser.add_argument('--end', help='Last attendance day, YYYY-MM-DD. Defaults to yesterday.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same data.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--clear', action='store_true', help='Delete every employee and their records first.')
+
+    def handle(self, *args, **options):
+        end = None
+        if options['end']:
+            try:
+                end = filters.date(options['end'])
+            except ValueError as error:
+                raise CommandError(str(error))
+        if options['employees'] < 1 or options['days'] < 1:
+            raise CommandError('--employees and --days must be positive.')
+
+        if options['clear']:
+            clear_data()
+            self.stdout.write('Cleared existing data.')
+
+        started = time.perf_counter()
+        reported = {}
+
+        def progress(table, rows):
+            # One line per 100k rows is plenty at 10M.
+            if rows - reported.get(table, 0) >= 100000:
+                reported[table] = rows
+                self.stdout.write(f'  {table}: {rows:,} rows ({time.perf_counter() - started:.0f}s)')
+
+        counts = seed_data(
+            options['employees'],
+            days=options['days'],
+            salary_changes=options['salary_changes'],
+            reviews=options['reviews'],
+            end=end,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            progress=progress,
+        )
+        for table, rows in counts.items():
+            self.stdout.write(f'{table:<20}{rows:>12,}')
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {time.perf_counter() - started:.1f}s.'))
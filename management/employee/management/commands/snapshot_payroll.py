@@ -0,0 +1,35 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employee import filters
+from employee.rollups import month_start, next_month
+from employee.salaries import snapshot_payroll
+
+
+class Command(BaseCommand):
+    help = 'Store monthly payroll snapshots (salaries in effect at each month end, per department).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First month, YYYY-MM. Defaults to last month.')
+        parser.add_argument('--end', help='Last month, YYYY-MM. Defaults to --start.')
+        parser.add_argument('--replace', action='store_true', help='Recompute months that already have snapshots.')
+
+    def handle(self, *args, **options):
+        last_month = month_start(month_start(timezone.localdate()) - datetime.timedelta(days=1))
+        try:
+            start = filters.month(options['start']) if options['start'] else last_month
+            end = filters.month(options['end']) if options['end'] else start
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        month = start
+        while month <= end:
+            try:
+                snapshots = snapshot_payroll(month, replace=options['replace'])
+            except ValueError as error:
+                raise CommandError(str(error))
+            total = sum(snapshot.total_salary for snapshot in snapshots)
+            self.stdout.write(f'{month:%Y-%m}: {len(snapshots)} departments, total {total:,.2f}')
+            month = next_month(month)
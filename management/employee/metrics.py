@@ -0,0 +1,382 @@
+"""
+Per-endpoint request metrics, exposed in the Prometheus text format.
+
+MetricsMiddleware labels each request with its view and action, e.g.
+EmployeeViewSet/list or SalaryViewSet/salary_history. For each label it
+records:
+- latency, as a histogram
+- query count and SQL time, from an execute wrapper on every database
+  connection
+- serialization time, from MeasuredListSerializer and the fast list path
+- render time and response bytes
+
+The registry lives in the process. Each worker of a multi-process server
+reports its own numbers.
+
+/metrics answers staff users (by session or JWT) and scrapers that send
+`Authorization: Bearer <METRICS['TOKEN']>`; anyone else gets a 401.
+"""
+import bisect
+import hmac
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import ClaimsJWTAuthentication
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'BUCKETS': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    # Requests slower than this are logged with their SQL; None turns it off.
+    'SLOW_REQUEST_SECONDS': None,
+    'SLOW_REQUEST_QUERIES': 10,
+    # Bearer token for scrapers; None leaves /metrics to staff users.
+    'TOKEN': None,
+}
+
+# Other methods are labelled 'other', so clients can't mint a new series
+# per request by sending made-up methods.
+METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'METRICS', {})}
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'sql_seconds', 'serialize_seconds', 'statements', 'render_started')
+
+    def __init__(self, keep_statements):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.statements = [] if keep_statements else None
+        self.render_started = None
+
+
+def record_queries(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.queries += 1
+        metrics.sql_seconds += elapsed
+        if metrics.statements is not None:
+            metrics.statements.append((elapsed, sql))
+
+
+def _instrument(connection):
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    _instrument(connection)
+
+
+# Connections opened before this module was loaded missed the signal.
+for _connection in connections.all(initialized_only=True):
+    _instrument(_connection)
+
+
+class measure_serialization:
+    """Adds the time spent inside the block to the request's serialization time."""
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.serialize_seconds += time.perf_counter() - self.started
+
+
+class MeasuredListSerializer(serializers.ListSerializer):
+    """`Meta.list_serializer_class` for serializers whose list output is measured."""
+
+    @property
+    def data(self):
+        with measure_serialization():
+            return super().data
+
+
+class MeasuredSerializerMixin:
+    """Measures `.data` of a single object; nested serializers never call it."""
+
+    @property
+    def data(self):
+        with measure_serialization():
+            return super().data
+
+
+class Registry:
+    """Histograms and counters per (view, action, method), safe to share between threads."""
+
+    COUNTERS = ('queries', 'sql_seconds', 'serialize_seconds', 'render_seconds', 'response_bytes')
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _entry(self, labels):
+        entry = self._series.get(labels)
+        if entry is None:
+            entry = self._series[labels] = {
+                'buckets': [0] * (len(self.buckets) + 1),
+                'count': 0,
+                'latency_seconds': 0.0,
+                **dict.fromkeys(self.COUNTERS, 0),
+            }
+        return entry
+
+    def observe(self, labels, latency, **counters):
+        with self._lock:
+            entry = self._entry(labels)
+            entry['buckets'][bisect.bisect_left(self.buckets, latency)] += 1
+            entry['count'] += 1
+            entry['latency_seconds'] += latency
+            for name, value in counters.items():
+                entry[name] += value
+
+    def add(self, labels, **counters):
+        with self._lock:
+            entry = self._entry(labels)
+            for name, value in counters.items():
+                entry[name] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: {**entry, 'buckets': list(entry['buckets'])} for labels, entry in self._series.items()}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = Registry(_config()['BUCKETS'])
+    return _registry
+
+
+def view_labels(request):
+    method = request.method if request.method in METHODS else 'other'
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return ('unmatched', '', method)
+    view = getattr(match.func, 'cls', None)
+    if view is None:
+        return (match.view_name or f'{match.func.__module__}.{match.func.__name__}', '', method)
+    actions = getattr(match.func, 'actions', None) or {}
+    return (view.__name__, actions.get(request.method.lower(), ''), method)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_metrics(registry=None):
+    registry = registry or get_registry()
+    series = sorted(registry.snapshot().items())
+    lines = []
+
+    def label_text(labels, **extra):
+        pairs = dict(zip(('view', 'action', 'method'), labels), **extra)
+        return ','.join(f'{name}="{_escape(str(value))}"' for name, value in pairs.items())
+
+    lines += [
+        '# HELP ems_request_duration_seconds Request latency by view action.',
+        '# TYPE ems_request_duration_seconds histogram',
+    ]
+    for labels, entry in series:
+        cumulative = 0
+        for bound, count in zip((*registry.buckets, '+Inf'), entry['buckets']):
+            cumulative += count
+            lines.append(f'ems_request_duration_seconds_bucket{{{label_text(labels, le=bound)}}} {cumulative}')
+        lines.append(f'ems_request_duration_seconds_sum{{{label_text(labels)}}} {entry["latency_seconds"]:.6f}')
+        lines.append(f'ems_request_duration_seconds_count{{{label_text(labels)}}} {entry["count"]}')
+
+    for name, help_text in (
+        ('queries', 'Database queries issued.'),
+        ('sql_seconds', 'Time spent executing SQL.'),
+        ('serialize_seconds', 'Time spent in serializers.'),
+        ('render_seconds', 'Time spent rendering responses.'),
+        ('response_bytes', 'Response body bytes sent.'),
+    ):
+        lines += [f'# HELP ems_request_{name}_total {help_text}', f'# TYPE ems_request_{name}_total counter']
+        for labels, entry in series:
+            lines.append(f'ems_request_{name}_total{{{label_text(labels)}}} {entry[name]}')
+    return '\n'.join(lines) + '\n'
+
+
+def _may_read_metrics(request):
+    token = _config()['TOKEN']
+    scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+        return True
+    if getattr(request, 'user', None) is not None and request.user.is_staff:
+        return True
+    try:
+        authenticated = ClaimsJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return authenticated is not None and authenticated[0].is_staff
+
+
+def metrics_view(request):
+    if not _may_read_metrics(request):
+        response = HttpResponse('Authentication required.\n', status=401, content_type='text/plain; charset=utf-8')
+        response['WWW-Authenticate'] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class MetricsMiddleware:
+    """
+    Times every request and attributes it to its view action. Place it
+    first in MIDDLEWARE so the latency covers the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = _config()
+        self.enabled = config['ENABLED']
+        self.slow_seconds = config['SLOW_REQUEST_SECONDS']
+        self.slow_queries = config['SLOW_REQUEST_QUERIES']
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        started, metrics, token = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, started, metrics)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        started, metrics, token = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, started, metrics)
+
+    def process_template_response(self, request, response):
+        # Called after the view returns and before Django renders the response.
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.render_started = time.perf_counter()
+        return response
+
+    def _start(self):
+        metrics = RequestMetrics(keep_statements=self.slow_seconds is not None)
+        return time.perf_counter(), metrics, _current.set(metrics)
+
+    def _finish(self, request, response, started, metrics):
+        finished = time.perf_counter()
+        latency = finished - started
+        labels = view_labels(request)
+        registry = get_registry()
+
+        if response.streaming:
+            count = self._count_async_stream if getattr(response, 'is_async', False) else self._count_stream
+            response.streaming_content = count(response.streaming_content, registry, labels, metrics)
+            body_bytes = 0
+        else:
+            body_bytes = len(response.content)
+
+        registry.observe(
+            labels,
+            latency,
+            queries=metrics.queries,
+            sql_seconds=metrics.sql_seconds,
+            serialize_seconds=metrics.serialize_seconds,
+            render_seconds=finished - metrics.render_started if metrics.render_started else 0.0,
+            response_bytes=body_bytes,
+        )
+
+        if self.slow_seconds is not None and latency >= self.slow_seconds:
+            slowest = sorted(metrics.statements, reverse=True)[:self.slow_queries]
+            logger.warning(
+                'Slow request %s %s (%s/%s): %.3fs, %d queries, %.3fs SQL\n%s',
+                request.method, request.path, labels[0], labels[1], latency, metrics.queries, metrics.sql_seconds,
+                '\n'.join(f'  {elapsed * 1000:8.2f} ms  {sql}' for elapsed, sql in slowest),
+            )
+        return response
+
+    # Streaming bodies (exports) run their queries while they are sent, so
+    # the request's metrics are made current again around each chunk and the
+    # extra queries and bytes are added when the stream ends.
+
+    @staticmethod
+    def _count_stream(content, registry, labels, metrics):
+        queries, sql_seconds, sent = metrics.queries, metrics.sql_seconds, 0
+        chunks = iter(content)
+        try:
+            while True:
+                token = _current.set(metrics)
+                try:
+                    chunk = next(chunks, None)
+                finally:
+                    _current.reset(token)
+                if chunk is None:
+                    break
+                sent += len(chunk)
+                yield chunk
+        finally:
+            registry.add(labels, response_bytes=sent, queries=metrics.queries - queries, sql_seconds=metrics.sql_seconds - sql_seconds)
+
+    @staticmethod
+    async def _count_async_stream(content, registry, labels, metrics):
+        queries, sql_seconds, sent = metrics.queries, metrics.sql_seconds, 0
+        chunks = aiter(content)
+        try:
+            while True:
+                token = _current.set(metrics)
+                try:
+                    chunk = await anext(chunks, None)
+                finally:
+                    _current.reset(token)
+                if chunk is None:
+                    break
+                sent += len(chunk)
+                yield chunk
+        finally:
+            registry.add(labels, response_bytes=sent, queries=metrics.queries - queries, sql_seconds=metrics.sql_seconds - sql_seconds)
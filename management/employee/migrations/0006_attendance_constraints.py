@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:54
+
+from django.db import migrations, models
+from django.db.models import Count
+
+LEAVE_STATUSES = ('Leave', 'leave', 'on leave')
+PRESENT_STATUSES = ('Present', 'Late')
+
+
+def merge_rows(rows):
+    """
+    Fold duplicate attendance `rows` for one (employee, date) into the most
+    complete one, without losing a time or overtime any of them holds:
+    - the earliest check-in and the latest check-out
+    - the largest overtime
+    - the status they agree on; Present/Late mixes take the status of the
+      earliest check-in
+
+    Returns (row to keep, rows to delete). Raises ValueError when statuses
+    conflict in a way only a person can settle, e.g. Absent and Present.
+    """
+    keep = max(rows, key=lambda row: (
+        (row.check_in_time is not None) + (row.check_out_time is not None) + (row.overtime_hours > 0), -row.id,
+    ))
+    check_ins = [row for row in rows if row.check_in_time is not None]
+    check_outs = [row.check_out_time for row in rows if row.check_out_time is not None]
+
+    statuses = {row.status for row in rows}
+    if len(statuses) > 1:
+        if not statuses <= set(PRESENT_STATUSES):
+            raise ValueError(f'statuses {sorted(statuses)} on rows {[row.id for row in rows]}')
+        status = min(check_ins, key=lambda row: row.check_in_time).status if check_ins else keep.status
+    else:
+        status = statuses.pop()
+
+    keep.status = status
+    keep.check_in_time = min(row.check_in_time for row in check_ins) if check_ins else None
+    keep.check_out_time = max(check_outs) if check_outs else None
+    keep.overtime_hours = max(row.overtime_hours for row in rows)
+    return keep, [row for row in rows if row is not keep]
+
+
+def merge_duplicate_attendance(apps, schema_editor):
+    # Concurrent check-ins could create several rows for the same day. They
+    # are merged rather than dropped, since a later row may hold the only
+    # check-out or overtime; if any can't be merged nothing is changed.
+    Attendance = apps.get_model('employee', 'Attendance')
+    groups = (
+        Attendance.objects.values('employee', 'date').annotate(rows=Count('id')).filter(rows__gt=1).order_by('employee', 'date')
+    )
+    merged, conflicts = [], []
+    for group in groups:
+        rows = list(Attendance.objects.filter(employee_id=group['employee'], date=group['date']).order_by('id'))
+        try:
+            merged.append(merge_rows(rows))
+        except ValueError as error:
+            conflicts.append(f'employee {group["employee"]} on {group["date"]}: {error}')
+    if conflicts:
+        raise RuntimeError(
+            'Duplicate attendance rows that cannot be merged automatically. Keep one row per '
+            'employee and day for each of these, then run the migration again:\n  ' + '\n  '.join(conflicts)
+        )
+    for keep, duplicates in merged:
+        Attendance.objects.filter(id__in=[row.id for row in duplicates]).delete()
+        keep.save(update_fields=['status', 'check_in_time', 'check_out_time', 'overtime_hours'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0005_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_attendance, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['employee', 'status'], name='attendance_employee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(condition=models.Q(('status__in', ('Leave', 'leave', 'on leave'))), fields=['employee', 'date'], name='attendance_leave_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('employee', 'date'), name='unique_attendance_per_day'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+
+def build_rollups(apps, schema_editor):
+    Attendance = apps.get_model('employee', 'Attendance')
+    AttendanceRollup = apps.get_model('employee', 'AttendanceRollup')
+    rows = (
+        Attendance.objects.annotate(month=TruncMonth('date'))
+        .values('employee_id', 'month')
+        .annotate(
+            overtime_hours=Sum('overtime_hours'),
+            days_present=Count('id', filter=Q(status__in=('Present', 'Late'))),
+            days_leave=Count('id', filter=Q(status__in=('Leave', 'leave', 'on leave'))),
+            records=Count('id'),
+        )
+        .order_by()
+    )
+    AttendanceRollup.objects.bulk_create(
+        [AttendanceRollup(**dict(row, overtime_hours=row['overtime_hours'] or 0)) for row in rows],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0006_attendance_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('overtime_hours', models.FloatField(default=0)),
+                ('days_present', models.IntegerField(default=0)),
+                ('days_leave', models.IntegerField(default=0)),
+                ('records', models.IntegerField(default=0)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollups', to='employee.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['month', 'employee'], name='rollup_month_employee_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'month'), name='unique_rollup_per_month')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+POSTGRES_DOCUMENT = "(name || ' ' || department || ' ' || position)"
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('PRAGMA compile_options')
+            if 'ENABLE_FTS5' not in {row[0] for row in cursor.fetchall()}:
+                return
+            cursor.execute(
+                'CREATE VIRTUAL TABLE employee_search USING fts5('
+                "name, department, position, tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+            )
+            cursor.execute("CREATE VIRTUAL TABLE employee_search_vocab USING fts5vocab(employee_search, 'row')")
+            cursor.execute('CREATE TABLE employee_search_terms (term TEXT PRIMARY KEY) WITHOUT ROWID')
+            cursor.execute(
+                'INSERT INTO employee_search (rowid, name, department, position) '
+                'SELECT id, name, department, position FROM employee_employee WHERE NOT archived'
+            )
+            cursor.execute('INSERT INTO employee_search_terms (term) SELECT term FROM employee_search_vocab')
+        elif connection.vendor == 'postgresql':
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                f"CREATE INDEX employee_search_tsv ON employee_employee USING gin (to_tsvector('simple', {POSTGRES_DOCUMENT}))"
+            )
+            cursor.execute(
+                f'CREATE INDEX employee_search_trgm ON employee_employee USING gin ({POSTGRES_DOCUMENT} gin_trgm_ops)'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('DROP TABLE IF EXISTS employee_search_terms')
+            cursor.execute('DROP TABLE IF EXISTS employee_search_vocab')
+            cursor.execute('DROP TABLE IF EXISTS employee_search')
+        elif connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS employee_search_tsv')
+            cursor.execute('DROP INDEX IF EXISTS employee_search_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0009_user_tokens_valid_after'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+
+
+def build_leaderboard(apps, schema_editor):
+    Employee = apps.get_model('employee', 'Employee')
+    PerformanceReview = apps.get_model('employee', 'PerformanceReview')
+    LeaderboardEntry = apps.get_model('employee', 'LeaderboardEntry')
+    latest = PerformanceReview.objects.filter(employee=OuterRef('pk')).order_by('-created_at', '-id')
+    rows = (
+        Employee.objects.annotate(
+            review_count=Count('reviews'),
+            rating_total=Sum('reviews__rating'),
+            latest_rating=Subquery(latest.values('rating')[:1]),
+            latest_review_at=Subquery(latest.values('created_at')[:1]),
+        )
+        .filter(review_count__gt=0)
+        .values('id', 'department', 'review_count', 'rating_total', 'latest_rating', 'latest_review_at')
+        .order_by()
+    )
+    LeaderboardEntry.objects.bulk_create(
+        [
+            LeaderboardEntry(
+                employee_id=row.pop('id'),
+                average_rating=row['rating_total'] / row['review_count'],
+                **row,
+            )
+            for row in rows
+        ],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0012_analytics_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='leaderboard_entry', serialize=False, to='employee.employee')),
+                ('department', models.CharField(max_length=100)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_total', models.IntegerField(default=0)),
+                ('average_rating', models.FloatField(default=0)),
+                ('latest_rating', models.IntegerField()),
+                ('latest_review_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-average_rating', '-review_count', 'employee'], name='leaderboard_rank_idx'), models.Index(fields=['department', '-average_rating', '-review_count', 'employee'], name='leaderboard_department_idx')],
+            },
+        ),
+        migrations.RunPython(build_leaderboard, migrations.RunPython.noop),
+    ]
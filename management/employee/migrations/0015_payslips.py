@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0014_payroll_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Payslip',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('base_pay', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('overtime_hours', models.FloatField(default=0)),
+                ('overtime_pay', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('leave_days', models.IntegerField(default=0)),
+                ('leave_deduction', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('gross_pay', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payslips', to='employee.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['employee', '-month'], name='payslip_employee_idx')],
+                'constraints': [models.UniqueConstraint(fields=('month', 'employee'), name='unique_payslip_per_month')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Max, Sum
+
+
+# employee.versions.SLOTS when this migration was written.
+SLOTS = 16
+
+
+def copy_versions(apps, schema_editor):
+    # Carry each table's version over as slot 0, so versions keep counting up
+    # and no ETag issued before the migration can match again. The other
+    # slots start at 0 and exist up front, so a write is a single UPDATE.
+    OldTableVersion = apps.get_model('employee', 'OldTableVersion')
+    TableVersion = apps.get_model('employee', 'TableVersion')
+    db = schema_editor.connection.alias
+    TableVersion.objects.using(db).bulk_create(
+        TableVersion(table=row.table, slot=slot, version=row.version if slot == 0 else 0, updated_at=row.updated_at)
+        for row in OldTableVersion.objects.using(db).all()
+        for slot in range(SLOTS)
+    )
+
+
+def merge_versions(apps, schema_editor):
+    OldTableVersion = apps.get_model('employee', 'OldTableVersion')
+    TableVersion = apps.get_model('employee', 'TableVersion')
+    db = schema_editor.connection.alias
+    OldTableVersion.objects.using(db).bulk_create(
+        OldTableVersion(table=row['table'], version=row['total'], updated_at=row['latest'])
+        for row in TableVersion.objects.using(db).values('table').annotate(total=Sum('version'), latest=Max('updated_at')).order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0016_jobs'),
+    ]
+
+    operations = [
+        migrations.RenameModel('TableVersion', 'OldTableVersion'),
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=100)),
+                ('slot', models.PositiveSmallIntegerField(default=0)),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('table', 'slot'), name='tableversion_table_slot')],
+            },
+        ),
+        migrations.RunPython(copy_versions, merge_versions),
+        migrations.DeleteModel('OldTableVersion'),
+    ]
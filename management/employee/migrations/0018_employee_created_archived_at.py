@@ -0,0 +1,29 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0017_table_version_slots'),
+    ]
+
+    operations = [
+        # Added without a default first, so existing employees get NULL
+        # (created at some unknown point) rather than the migration's time.
+        migrations.AddField(
+            model_name='employee',
+            name='created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='created_at',
+            field=models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncMonth
+
+APPROVED_LEAVE_STATUSES = ('Leave', 'on leave')
+
+
+def count_approved_leave(apps, schema_editor):
+    Attendance = apps.get_model('employee', 'Attendance')
+    AttendanceRollup = apps.get_model('employee', 'AttendanceRollup')
+    db = schema_editor.connection.alias
+    approved = (
+        Attendance.objects.using(db)
+        .filter(employee=OuterRef('employee'), status__in=APPROVED_LEAVE_STATUSES)
+        .annotate(month=TruncMonth('date'))
+        .filter(month=OuterRef('month'))
+        .values('employee')
+        .annotate(days=Count('id'))
+        .values('days')
+    )
+    AttendanceRollup.objects.using(db).filter(days_leave__gt=0).update(days_leave_approved=Coalesce(Subquery(approved), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0018_employee_created_archived_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancerollup',
+            name='days_leave_approved',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_approved_leave, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:23
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0019_rollup_days_leave_approved'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attendance',
+            name='attendance_leave_idx',
+        ),
+    ]
@@ -1,9 +1,13 @@
 import uuid
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
 class CustomUser(AbstractUser):
     employee_id = models.CharField(max_length=20, unique=True)
+    # Tokens issued before this are rejected (see employee.authentication).
+    tokens_valid_after = models.DateTimeField(null=True, blank=True)
 
     # Avoid reverse accessor clashes by setting related_name
     groups = models.ManyToManyField(
@@ -36,7 +40,26 @@ class Employee(models.Model):
     salary = models.DecimalField(max_digits=20, decimal_places=2, null=True, blank=True, default=20000.00)
     active = models.BooleanField(default=True)
     archived = models.BooleanField(default=False)
-    
+    # Who was on the books at a past date (employee.salaries). NULL
+    # created_at is an employee from before it was recorded.
+    created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # One per list filter / ordering; the list only shows unarchived rows.
+        indexes = [
+            models.Index(fields=['name', 'id'], name='employee_name_idx', condition=models.Q(archived=False)),
+            models.Index(fields=['department', 'id'], name='employee_department_idx', condition=models.Q(archived=False)),
+            models.Index(fields=['position', 'id'], name='employee_position_idx', condition=models.Q(archived=False)),
+            models.Index(fields=['salary', 'id'], name='employee_salary_idx', condition=models.Q(archived=False)),
+            # Department analytics ranks salaries within each department.
+            models.Index(fields=['department', 'salary'], name='employee_dept_salary_idx', condition=models.Q(archived=False)),
+            # Boolean filters compile to a bare `NOT active` / `archived`,
+            # which only a partial index with the same condition can serve.
+            models.Index(fields=['id'], name='employee_inactive_idx', condition=models.Q(archived=False, active=False)),
+            models.Index(fields=['id'], name='employee_archived_idx', condition=models.Q(archived=True)),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.position} - {self.department})"
 
@@ -46,18 +69,40 @@ class SalaryHistory(models.Model):
     new_salary = models.DecimalField(max_digits=20, decimal_places=2)
     changed_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-changed_at', '-id'], name='salaryhistory_changed_id_idx'),
+            models.Index(fields=['employee', '-changed_at', '-id'], name='salaryhistory_employee_idx'),
+        ]
+
     def __str__(self):
         return f"{self.employee.name} - Salary Change: {self.previous_salary} → {self.new_salary}"
 
+RATINGS = range(1, 11)
+
 class PerformanceReview(models.Model):
     employee = models.ForeignKey('Employee', on_delete=models.CASCADE, related_name='reviews')
     review = models.TextField()
     rating = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='review_created_id_idx'),
+            models.Index(fields=['employee', '-created_at', '-id'], name='review_employee_idx'),
+            models.Index(fields=['rating', 'id'], name='review_rating_idx'),
+            # Covers the per-department rating distribution, windowed or not.
+            models.Index(fields=['employee', 'rating', 'created_at'], name='review_employee_rating_idx'),
+        ]
+
     def __str__(self):
         return f"{self.employee.name} - Review ({self.rating}/10)"
 
+LEAVE_STATUSES = ('Leave', 'leave', 'on leave')
+# 'leave' is a request still waiting for approve_leave.
+APPROVED_LEAVE_STATUSES = ('Leave', 'on leave')
+PRESENT_STATUSES = ('Present', 'Late')
+
 class Attendance(models.Model):
     STATUS_CHOICES = [
         ('Present', 'Present'),
@@ -73,5 +118,144 @@ class Attendance(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="Present")
     overtime_hours = models.FloatField(default=0)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'date'], name='unique_attendance_per_day'),
+        ]
+        indexes = [
+            models.Index(fields=['-date', '-id'], name='attendance_date_id_idx'),
+            models.Index(fields=['employee', 'status'], name='attendance_employee_status_idx'),
+            models.Index(fields=['status', '-date', '-id'], name='attendance_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.name} - {self.date}"
+
+class AttendanceRollup(models.Model):
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='attendance_rollups')
+    month = models.DateField()
+    overtime_hours = models.FloatField(default=0)
+    days_present = models.IntegerField(default=0)
+    days_leave = models.IntegerField(default=0)
+    days_leave_approved = models.IntegerField(default=0)
+    records = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'month'], name='unique_rollup_per_month'),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'employee'], name='rollup_month_employee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.name} - {self.month:%Y-%m}"
+
+class PayrollSnapshot(models.Model):
+    """Salaries in effect at the end of a month, totalled per department."""
+    month = models.DateField()
+    department = models.CharField(max_length=100)
+    headcount = models.IntegerField(default=0)
+    total_salary = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['month', 'department'], name='unique_payroll_snapshot'),
+        ]
+
+    def __str__(self):
+        return f"{self.department} - {self.month:%Y-%m}"
+
+class Payslip(models.Model):
+    """One employee's pay for one month, written by employee.payroll."""
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='payslips')
+    month = models.DateField()
+    base_pay = models.DecimalField(max_digits=20, decimal_places=2)
+    overtime_hours = models.FloatField(default=0)
+    overtime_pay = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    leave_days = models.IntegerField(default=0)
+    leave_deduction = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    gross_pay = models.DecimalField(max_digits=20, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['month', 'employee'], name='unique_payslip_per_month'),
+        ]
+        indexes = [
+            models.Index(fields=['employee', '-month'], name='payslip_employee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.name} - {self.month:%Y-%m}"
+
+class LeaderboardEntry(models.Model):
+    """One row per reviewed employee, kept current by employee.leaderboard."""
+    employee = models.OneToOneField(Employee, on_delete=models.CASCADE, primary_key=True, related_name='leaderboard_entry')
+    # Copied from the employee so per-department top-K reads one index range.
+    department = models.CharField(max_length=100)
+    review_count = models.IntegerField(default=0)
+    rating_total = models.IntegerField(default=0)
+    average_rating = models.FloatField(default=0)
+    latest_rating = models.IntegerField()
+    latest_review_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-average_rating', '-review_count', 'employee'], name='leaderboard_rank_idx'),
+            models.Index(fields=['department', '-average_rating', '-review_count', 'employee'], name='leaderboard_department_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.name} - {self.average_rating:.2f} over {self.review_count} reviews"
+
+class Job(models.Model):
+    """A piece of background work, queued and run by employee.jobs."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    # Units of work (usually rows) in all chunks, and in the finished ones.
+    total = models.IntegerField(default=0)
+    done = models.IntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='job_status_idx'),
+            models.Index(fields=['requested_by', '-id'], name='job_requested_by_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+class TableVersion(models.Model):
+    """
+    A table's write counter, striped over several rows (`slot`) so that
+    concurrent writers rarely wait on the same row lock. The table's version
+    is the sum of its slots and its last change the latest `updated_at`.
+    """
+    table = models.CharField(max_length=100)
+    slot = models.PositiveSmallIntegerField(default=0)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['table', 'slot'], name='tableversion_table_slot'),
+        ]
+
     def __str__(self):
-        return f"{self.employee.name} - {self.date}"
\ No newline at end of file
+        return f"{self.table}[{self.slot}] v{self.version}"
@@ -0,0 +1,225 @@
+import base64
+import datetime
+import json
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from django.template import loader
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination. The cursor holds the whole ordering key of
+    the last row sent, e.g. (date, id), and the next page is
+    `WHERE date < d OR (date = d AND id < i) LIMIT n` against an index on
+    that key. Deep pages cost the same as the first one, rows that share a
+    date are never skipped or repeated, and rows inserted while a client is
+    paging don't shift the window.
+
+    The key always ends in `id`, so rows with equal values in the other
+    fields (a name, a department) still have a fixed place. NULLs sort as
+    the smallest value, whatever the database's default.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    ordering = ('id',)
+    invalid_cursor_message = 'Invalid cursor'
+    template = 'rest_framework/pagination/previous_and_next.html'
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size) if self.max_page_size else size
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """
+        The ordering from the view's ordering filter, else `ordering`, ended
+        by `id`: appended as the tiebreaker, or anything after it dropped.
+        """
+        ordering = None
+        for backend in getattr(view, 'filter_backends', ()):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        ordering = list(ordering or self.ordering)
+        for index, field in enumerate(ordering):
+            if field.lstrip('-') in ('id', 'pk'):
+                return ordering[:index + 1]
+        return [*ordering, '-id' if ordering[0].startswith('-') else 'id']
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        cursor = self.decode_cursor(request)
+        position, reverse = cursor if cursor else (None, False)
+        # Paging backwards reads the preceding rows in the opposite order.
+        keys = [(field.lstrip('-'), field.startswith('-') != reverse) for field in self.ordering]
+        nullable = {name for name, _ in keys if self._nullable(queryset, name)}
+
+        queryset = queryset.order_by(*[self._order_by(name, descending, name in nullable) for name, descending in keys])
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._after(keys, position, nullable))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        # An empty page past either end still links back to where it started.
+        self.first_position = self._position(self.page[0]) if self.page else position
+        self.last_position = self._position(self.page[-1]) if self.page else position
+        return self.page
+
+    @staticmethod
+    def _nullable(queryset, name):
+        try:
+            return queryset.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return False
+
+    @staticmethod
+    def _order_by(name, descending, nullable):
+        if not nullable:
+            return f'-{name}' if descending else name
+        return F(name).desc(nulls_last=True) if descending else F(name).asc(nulls_first=True)
+
+    @staticmethod
+    def _after(keys, position, nullable):
+        """
+        Rows after `position` in the `keys` order:
+        `k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...`, per-key direction.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, descending), value in zip(keys, position):
+            if value is None:
+                after = Q(pk__in=[]) if descending else Q(**{f'{name}__isnull': False})
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if descending and name in nullable:
+                    after |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            condition |= equal & after
+            equal &= same
+        return condition
+
+    def _position(self, row):
+        fields = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[field] for field in fields]
+        return [getattr(row, 'pk' if field == 'pk' else field) for field in fields]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = {'p': [_encode_value(value) for value in position]}
+        if reverse:
+            cursor['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_position is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_html_context(self):
+        return {'previous_url': self.get_previous_link(), 'next_url': self.get_next_link()}
+
+    def to_html(self):
+        return loader.get_template(self.template).render(self.get_html_context())
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': self.cursor_query_param, 'required': False, 'in': 'query', 'schema': {'type': 'string'}},
+            {'name': self.page_size_query_param, 'required': False, 'in': 'query', 'schema': {'type': 'integer'}},
+        ]
+
+
+class EmployeePagination(KeysetPagination):
+    ordering = ('id',)
+
+
+class SalaryHistoryPagination(KeysetPagination):
+    ordering = ('-changed_at', '-id')
+
+
+class PerformanceReviewPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class AttendancePagination(KeysetPagination):
+    ordering = ('-date', '-id')
+
+
+class JobPagination(KeysetPagination):
+    ordering = ('-id',)
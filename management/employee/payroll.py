@@ -0,0 +1,153 @@
+"""
+Monthly payroll for the whole workforce.
+
+A period is loaded as columns:
+- employee ids and salaries in effect at the month end (employee.salaries)
+- overtime hours and approved leave days from the month's AttendanceRollup rows
+
+Pay is computed with array arithmetic over every employee at once, and
+the payslips are written with bulk_create. Without numpy the same formulas
+run as a Python loop. Money is held in whole centavos and rounded half up,
+as on a payslip, rather than to even.
+"""
+import math
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import AttendanceRollup, Payslip
+from .salaries import month_end, salaries_as_of
+
+try:
+    import numpy
+except ImportError:  # Optional: payroll falls back to a Python loop.
+    numpy = None
+
+DEFAULTS = {
+    'WORKING_DAYS': 22,
+    'HOURS_PER_DAY': 8,
+    'OVERTIME_MULTIPLIER': 1.25,
+    'PAID_LEAVE_DAYS': 1,
+}
+
+COLUMNS = ('employee_id', 'base_pay', 'overtime_hours', 'overtime_pay', 'leave_days', 'leave_deduction', 'gross_pay')
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'PAYROLL', {})}
+
+
+def load_period(month):
+    """
+    (employee ids, salaries in centavos, overtime hours, approved leave days)
+    for the month, one entry per employee on the books at its end with a
+    salary then, in id order.
+    """
+    employees = (
+        salaries_as_of(month_end(month))
+        .filter(salary_as_of__isnull=False)
+        .order_by('id')
+        .values_list('id', 'salary_as_of')
+    )
+    rollups = (
+        AttendanceRollup.objects.filter(month=month).order_by('employee_id')
+        .values_list('employee_id', 'overtime_hours', 'days_leave_approved')
+    )
+
+    if numpy is None:
+        ids, salaries = [], []
+        for employee_id, salary in employees:
+            ids.append(employee_id)
+            salaries.append(int(salary * 100))
+        attendance = {employee_id: (overtime, leave) for employee_id, overtime, leave in rollups}
+        overtime = [attendance.get(employee_id, (0, 0))[0] or 0 for employee_id in ids]
+        leave = [attendance.get(employee_id, (0, 0))[1] for employee_id in ids]
+        return ids, salaries, overtime, leave
+
+    employee_rows = numpy.array([(employee_id, int(salary * 100)) for employee_id, salary in employees], dtype=numpy.int64).reshape(-1, 2)
+    ids = employee_rows[:, 0]
+    salaries = employee_rows[:, 1]
+    rollup_rows = numpy.array(list(rollups), dtype=float).reshape(-1, 3)
+    rollup_ids = rollup_rows[:, 0].astype(numpy.int64)
+
+    # Both sides are sorted by employee id, so each rollup finds its
+    # employee with a binary search; rollups of skipped employees drop out.
+    positions = numpy.searchsorted(ids, rollup_ids)
+    found = positions < len(ids)
+    found[found] = ids[positions[found]] == rollup_ids[found]
+    overtime = numpy.zeros(len(ids))
+    leave = numpy.zeros(len(ids), dtype=numpy.int64)
+    overtime[positions[found]] = numpy.nan_to_num(rollup_rows[found, 1])
+    leave[positions[found]] = rollup_rows[found, 2]
+    return ids, salaries, overtime, leave
+
+
+def compute_pay(ids, salaries, overtime, leave):
+    """Payslip columns (see COLUMNS) for the loaded period, money in whole centavos."""
+    config = _config()
+    if numpy is None:
+        rows = []
+        for employee_id, salary, hours, days in zip(ids, salaries, overtime, leave):
+            daily = salary / config['WORKING_DAYS']
+            overtime_pay = _half_up(hours * daily / config['HOURS_PER_DAY'] * config['OVERTIME_MULTIPLIER'])
+            deduction = min(_half_up(max(days - config['PAID_LEAVE_DAYS'], 0) * daily), salary)
+            rows.append((employee_id, salary, hours, overtime_pay, days, deduction, salary + overtime_pay - deduction))
+        return [list(column) for column in zip(*rows)] if rows else [[] for _ in COLUMNS]
+
+    daily = salaries / config['WORKING_DAYS']
+    overtime_pay = _half_up_array(overtime * daily / config['HOURS_PER_DAY'] * config['OVERTIME_MULTIPLIER'])
+    unpaid_days = numpy.maximum(leave - config['PAID_LEAVE_DAYS'], 0)
+    deduction = numpy.minimum(_half_up_array(unpaid_days * daily), salaries)
+    gross = salaries + overtime_pay - deduction
+    return [column.tolist() for column in (ids, salaries, overtime, overtime_pay, leave, deduction, gross)]
+
+
+# Amounts are rounded to a millionth of a centavo before rounding half up,
+# so float error can't turn an exact half into 0.4999... and round it down.
+def _half_up(centavos):
+    return math.floor(round(centavos, 6) + 0.5)
+
+
+def _half_up_array(centavos):
+    return numpy.floor(numpy.round(centavos, 6) + 0.5).astype(numpy.int64)
+
+
+def _cents(centavos):
+    return Decimal(int(centavos)) / 100
+
+
+def write_payslips(month, columns, batch_size=5000):
+    """Replace the month's payslips with `columns`. Returns the number written."""
+    with transaction.atomic():
+        Payslip.objects.filter(month=month).delete()
+        Payslip.objects.bulk_create(
+            (
+                Payslip(
+                    employee_id=employee_id,
+                    month=month,
+                    base_pay=_cents(base),
+                    overtime_hours=hours,
+                    overtime_pay=_cents(overtime_pay),
+                    leave_days=days,
+                    leave_deduction=_cents(deduction),
+                    gross_pay=_cents(gross),
+                )
+                for employee_id, base, hours, overtime_pay, days, deduction, gross in zip(*columns)
+            ),
+            batch_size=batch_size,
+        )
+    return len(columns[0])
+
+
+def run_payroll(month):
+    """Compute and store the month's payslips. Returns a summary of the run."""
+    columns = compute_pay(*load_period(month))
+    count = write_payslips(month, columns)
+    return {
+        "month": f"{month:%Y-%m}",
+        "payslips": count,
+        "gross_total": _cents(sum(columns[6])),
+        "overtime_total": _cents(sum(columns[3])),
+        "leave_deductions": _cents(sum(columns[5])),
+    }
@@ -0,0 +1,90 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def plan_queryset(queryset, serializer, extra_columns=()):
+    """
+    Derive select_related / prefetch_related / only() for `queryset` from the
+    fields `serializer` is going to read, so that a dotted source such as
+    `employee.name` costs a join instead of one query per row.
+    `extra_columns` are loaded as well (e.g. the pagination ordering).
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    model = queryset.model
+    select_related, prefetch_related, columns = set(), set(), set(extra_columns)
+    narrow = True
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        if field.source == '*':
+            # SerializerMethodFields read whatever they like; by convention
+            # `get_<name>` formats the model field called <name>.
+            try:
+                model._meta.get_field(field.field_name)
+                columns.add(field.field_name)
+            except FieldDoesNotExist:
+                narrow = False
+            continue
+
+        path = field.source.split('.')
+        current, lookups = model, []
+        for position, attr in enumerate(path):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # Properties and methods may touch anything.
+                narrow = False
+                break
+
+            lookups.append(attr)
+            lookup = '__'.join(lookups)
+            is_last = position == len(path) - 1
+
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch_related.add(lookup)
+                narrow = False
+                break
+
+            if model_field.is_relation and (not is_last or isinstance(field, serializers.BaseSerializer)):
+                select_related.add(lookup)
+                columns.add(lookup)
+                current = model_field.related_model
+                if is_last:
+                    narrow = False
+                continue
+
+            columns.add(lookup)
+            break
+
+    if select_related:
+        queryset = queryset.select_related(*sorted(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*sorted(prefetch_related))
+    if narrow and columns:
+        queryset = queryset.only(*sorted(columns))
+    return queryset
+
+
+class PlannedQuerysetMixin:
+    """
+    Viewset mixin that plans every queryset DRF filters (list, retrieve and
+    the write actions that go through get_object) against the serializer.
+    Custom actions that build their own querysets call `plan_queryset`.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ordering = ()
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            # Cursor pagination reads its position from each row.
+            ordering = [field.lstrip('-') for field in self.paginator.get_ordering(self.request, queryset, self)]
+        return self.plan_queryset(queryset, extra_columns=ordering)
+
+    def plan_queryset(self, queryset, serializer=None, extra_columns=()):
+        return plan_queryset(queryset, serializer or self.get_serializer(), extra_columns)
@@ -0,0 +1,121 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .cache import models_changed
+from .models import Attendance, AttendanceRollup, APPROVED_LEAVE_STATUSES, LEAVE_STATUSES, PRESENT_STATUSES
+
+ROLLUP_FIELDS = ['overtime_hours', 'days_present', 'days_leave', 'days_leave_approved', 'records']
+
+
+def month_start(date):
+    if isinstance(date, str):
+        date = datetime.date.fromisoformat(date)
+    return date.replace(day=1)
+
+
+def next_month(month):
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def monthly_totals(queryset):
+    """Group an Attendance queryset into one row per (employee, month)."""
+    return (
+        queryset.annotate(month=TruncMonth('date'))
+        .values('employee_id', 'month')
+        .annotate(
+            overtime_hours=Sum('overtime_hours'),
+            days_present=Count('id', filter=Q(status__in=PRESENT_STATUSES)),
+            days_leave=Count('id', filter=Q(status__in=LEAVE_STATUSES)),
+            days_leave_approved=Count('id', filter=Q(status__in=APPROVED_LEAVE_STATUSES)),
+            records=Count('id'),
+        )
+        .order_by()
+    )
+
+
+def _rollup(row):
+    return AttendanceRollup(
+        employee_id=row['employee_id'],
+        month=row['month'],
+        overtime_hours=row['overtime_hours'] or 0,
+        days_present=row['days_present'],
+        days_leave=row['days_leave'],
+        days_leave_approved=row['days_leave_approved'],
+        records=row['records'],
+    )
+
+
+def refresh_attendance_rollups(keys):
+    """
+    Recompute the rollups for the (employee_id, date) pairs that just changed.
+    Only the touched months are re-aggregated, so the cost is bounded by a
+    month of attendance per key rather than an employee's whole history.
+
+    Call it in the transaction that wrote the attendance. The touched rollup
+    rows are locked (created first if missing) before the month is read, so
+    two transactions refreshing the same month take turns, and the second
+    one's aggregate includes the first one's committed rows instead of both
+    writing totals that each miss the other's change.
+    """
+    months = {(employee_id, month_start(date)) for employee_id, date in keys if date}
+    if not months:
+        return
+
+    employee_ids = {employee_id for employee_id, _ in months}
+    first = min(month for _, month in months)
+    last = next_month(max(month for _, month in months))
+
+    with transaction.atomic():
+        # Sorted, so concurrent refreshes lock rows in the same order.
+        AttendanceRollup.objects.bulk_create(
+            [AttendanceRollup(employee_id=employee_id, month=month) for employee_id, month in sorted(months)],
+            ignore_conflicts=True,
+        )
+        # One condition per key would nest an OR per key, past SQLite's
+        # expression depth limit of 1000 for a big batch. This locks the
+        # employees' other months in the range too.
+        locked = {
+            (employee_id, month): pk for pk, employee_id, month in
+            AttendanceRollup.objects.select_for_update()
+            .filter(employee_id__in=employee_ids, month__gte=first, month__lt=last)
+            .order_by('employee_id', 'month').values_list('id', 'employee_id', 'month')
+        }
+
+        rows = monthly_totals(
+            Attendance.objects.filter(employee_id__in=employee_ids, date__gte=first, date__lt=last)
+        )
+        rollups = [_rollup(row) for row in rows if (row['employee_id'], row['month']) in months]
+        emptied = months - {(rollup.employee_id, rollup.month) for rollup in rollups}
+
+        AttendanceRollup.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=['employee', 'month'],
+            update_fields=ROLLUP_FIELDS,
+        )
+        if emptied:
+            AttendanceRollup.objects.filter(id__in=[locked[key] for key in emptied]).delete()
+
+
+def rebuild_attendance_rollups(batch_size=5000):
+    """
+    Throw every rollup away and rebuild them from Attendance, then drop the
+    responses built from the old ones. Returns the row count.
+    """
+    count = 0
+    with transaction.atomic():
+        AttendanceRollup.objects.all().delete()
+        batch = []
+        for row in monthly_totals(Attendance.objects.all()).iterator(chunk_size=batch_size):
+            batch.append(_rollup(row))
+            if len(batch) >= batch_size:
+                AttendanceRollup.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        AttendanceRollup.objects.bulk_create(batch)
+        count += len(batch)
+        models_changed(AttendanceRollup)
+    return count
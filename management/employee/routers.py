@@ -0,0 +1,96 @@
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+_pinned = ContextVar('pinned_to_primary', default=False)
+
+PIN_COOKIE = 'pin_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def pin_to_primary():
+    """Send the rest of this request's reads to the primary."""
+    _pinned.set(True)
+
+
+def pinned_to_primary():
+    return _pinned.get()
+
+
+class PrimaryReplicaRouter:
+    """
+    Routes the employee app's reads to settings.DATABASE_REPLICAS and its
+    writes to the primary ('default'). Reads stay on the primary inside a
+    transaction and once the request is pinned by ReadYourWritesMiddleware.
+    """
+    app_label = 'employee'
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != self.app_label:
+            return None
+        replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+        if not replicas or _pinned.get() or connections['default'].in_atomic_block:
+            return 'default'
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label != self.app_label:
+            return None
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *getattr(settings, 'DATABASE_REPLICAS', [])}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins reads to the primary for unsafe requests, and for
+    settings.REPLICA_PIN_SECONDS after a client's last write (tracked in a
+    cookie) so it never reads a replica that hasn't caught up with it yet.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self._start(request)
+        try:
+            return self._finish(request, self.get_response(request))
+        finally:
+            _pinned.reset(token)
+
+    async def __acall__(self, request):
+        token = self._start(request)
+        try:
+            return self._finish(request, await self.get_response(request))
+        finally:
+            _pinned.reset(token)
+
+    def _start(self, request):
+        token = _pinned.set(False)
+        try:
+            pinned_until = float(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+        if request.method not in SAFE_METHODS or pinned_until > time.time():
+            pin_to_primary()
+        return token
+
+    def _finish(self, request, response):
+        if request.method not in SAFE_METHODS:
+            seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+            response.set_cookie(PIN_COOKIE, str(time.time() + seconds), max_age=seconds, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,128 @@
+"""
+Point-in-time salaries, read from SalaryHistory.
+
+An employee's salary just before `until` is the new_salary of their last
+change before it. If every change comes later, it is the previous_salary of
+the first one. Employees who were never changed keep Employee.salary. Each
+lookup is one seek on salaryhistory_employee_idx (employee, -changed_at, -id).
+
+The employees counted at a moment are the ones added before it and not yet
+archived then, from Employee.created_at and archived_at.
+"""
+import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .cache import models_changed
+from .models import Employee, PayrollSnapshot, SalaryHistory
+from .rollups import next_month
+
+# Bounds the months one payroll request may compute.
+MAX_PAYROLL_MONTHS = 120
+
+
+def employed_at(until):
+    """
+    Employees on the books just before `until`. Those archived before
+    archived_at was recorded count as archived all along.
+    """
+    return Employee.objects.filter(
+        Q(created_at__isnull=True) | Q(created_at__lt=until),
+        Q(archived=False) | Q(archived_at__gte=until),
+    )
+
+
+def salaries_as_of(until, employees=None):
+    """Annotate `employees` (default: employed_at(until)) with `salary_as_of`, the salary in effect just before `until`."""
+    if employees is None:
+        employees = employed_at(until)
+    history = SalaryHistory.objects.filter(employee=OuterRef('pk'))
+    before = history.filter(changed_at__lt=until).order_by('-changed_at', '-id').values('new_salary')[:1]
+    after = history.filter(changed_at__gte=until).order_by('changed_at', 'id').values('previous_salary')[:1]
+    return employees.annotate(
+        salary_as_of=Coalesce(Subquery(before), Subquery(after), F('salary'), output_field=DecimalField(max_digits=20, decimal_places=2))
+    )
+
+
+def month_end(month):
+    """Midnight at the start of the following month, as an exclusive bound."""
+    return timezone.make_aware(datetime.datetime.combine(next_month(month), datetime.time.min))
+
+
+def _department_totals(month):
+    rows = (
+        salaries_as_of(month_end(month))
+        .values('department')
+        .annotate(headcount=Count('id'), total_salary=Sum('salary_as_of'))
+        .order_by('department')
+    )
+    return [
+        PayrollSnapshot(month=month, department=row['department'], headcount=row['headcount'], total_salary=row['total_salary'] or 0)
+        for row in rows
+    ]
+
+
+def snapshot_payroll(month, replace=False):
+    """
+    Store the department totals for a finished month. Existing snapshots
+    are kept unless `replace`. Returns the snapshots for the month.
+    """
+    if month_end(month) > timezone.now():
+        raise ValueError(f'{month:%Y-%m} has not finished yet.')
+    with transaction.atomic():
+        existing = PayrollSnapshot.objects.filter(month=month)
+        if existing.exists() and not replace:
+            return list(existing.order_by('department'))
+        existing.delete()
+        snapshots = _department_totals(month)
+        try:
+            with transaction.atomic():
+                snapshots = PayrollSnapshot.objects.bulk_create(snapshots)
+                # Bulk writes skip post_save, so the change is recorded here.
+                models_changed(PayrollSnapshot)
+                return snapshots
+        except IntegrityError:
+            # A concurrent run stored the month first. The month is over,
+            # so its totals are the ones we'd have written.
+            return list(PayrollSnapshot.objects.filter(month=month).order_by('department'))
+
+
+def payroll_totals(start, end):
+    """
+    Per-month payroll between two months, inclusive. Months with a
+    PayrollSnapshot are read from it; the rest, the running month included,
+    are computed live. Nothing is stored: `manage.py snapshot_payroll`
+    writes the snapshots.
+    """
+    if (end.year - start.year) * 12 + end.month - start.month >= MAX_PAYROLL_MONTHS:
+        raise ValueError(f'Ask for at most {MAX_PAYROLL_MONTHS} months at a time.')
+    months = [start]
+    while next_month(months[-1]) <= end:
+        months.append(next_month(months[-1]))
+
+    snapshots = {}
+    for snapshot in PayrollSnapshot.objects.filter(month__gte=start, month__lte=end).order_by('month', 'department'):
+        snapshots.setdefault(snapshot.month, []).append(snapshot)
+
+    today = timezone.localdate()
+    totals = []
+    for month in months:
+        if month in snapshots:
+            departments = snapshots[month]
+        elif month <= today:
+            departments = _department_totals(month)
+        else:
+            continue
+        totals.append({
+            "month": f"{month:%Y-%m}",
+            "headcount": sum(department.headcount for department in departments),
+            "total_salary": f"₱{sum(department.total_salary for department in departments):,.2f}",
+            "departments": {
+                department.department: {"headcount": department.headcount, "total_salary": f"₱{department.total_salary:,.2f}"}
+                for department in departments
+            },
+        })
+    return totals
@@ -0,0 +1,318 @@
+"""
+Employee search over name, department and position.
+
+Three modes:
+- prefix: every query word starts a word in the employee
+- fulltext: every query word appears as a word
+- fuzzy: words may be misspelt
+
+The backend follows the database:
+- SQLite uses the FTS5 table from migration 0010.
+- PostgreSQL uses the tsvector and trigram GIN indexes from the same
+  migration.
+- Anything else uses an in-process term index.
+
+Each backend returns at most `limit` ids. PostgreSQL orders them by rank;
+the other backends use employee id order.
+"""
+import bisect
+import difflib
+import heapq
+import re
+import threading
+import unicodedata
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+from .models import Employee
+from .versions import table_versions
+
+MODES = ('prefix', 'fulltext', 'fuzzy')
+
+# PostgreSQL ranks the first RANK_WINDOW matches, so a query that matches
+# most of the table (a department name, a one-letter prefix) costs the same
+# as a selective one.
+RANK_WINDOW = 1000
+
+PREFIX_EXPANSIONS = 50
+
+FUZZY_CUTOFF = 0.75
+FUZZY_EXPANSIONS = 5
+
+# Must match the expression indexed by migration 0010 on PostgreSQL.
+POSTGRES_DOCUMENT = "(name || ' ' || department || ' ' || position)"
+
+
+def tokenize(text):
+    """Lower-cased words without diacritics, as FTS5's unicode61 tokenizer splits them."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'\w+', text)
+
+
+def _fuzzy_terms(term, vocabulary):
+    return [term] + [match for match in difflib.get_close_matches(term, vocabulary, FUZZY_EXPANSIONS, FUZZY_CUTOFF) if match != term]
+
+
+class SQLiteSearch:
+    """
+    FTS5 index, written in the same transaction as the employee rows, plus a
+    plain table of every indexed word.
+
+    Queries are rewritten into ANDs of exact words before they reach FTS5:
+    - a prefix becomes an OR of the words it covers, read from the word table
+    - a fuzzy word becomes an OR of its close matches
+    FTS5 can skip through exact-word doclists, but a long prefix or bm25
+    ranking makes it read every match of a common word. Results are
+    therefore in employee id order.
+    """
+
+    def search(self, query, mode, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        groups = []
+        for term in terms:
+            if mode == 'prefix':
+                group = self._expand_prefix(term)
+            elif mode == 'fuzzy' and not term.isdigit():
+                group = _fuzzy_terms(term, self._similar_length(term))
+            else:
+                group = [f'"{term}"']
+            if not group:
+                return []
+            groups.append('(' + ' OR '.join(group) + ')')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT rowid FROM employee_search WHERE employee_search MATCH %s ORDER BY rowid LIMIT %s',
+                [' AND '.join(groups), limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _expand_prefix(self, term):
+        # Short prefixes with many words are left to FTS5's prefix index.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT term FROM employee_search_terms WHERE term >= %s AND term < %s LIMIT %s',
+                [term, term + '\U0010ffff', PREFIX_EXPANSIONS + 1],
+            )
+            words = [row[0] for row in cursor.fetchall()]
+        if len(words) > PREFIX_EXPANSIONS:
+            return [f'"{term}"*']
+        return [f'"{word}"' for word in words]
+
+    def _similar_length(self, term):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT term FROM employee_search_terms WHERE term >= %s AND term < %s AND length(term) BETWEEN %s AND %s',
+                [term[0], chr(ord(term[0]) + 1), len(term) - 2, len(term) + 2],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def index(self, employees):
+        rows = [(employee.pk, employee.name, employee.department, employee.position) for employee in employees]
+        words = {word for row in rows for field in row[1:] for word in tokenize(field)}
+        with connection.cursor() as cursor:
+            cursor.executemany('DELETE FROM employee_search WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                'INSERT INTO employee_search (rowid, name, department, position) VALUES (%s, %s, %s, %s)', rows
+            )
+            cursor.executemany('INSERT OR IGNORE INTO employee_search_terms (term) VALUES (%s)', [(word,) for word in words])
+
+    def remove(self, ids):
+        # Words of removed employees stay in employee_search_terms until the
+        # next rebuild; they only widen a prefix by words that match nothing.
+        with connection.cursor() as cursor:
+            cursor.executemany('DELETE FROM employee_search WHERE rowid = %s', [(pk,) for pk in ids])
+
+    def rebuild(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('DELETE FROM employee_search')
+            cursor.execute(
+                'INSERT INTO employee_search (rowid, name, department, position) '
+                'SELECT id, name, department, position FROM employee_employee WHERE NOT archived'
+            )
+            count = cursor.rowcount
+            cursor.execute("INSERT INTO employee_search (employee_search) VALUES ('optimize')")
+            cursor.execute('DELETE FROM employee_search_terms')
+            cursor.execute('INSERT INTO employee_search_terms (term) SELECT term FROM employee_search_vocab')
+        return count
+
+
+class PostgresSearch:
+    """tsvector and pg_trgm GIN indexes on employee_employee; PostgreSQL maintains them."""
+
+    def search(self, query, mode, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        document = POSTGRES_DOCUMENT
+        if mode == 'fuzzy':
+            sql = (
+                f'SELECT id FROM (SELECT id, word_similarity(%s, {document}) AS score FROM employee_employee '
+                f'WHERE NOT archived AND %s <%% {document} LIMIT %s) hits ORDER BY score DESC, id LIMIT %s'
+            )
+            params = [query, query, RANK_WINDOW, limit]
+        else:
+            tsquery = ' & '.join(f'{term}:*' if mode == 'prefix' else term for term in terms)
+            sql = (
+                f"SELECT id FROM (SELECT id, ts_rank(to_tsvector('simple', {document}), to_tsquery('simple', %s)) AS score "
+                f"FROM employee_employee WHERE NOT archived AND to_tsvector('simple', {document}) @@ to_tsquery('simple', %s) "
+                f'LIMIT %s) hits ORDER BY score DESC, id LIMIT %s'
+            )
+            params = [tsquery, tsquery, RANK_WINDOW, limit]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def index(self, employees):
+        pass
+
+    def remove(self, ids):
+        pass
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute('REINDEX INDEX employee_search_tsv')
+            cursor.execute('REINDEX INDEX employee_search_trgm')
+        return Employee.objects.filter(archived=False).count()
+
+
+class InProcessSearch:
+    """
+    Term index held in memory: postings per word plus a sorted word list, so
+    a prefix is a bisect range (what a trie would give) and fuzzy candidates
+    come from the same range. Signals keep it current for writes made by this
+    process; writes from other processes bump the employee table version,
+    and the next search rebuilds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = {}
+        self._postings = {}
+        self._terms = []
+        self._version = None
+
+    def search(self, query, mode, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        self._refresh()
+        with self._lock:
+            postings = []
+            for term in terms:
+                if mode == 'prefix':
+                    candidates = self._range(term, term + '\uffff')
+                elif mode == 'fuzzy' and not term.isdigit():
+                    candidates = _fuzzy_terms(term, self._range(term[0], chr(ord(term[0]) + 1)))
+                else:
+                    candidates = [term]
+                sets = [self._postings[candidate] for candidate in candidates if candidate in self._postings]
+                if not sets:
+                    return []
+                postings.append(sets[0] if len(sets) == 1 else set().union(*sets))
+            postings.sort(key=len)
+            matches = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+            return heapq.nsmallest(limit, matches)
+
+    def _range(self, low, high):
+        return self._terms[bisect.bisect_left(self._terms, low):bisect.bisect_left(self._terms, high)]
+
+    def _current_version(self):
+        return table_versions(Employee).get(Employee._meta.label_lower, (None,))[0]
+
+    def _refresh(self):
+        if self._current_version() != self._version:
+            self.rebuild()
+
+    def index(self, employees):
+        documents = {employee.pk: tokenize(f'{employee.name} {employee.department} {employee.position}') for employee in employees}
+        transaction.on_commit(lambda: self._apply(documents))
+
+    def remove(self, ids):
+        transaction.on_commit(lambda: self._apply(dict.fromkeys(ids)))
+
+    def _apply(self, documents):
+        if self._version is None:
+            # Never built: the first search builds it, writes included.
+            return
+        with self._lock:
+            for pk, terms in documents.items():
+                for term in self._documents.pop(pk, ()):
+                    self._postings[term].discard(pk)
+                if terms is not None:
+                    self._documents[pk] = terms
+                    for term in terms:
+                        if term not in self._postings:
+                            self._postings[term] = set()
+                            bisect.insort(self._terms, term)
+                        self._postings[term].add(pk)
+        self._version = self._current_version()
+
+    def rebuild(self):
+        version = self._current_version()
+        documents, postings = {}, {}
+        rows = Employee.objects.filter(archived=False).values_list('id', 'name', 'department', 'position')
+        for pk, name, department, position in rows.iterator(chunk_size=5000):
+            terms = tokenize(f'{name} {department} {position}')
+            documents[pk] = terms
+            for term in terms:
+                postings.setdefault(term, set()).add(pk)
+        with self._lock:
+            self._documents, self._postings, self._terms = documents, postings, sorted(postings)
+        self._version = version
+        return len(documents)
+
+
+_backend = None
+
+
+def _reset_backend(setting, **kwargs):
+    global _backend
+    if setting == 'EMPLOYEE_SEARCH_BACKEND':
+        _backend = None
+
+
+setting_changed.connect(_reset_backend)
+
+
+def _sqlite_search_table_exists():
+    return 'employee_search' in connection.introspection.table_names()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'EMPLOYEE_SEARCH_BACKEND', None)
+        if path:
+            _backend = import_string(path)()
+        elif connection.vendor == 'sqlite' and _sqlite_search_table_exists():
+            _backend = SQLiteSearch()
+        elif connection.vendor == 'postgresql':
+            _backend = PostgresSearch()
+        else:
+            _backend = InProcessSearch()
+    return _backend
+
+
+def search_employees(query, mode='prefix', limit=20):
+    return get_backend().search(query, mode, limit)
+
+
+def employee_saved(employee):
+    if employee.archived:
+        get_backend().remove([employee.pk])
+    else:
+        get_backend().index([employee])
+
+
+def employee_deleted(employee):
+    get_backend().remove([employee.pk])
+
+
+def rebuild_search_index():
+    return get_backend().rebuild()
@@ -0,0 +1,273 @@
+"""
+Realistic synthetic data for load and benchmark runs.
+
+Unlike benchmarking.seed, which fills every table evenly, this builds a
+workforce that looks like production data:
+- departments of uneven size, salaries banded by position
+- a few inactive and archived employees
+- a chronological salary history ending at Employee.salary
+- reviews whose ratings cluster around each employee's own level
+- weekday attendance with late arrivals, absences, leave and overtime
+
+Everything goes in through bulk_create in batches, so signals don't fire.
+The attendance rollups, the leaderboard and the search index are rebuilt
+at the end, and the response cache is invalidated. The same arguments
+always produce the same rows.
+"""
+import datetime
+import random
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import models_changed
+from .leaderboard import rebuild_leaderboard
+from .models import (
+    Employee, SalaryHistory, PerformanceReview, Attendance, AttendanceRollup,
+    LeaderboardEntry, Payslip, PayrollSnapshot,
+)
+from .rollups import rebuild_attendance_rollups
+from .search import rebuild_search_index
+
+FIRST_NAMES = [
+    'Maria', 'Jose', 'Ana', 'Juan', 'Carmen', 'Luis', 'Sofia', 'Miguel', 'Isabel', 'Carlos',
+    'Elena', 'Antonio', 'Grace', 'Mark', 'Joy', 'Paolo', 'Angela', 'Rafael', 'Patricia', 'Daniel',
+    'Andrea', 'Gabriel', 'Nicole', 'Francis', 'Camille', 'Adrian', 'Bea', 'Kevin', 'Lara', 'Ramon',
+]
+LAST_NAMES = [
+    'Santos', 'Reyes', 'Cruz', 'Bautista', 'Garcia', 'Mendoza', 'Torres', 'Flores', 'Ramos', 'Aquino',
+    'Castillo', 'Villanueva', 'Fernandez', 'Navarro', 'Dela Cruz', 'Gonzales', 'Rivera', 'Lopez',
+    'Morales', 'Domingo', 'Salazar', 'Pascual', 'Tolentino', 'Manalo', 'Soriano',
+]
+
+# Relative department sizes.
+DEPARTMENTS = {
+    'Engineering': 30,
+    'Sales': 20,
+    'Support': 18,
+    'Operations': 14,
+    'Finance': 8,
+    'Human Resources': 5,
+    'Legal': 3,
+    'Executive': 2,
+}
+
+# Position: (relative frequency, lowest salary, highest salary).
+POSITIONS = {
+    'Associate': (35, 20000, 35000),
+    'Analyst': (25, 30000, 55000),
+    'Specialist': (20, 45000, 75000),
+    'Lead': (10, 70000, 110000),
+    'Manager': (8, 95000, 150000),
+    'Director': (2, 140000, 250000),
+}
+
+REVIEW_TEXTS = {
+    range(1, 4): [
+        'Missed most goals for the period; needs a performance plan.',
+        'Frequent delays and quality issues.',
+    ],
+    range(4, 7): [
+        'Meets expectations.',
+        'Solid work; should take on more ownership.',
+        'Reliable on routine tasks, inconsistent on new ones.',
+    ],
+    range(7, 9): [
+        'Exceeds expectations on delivery.',
+        'Strong contributor and a good mentor.',
+    ],
+    range(9, 11): [
+        'Outstanding period; ready for promotion.',
+        'Consistently raises the bar for the team.',
+    ],
+}
+
+# Share of working days per attendance status; the rest are Present.
+LATE_RATE = 0.07
+ABSENT_RATE = 0.02
+LEAVE_RATE = 0.04
+
+
+@contextmanager
+def historical_timestamps(*fields):
+    """Let bulk_create keep the timestamps it is given for auto_now_add `fields`."""
+    saved = [(field, field.auto_now_add) for field in fields]
+    for field, _ in saved:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now_add in saved:
+            field.auto_now_add = auto_now_add
+
+
+def working_days(end, count):
+    """The `count` weekdays up to and including `end`, oldest first."""
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= datetime.timedelta(days=1)
+    return days[::-1]
+
+
+def _aware(day, hour=0, minute=0):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(hour, minute)))
+
+
+def _weighted(rng, table):
+    return rng.choices(list(table), weights=[value[0] if isinstance(value, tuple) else value for value in table.values()])[0]
+
+
+def _batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Profile:
+    """What the generator decided about one employee before writing anything."""
+    __slots__ = ('employee', 'salaries', 'level', 'punctuality')
+
+    def __init__(self, employee, salaries, level, punctuality):
+        self.employee = employee
+        # Starting salary followed by the salary after each change.
+        self.salaries = salaries
+        self.level = level
+        self.punctuality = punctuality
+
+
+def _profiles(rng, employees, salary_changes):
+    for _ in range(employees):
+        position = _weighted(rng, POSITIONS)
+        _, lowest, highest = POSITIONS[position]
+        salaries = [Decimal(rng.randrange(lowest, highest, 250))]
+        for _ in range(rng.randint(max(0, salary_changes - 1), salary_changes + 1) if salary_changes else 0):
+            raise_percent = Decimal(rng.choice([2, 3, 3, 4, 5, 5, 6, 8, 10, 15]))
+            salaries.append((salaries[-1] * (100 + raise_percent) / 100).quantize(Decimal('0.01')))
+        roll = rng.random()
+        employee = Employee(
+            name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            department=_weighted(rng, DEPARTMENTS),
+            position=position,
+            salary=salaries[-1],
+            active=roll >= 0.03,
+            archived=roll < 0.01,
+        )
+        yield Profile(employee, salaries, min(max(rng.gauss(6.5, 1.5), 1), 10), rng.betavariate(8, 1))
+
+
+def _salary_history(rng, profiles, days):
+    first, last = _aware(days[0]), _aware(days[-1], 18)
+    span = (last - first).total_seconds()
+    for profile in profiles:
+        changes = len(profile.salaries) - 1
+        moments = sorted(first + datetime.timedelta(seconds=rng.uniform(0, span)) for _ in range(changes))
+        for previous, new, changed_at in zip(profile.salaries, profile.salaries[1:], moments):
+            yield SalaryHistory(employee=profile.employee, previous_salary=previous, new_salary=new, changed_at=changed_at)
+
+
+def _reviews(rng, profiles, days, reviews):
+    first, last = _aware(days[0]), _aware(days[-1], 18)
+    span = (last - first).total_seconds()
+    for profile in profiles:
+        for n in range(reviews):
+            # Spread evenly over the period, e.g. one per quarter.
+            created_at = first + datetime.timedelta(seconds=span * (n + rng.uniform(0.2, 0.8)) / reviews)
+            rating = min(max(round(rng.gauss(profile.level, 1)), 1), 10)
+            text = next(texts for band, texts in REVIEW_TEXTS.items() if rating in band)
+            yield PerformanceReview(employee=profile.employee, review=rng.choice(text), rating=rating, created_at=created_at)
+
+
+def _attendance(rng, profiles, days):
+    for profile in profiles:
+        late_rate = LATE_RATE * (1.5 - profile.punctuality)
+        for day in days:
+            roll = rng.random()
+            if roll < LEAVE_RATE:
+                # Most leave has been approved by the time it's reported on.
+                status = 'on leave' if rng.random() < 0.8 else 'leave'
+                yield Attendance(employee=profile.employee, date=day, status=status, overtime_hours=0)
+                continue
+            if roll < LEAVE_RATE + ABSENT_RATE:
+                yield Attendance(employee=profile.employee, date=day, status='Absent', overtime_hours=0)
+                continue
+
+            late = roll < LEAVE_RATE + ABSENT_RATE + late_rate
+            arrival = 9 * 60 + (rng.randint(16, 90) if late else rng.randint(-45, 10))
+            # Most people leave after eight hours; some stay on.
+            worked = 8 * 60 + 60 + (rng.choice([0, 0, 0, 30, 60, 90, 120, 180]) if rng.random() < 0.3 else rng.randint(-20, 15))
+            departure = min(arrival + worked, 23 * 60 + 59)
+            yield Attendance(
+                employee=profile.employee,
+                date=day,
+                status='Late' if late else 'Present',
+                check_in_time=datetime.time(arrival // 60, arrival % 60),
+                check_out_time=datetime.time(departure // 60, departure % 60),
+                # Eight hours plus an hour's break, in quarter hours.
+                overtime_hours=max(0, round((departure - arrival - 9 * 60) / 15)) / 4,
+            )
+
+
+def clear_data():
+    """Delete every employee and everything hanging off them."""
+    # The search index's post_delete receiver rules out Django's fast delete
+    # of employees, which would load and signal every row; plain DELETEs don't.
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model in (Payslip, PayrollSnapshot, LeaderboardEntry, AttendanceRollup, Attendance, PerformanceReview, SalaryHistory, Employee):
+            cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+        models_changed(Employee, SalaryHistory, PerformanceReview, Attendance)
+    rebuild_search_index()
+
+
+def seed_data(employees, days=260, salary_changes=3, reviews=4, end=None, seed=0, batch_size=5000, progress=None):
+    """
+    Add `employees` employees with their history over the `days` working
+    days up to `end` (default: yesterday): about `salary_changes` salary
+    changes and exactly `reviews` reviews each, and one attendance row per
+    working day, so `employees * days` attendance rows in all.
+
+    `progress(table, rows)` is called after every batch. Returns the number
+    of rows written per table.
+    """
+    rng = random.Random(seed)
+    days = working_days(end or timezone.localdate() - datetime.timedelta(days=1), days)
+    counts = {}
+
+    def write(model, rows):
+        written = 0
+        for batch in _batches(rows, batch_size):
+            model.objects.bulk_create(batch)
+            written += len(batch)
+            if progress:
+                progress(model._meta.model_name, written)
+        counts[model._meta.model_name] = written
+
+    profiles = list(_profiles(rng, employees, salary_changes))
+    # Everyone was hired before the history starts; the archived left at its
+    # end. A separate generator, so the other rows don't change.
+    hires = random.Random(f'{seed}-hires')
+    for profile in profiles:
+        profile.employee.created_at = _aware(days[0]) - datetime.timedelta(days=hires.randint(0, 5 * 365))
+        if profile.employee.archived:
+            profile.employee.archived_at = _aware(days[-1], 18)
+    write(Employee, (profile.employee for profile in profiles))
+    with historical_timestamps(SalaryHistory._meta.get_field('changed_at'), PerformanceReview._meta.get_field('created_at')):
+        write(SalaryHistory, _salary_history(rng, profiles, days))
+        write(PerformanceReview, _reviews(rng, profiles, days, reviews))
+    write(Attendance, _attendance(rng, profiles, days))
+
+    counts['attendancerollup'] = rebuild_attendance_rollups(batch_size)
+    counts['leaderboardentry'] = rebuild_leaderboard(batch_size)
+    rebuild_search_index()
+    with transaction.atomic():
+        models_changed(Employee, SalaryHistory, PerformanceReview, Attendance)
+    return counts
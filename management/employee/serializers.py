@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import Employee, SalaryHistory, PerformanceReview, Attendance
+from rest_framework.reverse import reverse
+from .models import Employee, SalaryHistory, PerformanceReview, Attendance, Job, RATINGS
+from .metrics import MeasuredSerializerMixin, MeasuredListSerializer
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 
@@ -32,7 +34,7 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'username', 'email')
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     name = serializers.CharField(required=True)
     department = serializers.CharField(required=True)
     position = serializers.CharField(required=True)
@@ -40,7 +42,8 @@ class EmployeeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Employee
-        fields = '__all__'
+        exclude = ('created_at', 'archived_at')
+        list_serializer_class = MeasuredListSerializer
 
     def get_salary(self, obj):
         return f"₱{obj.salary:,.2f}"
@@ -50,7 +53,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Salary must be greater than zero.")
         return value
 
-class SalaryHistorySerializer(serializers.ModelSerializer):
+class SalaryHistorySerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.name', read_only=True)
     previous_salary = serializers.SerializerMethodField()
     new_salary = serializers.SerializerMethodField()
@@ -58,6 +61,7 @@ class SalaryHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = SalaryHistory
         fields = '__all__'
+        list_serializer_class = MeasuredListSerializer
 
     def get_previous_salary(self, obj):
         return f"₱{obj.previous_salary:,.2f}"
@@ -70,16 +74,39 @@ class SalaryHistorySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("New salary must be greater than zero.")
         return value
 
-class PerformanceReviewSerializer(serializers.ModelSerializer):
+class PerformanceReviewSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.name', read_only=True)
     
     class Meta:
         model = PerformanceReview
         fields = '__all__'
+        list_serializer_class = MeasuredListSerializer
+        extra_kwargs = {'rating': {'min_value': RATINGS[0], 'max_value': RATINGS[-1]}}
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.name', read_only=True)
 
     class Meta:
         model = Attendance
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        list_serializer_class = MeasuredListSerializer
+
+class JobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = ('id', 'kind', 'status', 'progress', 'result', 'error', 'download', 'created_at', 'started_at', 'finished_at')
+
+    def get_progress(self, obj):
+        return {
+            "done": obj.done,
+            "total": obj.total,
+            "percent": round(obj.done * 100 / obj.total, 1) if obj.total else (100.0 if obj.status == 'succeeded' else 0.0),
+        }
+
+    def get_download(self, obj):
+        if obj.kind != 'export' or obj.status != 'succeeded':
+            return None
+        return reverse('jobs-download', args=[obj.pk], request=self.context.get('request'))
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import models_changed
+from .leaderboard import move_department
+from .models import Employee, SalaryHistory, PerformanceReview, Attendance
+from .search import employee_saved, employee_deleted
+
+TRACKED_MODELS = (Employee, SalaryHistory, PerformanceReview, Attendance)
+
+
+def track_model_writes(sender, **kwargs):
+    models_changed(sender)
+
+
+# Saves only, and per model. A post_delete receiver makes the delete
+# collector load every row and signal it one by one instead of deleting in
+# bulk, so the delete paths call models_changed themselves, once.
+for model in TRACKED_MODELS:
+    post_save.connect(track_model_writes, sender=model, dispatch_uid=f'track_model_writes.{model._meta.label_lower}')
+
+
+@receiver(post_save, sender=Employee)
+def index_employee(sender, instance, **kwargs):
+    employee_saved(instance)
+
+
+@receiver(post_save, sender=Employee)
+def move_leaderboard_entry(sender, instance, created, **kwargs):
+    if not created:
+        move_department(instance)
+
+
+@receiver(post_delete, sender=Employee)
+def unindex_employee(sender, instance, **kwargs):
+    employee_deleted(instance)
@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from employee.cache import get_backend
+from employee.models import Employee
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False}, DATABASE_REPLICAS=[])
+class APITestCase(TestCase):
+    """
+    A signed-in client, reads on the primary and the response cache off;
+    test cases that turn it on start each test with it empty. `employee`
+    to act on is created from `employee_fields` (None for no employee).
+    """
+    employee_fields = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='tester', password='tester-password')
+        if cls.employee_fields is not None:
+            cls.employee = Employee.objects.create(**{'name': 'Ana Cruz', 'department': 'Sales', 'position': 'Analyst', **cls.employee_fields})
+
+    def setUp(self):
+        get_backend().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
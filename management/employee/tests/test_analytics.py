@@ -0,0 +1,92 @@
+import datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+from employee.models import Attendance, Employee, PerformanceReview
+from employee.rollups import rebuild_attendance_rollups
+from employee.tests.base import APITestCase
+
+URL = '/api/analytics/departments/'
+
+
+def day(month, number):
+    return datetime.date(2025, month, number)
+
+
+class DepartmentAnalyticsTests(APITestCase):
+    employee_fields = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        sales = [
+            Employee.objects.create(name=f'Seller {salary}', department='Sales', position='Rep', salary=Decimal(salary), active=salary != 40000)
+            for salary in (10000, 20000, 30000, 40000)
+        ]
+        ops = Employee.objects.create(name='Ben Ong', department='Ops', position='Clerk', salary=Decimal('50000'))
+        archived = Employee.objects.create(name='Old Hand', department='Sales', position='Rep', salary=Decimal('900000'), archived=True)
+
+        for employee, rating, reviewed_on in (
+            (sales[0], 8, day(6, 3)), (sales[1], 8, day(6, 20)), (sales[2], 5, day(7, 2)), (ops, 9, day(6, 10)), (archived, 1, day(6, 10)),
+        ):
+            review = PerformanceReview.objects.create(employee=employee, review='Fine.', rating=rating)
+            PerformanceReview.objects.filter(pk=review.pk).update(
+                created_at=timezone.make_aware(datetime.datetime.combine(reviewed_on, datetime.time(12)))
+            )
+
+        statuses = ['Present', 'Late', 'Leave', 'Absent']
+        Attendance.objects.bulk_create(
+            [Attendance(employee=sales[0], date=day(6, number + 1), status=status) for number, status in enumerate(statuses)]
+            + [Attendance(employee=ops, date=day(6, 2), status='Present'), Attendance(employee=archived, date=day(6, 2), status='Leave')]
+        )
+        rebuild_attendance_rollups()
+
+    def departments(self, **params):
+        response = self.client.get(URL, params)
+        self.assertEqual(response.status_code, 200)
+        return {row['department']: row for row in response.data['departments']}
+
+    def test_headcount_and_salaries_leave_out_archived_employees(self):
+        departments = self.departments()
+        self.assertEqual(list(departments), ['Ops', 'Sales'])
+        sales = departments['Sales']
+        self.assertEqual((sales['headcount'], sales['active']), (4, 3))
+        self.assertEqual(sales['salary'], {'average': 25000.0, 'median': 25000.0, 'p90': 40000.0})
+        self.assertEqual(departments['Ops']['salary'], {'average': 50000.0, 'median': 50000.0, 'p90': 50000.0})
+
+    def test_ratings_in_the_window(self):
+        sales = self.departments()['Sales']['ratings']
+        self.assertEqual((sales['reviews'], sales['average']), (3, 7.0))
+        self.assertEqual((sales['distribution']['8'], sales['distribution']['5'], sales['distribution']['1']), (2, 1, 0))
+
+        june = self.departments(start='2025-06-01', end='2025-06-20')
+        self.assertEqual((june['Sales']['ratings']['reviews'], june['Sales']['ratings']['average']), (2, 8.0))
+        self.assertEqual(june['Ops']['ratings']['reviews'], 1)
+
+        july = self.departments(start='2025-07-01')
+        self.assertEqual(july['Ops']['ratings'], {'reviews': 0, 'average': None, 'distribution': dict.fromkeys(map(str, range(1, 11)), 0)})
+
+    def test_attendance_rates(self):
+        sales = self.departments(start='2025-06-01', end='2025-06-02')['Sales']['attendance']
+        self.assertEqual(sales, {'records': 2, 'present_rate': 1.0, 'leave_rate': 0.0})
+        self.assertEqual(self.departments(start='2025-07-01')['Sales']['attendance'], {'records': 0, 'present_rate': None, 'leave_rate': None})
+
+    def test_whole_months_read_the_rollups_and_agree_with_the_rows(self):
+        # June exactly is read from the rollups; June plus a day of July from the rows.
+        by_rollups = self.departments(start='2025-06-01', end='2025-06-30')
+        by_rows = self.departments(start='2025-06-01', end='2025-07-01')
+        for department in ('Sales', 'Ops'):
+            self.assertEqual(by_rollups[department]['attendance'], by_rows[department]['attendance'])
+        self.assertEqual(by_rollups['Sales']['attendance'], {'records': 4, 'present_rate': 0.5, 'leave_rate': 0.25})
+
+        Attendance.objects.all().delete()
+        self.assertEqual(self.departments(start='2025-06-01', end='2025-06-30')['Sales']['attendance']['records'], 4)
+        self.assertEqual(self.departments(start='2025-06-01', end='2025-07-01')['Sales']['attendance']['records'], 0)
+
+    def test_invalid_windows_are_rejected(self):
+        for params, field in (({'start': 'June'}, 'start'), ({'end': '2025-02-30'}, 'end'), ({'start': '2025-06-02', 'end': '2025-06-01'}, 'end')):
+            with self.subTest(params=params):
+                response = self.client.get(URL, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data)
@@ -0,0 +1,190 @@
+import datetime
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from employee import async_views
+from employee.authentication import tokens_for
+from employee.models import Attendance, AttendanceRollup, Employee
+from employee.tests.base import APITestCase
+
+DAY = datetime.date(2025, 6, 2)
+
+
+def at(hour, minute, second=0):
+    return datetime.datetime.combine(DAY, datetime.time(hour, minute, second), tzinfo=datetime.timezone.utc)
+
+
+class CheckInOutTests(APITestCase):
+    """The sync actions and the async views write attendance the same way."""
+
+    def setUp(self):
+        super().setUp()
+        self.token = str(tokens_for(self.user).access_token)
+
+    def sync_post(self, action):
+        return self.client.post(f'/api/attendance/{self.employee.pk}/{action}/')
+
+    def async_post(self, action):
+        view = getattr(async_views, action)
+        request = RequestFactory().post('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return async_to_sync(view)(request, self.employee.pk)
+
+    def test_both_paths(self):
+        for post in (self.sync_post, self.async_post):
+            with self.subTest(path=post.__name__):
+                Attendance.objects.all().delete()
+                with mock.patch('employee.bulk.now', return_value=at(8, 0, 30)):
+                    self.assertEqual(post('check_in').status_code, 201)
+                    self.assertEqual(post('check_in').status_code, 400)
+                with mock.patch('employee.bulk.now', return_value=at(17, 30)):
+                    self.assertEqual(post('check_out').status_code, 200)
+                    self.assertEqual(post('check_out').status_code, 400)
+
+                attendance = Attendance.objects.get(employee=self.employee, date=DAY)
+                # Nine hours and 29.5 minutes worked, seconds included.
+                self.assertAlmostEqual(attendance.overtime_hours, 1 + 59 / 120)
+                self.assertEqual(AttendanceRollup.objects.get(employee=self.employee).overtime_hours, attendance.overtime_hours)
+
+    def test_write_and_rollup_are_one_transaction(self):
+        for post in (self.sync_post, self.async_post):
+            with self.subTest(path=post.__name__):
+                Attendance.objects.all().delete()
+                with mock.patch('employee.bulk.now', return_value=at(8, 0)), \
+                        mock.patch('employee.bulk.refresh_attendance_rollups', side_effect=RuntimeError):
+                    with self.assertRaises(RuntimeError):
+                        post('check_in')
+                self.assertFalse(Attendance.objects.exists())
+
+                Attendance.objects.create(employee=self.employee, date=DAY, check_in_time=datetime.time(8))
+                with mock.patch('employee.bulk.now', return_value=at(18, 0)), \
+                        mock.patch('employee.bulk.refresh_attendance_rollups', side_effect=RuntimeError):
+                    with self.assertRaises(RuntimeError):
+                        post('check_out')
+                self.assertIsNone(Attendance.objects.get(employee=self.employee, date=DAY).check_out_time)
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': True, 'BACKEND': 'employee.cache.LRUBackend'})
+class AsyncEmployeeAttendanceTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Attendance.objects.create(employee=cls.employee, date=DAY, check_in_time=datetime.time(8), status='Present')
+
+    def setUp(self):
+        super().setUp()
+        self.token = str(tokens_for(self.user).access_token)
+
+    def get(self, **headers):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}', **headers)
+        return async_to_sync(async_views.employee_attendance)(request, self.employee.pk)
+
+    def test_matches_the_sync_action(self):
+        response = self.get()
+        self.assertEqual((response.status_code, response['X-Cache']), (200, 'MISS'))
+        self.assertEqual(json.loads(response.content), self.client.get(f'/api/attendance/{self.employee.pk}/employee_attendance/').data)
+
+    def test_hits_and_not_modified(self):
+        first = self.get()
+        with self.assertNumQueries(1):
+            second = self.get()
+        self.assertEqual((second['X-Cache'], second.content), ('HIT', first.content))
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+    def test_check_in_invalidates(self):
+        first = self.get()
+        with self.captureOnCommitCallbacks(execute=True), mock.patch('employee.bulk.now', return_value=at(8, 0) + datetime.timedelta(days=1)):
+            self.assertEqual(async_to_sync(async_views.check_in)(
+                RequestFactory().post('/', HTTP_AUTHORIZATION=f'Bearer {self.token}'), self.employee.pk
+            ).status_code, 201)
+        response = self.get(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((response.status_code, response['X-Cache']), (200, 'MISS'))
+        self.assertEqual(len(json.loads(response.content)), 2)
+
+    def test_unauthenticated_and_missing(self):
+        self.token = 'not-a-token'
+        self.assertEqual(self.get().status_code, 401)
+        Attendance.objects.all().delete()
+        self.token = str(tokens_for(self.user).access_token)
+        self.assertEqual(self.get().status_code, 404)
+
+
+class IngestTests(APITestCase):
+    url = '/api/attendance/ingest/'
+
+    def event(self, kind, hour, minute=0, employee=None):
+        return {'employee_id': employee or self.employee.pk, 'kind': kind, 'timestamp': at(hour, minute).isoformat()}
+
+    def test_check_in_and_out_in_one_batch(self):
+        # Out of order on purpose: events are applied by timestamp.
+        response = self.client.post(self.url, {'events': [self.event('check_out', 18), self.event('check_in', 8)]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['updated'], response.data['errors']), (1, 1, 0))
+
+        attendance = Attendance.objects.get(employee=self.employee, date=DAY)
+        self.assertEqual((attendance.check_in_time, attendance.check_out_time), (datetime.time(8), datetime.time(18)))
+        self.assertEqual(attendance.overtime_hours, 2)
+        self.assertEqual([result['attendance_id'] for result in response.data['results']], [attendance.pk, attendance.pk])
+        self.assertEqual(AttendanceRollup.objects.get(employee=self.employee).overtime_hours, 2)
+
+    def test_check_out_of_an_existing_day(self):
+        attendance = Attendance.objects.create(employee=self.employee, date=DAY, check_in_time=datetime.time(9))
+        response = self.client.post(self.url, [self.event('check_out', 17, 30)], format='json')
+        self.assertEqual(response.data['results'], [{'index': 0, 'status': 'updated', 'attendance_id': attendance.pk}])
+        attendance.refresh_from_db()
+        self.assertEqual(attendance.check_out_time, datetime.time(17, 30))
+        self.assertAlmostEqual(attendance.overtime_hours, 0.5)
+
+    def test_bad_events_are_reported_by_index(self):
+        Attendance.objects.create(employee=self.employee, date=DAY, check_in_time=datetime.time(9), check_out_time=datetime.time(17))
+        events = [
+            'not an event',
+            {'kind': 'check_in', 'timestamp': at(8, 0).isoformat()},
+            {**self.event('check_in', 8), 'kind': 'lunch'},
+            {**self.event('check_in', 8), 'timestamp': 'yesterday'},
+            self.event('check_in', 8, employee=self.employee.pk + 1000),
+            self.event('check_in', 8),
+            self.event('check_out', 18),
+            {**self.event('check_out', 18), 'timestamp': (at(18, 0) + datetime.timedelta(days=1)).isoformat()},
+        ]
+        response = self.client.post(self.url, {'events': events}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['updated'], response.data['errors']), (0, 0, 8))
+        self.assertEqual([result['error'] for result in response.data['results']], [
+            'Each event must be an object.',
+            'employee_id is required.',
+            'kind must be one of: check_in, check_out.',
+            'timestamp must be an ISO 8601 datetime.',
+            'Employee not found',
+            'Check-in already recorded',
+            'Check-out already recorded',
+            'No check-in record found',
+        ])
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_ndjson_body(self):
+        body = '\n'.join(json.dumps(event) for event in (self.event('check_in', 8), self.event('check_out', 16))) + '\n'
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 1))
+
+    def test_empty_batch_is_rejected(self):
+        for body in ({'events': []}, [], {'events': 'check_in'}):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post(self.url, body, format='json').status_code, 400)
+
+    def test_batch_queries_do_not_grow_with_its_size(self):
+        employees = [Employee.objects.create(name=f'Clerk {i}', department='Ops', position='Clerk') for i in range(20)]
+        events = [self.event(kind, hour, employee=employee.pk) for employee in employees for kind, hour in (('check_in', 8), ('check_out', 17))]
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, events[:4], format='json')
+        Attendance.objects.all().delete()
+        AttendanceRollup.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, events, format='json')
+        self.assertEqual(response.data['created'], 20)
+        self.assertEqual(len(large), len(small))
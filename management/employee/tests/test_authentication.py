@@ -0,0 +1,31 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from employee.authentication import ClaimsJWTAuthentication, tokens_for
+
+REVOKED_AT = datetime.datetime(2025, 6, 2, 9, 30, 0, 900000, tzinfo=datetime.timezone.utc)
+
+
+class RevocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='revoked', password='revoked-password', tokens_valid_after=REVOKED_AT)
+
+    def token(self, issued_at):
+        token = tokens_for(self.user).access_token
+        token['iat'] = int(issued_at.timestamp())
+        return token
+
+    def check(self, issued_at):
+        return ClaimsJWTAuthentication().get_user(self.token(issued_at))
+
+    def test_tokens_up_to_the_revocation_second_are_rejected(self):
+        for strict in (False, True):
+            with self.subTest(strict=strict), override_settings(JWT_CLAIMS_AUTH={'STRICT': strict}):
+                for issued_at in (REVOKED_AT - datetime.timedelta(seconds=1), REVOKED_AT.replace(microsecond=0), REVOKED_AT):
+                    with self.assertRaises(InvalidToken):
+                        self.check(issued_at)
+                self.assertEqual(self.check(REVOKED_AT + datetime.timedelta(seconds=1)).username, 'revoked')
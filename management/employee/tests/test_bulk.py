@@ -0,0 +1,42 @@
+from decimal import Decimal
+
+from employee.models import SalaryHistory
+from employee.tests.base import APITestCase
+
+
+class BulkAdjustTests(APITestCase):
+    employee_fields = {'salary': Decimal('30000.00')}
+
+    def adjust(self, body):
+        return self.client.post('/api/salary/bulk_adjust/', body, format='json')
+
+    def test_non_finite_values_are_rejected(self):
+        for body, error in (
+            ({'percentage': 'NaN'}, 'percentage must be a number.'),
+            ({'percentage': 'Infinity'}, 'percentage must be a number.'),
+            ({'percentage': '-Infinity', 'department': 'Sales'}, 'percentage must be a number.'),
+            ({'department_percentages': {'Sales': 'NaN'}}, 'Percentage for Sales must be a number.'),
+            ({'salaries': {self.employee.pk: 'NaN'}}, f'Salary for employee {self.employee.pk} must be a number.'),
+            ({'salaries': {self.employee.pk: 'Infinity'}}, f'Salary for employee {self.employee.pk} must be a number.'),
+        ):
+            with self.subTest(body=body):
+                response = self.adjust(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {'error': error})
+
+    def test_salaries_the_column_cannot_hold_are_rejected(self):
+        response = self.adjust({'salaries': {self.employee.pk: '1e30'}})
+        self.assertEqual(response.status_code, 400)
+        response = self.adjust({'percentage': '1e30'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': f'The new salary of employee {self.employee.pk} is too large.'})
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.salary, Decimal('30000.00'))
+        self.assertFalse(SalaryHistory.objects.exists())
+
+    def test_percentage_adjustment(self):
+        response = self.adjust({'percentage': '5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['adjusted'], 1)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.salary, Decimal('31500.00'))
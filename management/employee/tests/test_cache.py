@@ -0,0 +1,124 @@
+import datetime
+from unittest import mock
+
+from django.db.models.signals import post_delete
+from django.test import SimpleTestCase, override_settings
+
+from employee.cache import FakeRedis, RedisBackend, get_backend, invalidate
+from employee.models import Attendance, Employee, PerformanceReview, SalaryHistory
+from employee.tests.base import APITestCase
+from employee.versions import table_versions
+
+DAY = datetime.date(2025, 6, 2)
+
+REDIS_CACHE = {'ENABLED': True, 'BACKEND': 'employee.cache.RedisBackend', 'OPTIONS': {'url': 'fake://', 'prefix': 'test:'}, 'TIMEOUT': 60}
+
+
+class DeleteTrackingTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Attendance.objects.bulk_create(
+            Attendance(employee=cls.employee, date=DAY - datetime.timedelta(days=day), status='Present') for day in range(500)
+        )
+
+    def version(self, model):
+        return table_versions(model).get(model._meta.label_lower, (0,))[0]
+
+    def test_history_rows_can_be_deleted_in_bulk(self):
+        for model in (Attendance, SalaryHistory, PerformanceReview):
+            self.assertFalse(post_delete.has_listeners(model), model)
+
+    def test_bulk_delete_changes_the_version_once(self):
+        before = self.version(Attendance)
+        with self.assertNumQueries(7):
+            response = self.client.delete(f'/api/attendance/{self.employee.pk}/delete_all_attendance/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Attendance.objects.exists())
+        self.assertEqual(self.version(Attendance), before + 1)
+
+    def test_destroy_changes_the_version(self):
+        attendance = Attendance.objects.filter(employee=self.employee).first()
+        before = self.version(Attendance)
+        self.assertEqual(self.client.delete(f'/api/attendance/{attendance.pk}/').status_code, 204)
+        self.assertEqual(self.version(Attendance), before + 1)
+
+    def test_deleting_an_employee_changes_its_history_tables(self):
+        before = {model: self.version(model) for model in (Attendance, SalaryHistory, PerformanceReview)}
+        self.assertEqual(self.client.delete(f'/api/employees/{self.employee.pk}/').status_code, 204)
+        for model, version in before.items():
+            self.assertGreater(self.version(model), version, model)
+
+
+class RedisBackendTests(SimpleTestCase):
+    def setUp(self):
+        self.backend = RedisBackend(url='fake://', prefix='test:')
+
+    def test_keys_are_prefixed(self):
+        self.assertIsInstance(self.backend.client, FakeRedis)
+        self.backend.set('resp:1', b'body')
+        self.assertEqual(self.backend.client.get('test:resp:1'), b'body')
+        self.backend.delete('resp:1')
+        self.assertIsNone(self.backend.get('resp:1'))
+
+    def test_generations_count_up(self):
+        self.assertIsNone(self.backend.get('gen:employee.employee'))
+        self.assertEqual([self.backend.incr('gen:employee.employee') for _ in range(3)], [1, 2, 3])
+        self.assertEqual(int(self.backend.get('gen:employee.employee')), 3)
+
+    def test_entries_expire(self):
+        with mock.patch('employee.cache.time') as clock:
+            clock.monotonic.return_value = 100.0
+            self.backend.set('resp:1', b'body', timeout=5)
+            self.backend.set('resp:2', b'body')
+            clock.monotonic.return_value = 104.0
+            self.assertEqual(self.backend.get('resp:1'), b'body')
+            clock.monotonic.return_value = 106.0
+            self.assertIsNone(self.backend.get('resp:1'))
+            self.assertEqual(self.backend.get('resp:2'), b'body')
+
+    @override_settings(RESPONSE_CACHE=REDIS_CACHE, DATABASE_REPLICAS=['replica'], REPLICA_PIN_SECONDS=5)
+    def test_invalidate_bumps_the_generation_and_marks_replicas_settling(self):
+        client = get_backend().client
+        with mock.patch('employee.cache.time') as clock:
+            clock.monotonic.return_value = 100.0
+            invalidate(Employee)
+            invalidate(Employee)
+            self.assertEqual(client.get('test:gen:employee.employee'), b'2')
+            self.assertEqual(client.get('test:settling:employee.employee'), b'1')
+            clock.monotonic.return_value = 106.0
+            self.assertIsNone(client.get('test:settling:employee.employee'))
+            self.assertEqual(client.get('test:gen:employee.employee'), b'2')
+
+
+@override_settings(RESPONSE_CACHE=REDIS_CACHE)
+class RedisCachedReadTests(APITestCase):
+    url = '/api/employees/'
+
+    def test_hit_after_miss(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+    def test_write_invalidates(self):
+        first = self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/employees/{self.employee.pk}/', {'name': 'Ana Reyes'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_backend().client.get('test:gen:employee.employee'), b'1')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((response.status_code, response['X-Cache']), (200, 'MISS'))
+        self.assertEqual(response.data['results'][0]['name'], 'Ana Reyes')
+
+    def test_expired_response_is_rebuilt(self):
+        with mock.patch('employee.cache.time') as clock:
+            clock.monotonic.return_value = 100.0
+            self.client.get(self.url)
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+            clock.monotonic.return_value = 161.0
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
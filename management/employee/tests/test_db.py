@@ -0,0 +1,32 @@
+import os
+import tempfile
+from unittest import skipUnless
+
+from django.db import connection, connections
+from django.test import SimpleTestCase, override_settings
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite pragmas')
+class SqlitePragmaTests(SimpleTestCase):
+    def journal_mode(self):
+        """Open a connection to a fresh database file and return (journal_mode, files left beside it)."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'db.sqlite3')
+        wrapper = connections['default'].__class__({**connections['default'].settings_dict, 'NAME': path}, alias='pragma_test')
+        try:
+            with wrapper.cursor() as cursor:
+                cursor.execute('CREATE TABLE t (id integer)')
+                cursor.execute('PRAGMA journal_mode')
+                mode = cursor.fetchone()[0]
+            return mode, sorted(os.listdir(directory.name))
+        finally:
+            wrapper.close()
+
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 20000})
+    def test_rollback_journal_by_default(self):
+        self.assertEqual(self.journal_mode(), ('delete', ['db.sqlite3']))
+
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'WAL'})
+    def test_wal_when_enabled(self):
+        self.assertEqual(self.journal_mode()[0], 'wal')
@@ -0,0 +1,83 @@
+import csv
+import datetime
+import io
+import json
+from decimal import Decimal
+
+from employee.models import Attendance, Employee
+from employee.tests.base import APITestCase
+
+DAY = datetime.date(2025, 6, 2)
+
+
+class ExportTests(APITestCase):
+    employee_fields = {'salary': Decimal('30000.00')}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = Employee.objects.create(name='Ben Ong', department='Ops', position='Clerk', salary=Decimal('25000.50'))
+        Employee.objects.create(name='Old Hand', department='Sales', position='Clerk', archived=True)
+        Attendance.objects.bulk_create([
+            Attendance(employee=cls.employee, date=DAY, check_in_time=datetime.time(8), check_out_time=datetime.time(18), overtime_hours=2),
+            Attendance(employee=cls.employee, date=DAY + datetime.timedelta(days=1), status='Leave'),
+            Attendance(employee=cls.other, date=DAY + datetime.timedelta(days=2), check_in_time=datetime.time(9)),
+        ])
+
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv(self):
+        response, body = self.export('/api/employees/export/')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="employees.csv"')
+        self.assertEqual(list(csv.reader(io.StringIO(body))), [
+            ['id', 'name', 'department', 'position', 'salary', 'active', 'archived'],
+            [str(self.employee.pk), 'Ana Cruz', 'Sales', 'Analyst', '30000.00', 'True', 'False'],
+            [str(self.other.pk), 'Ben Ong', 'Ops', 'Clerk', '25000.50', 'True', 'False'],
+        ])
+
+    def test_ndjson(self):
+        response, body = self.export('/api/attendance/export/', output='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0], {
+            'id': rows[0]['id'],
+            'employee': self.employee.pk,
+            'employee_name': 'Ana Cruz',
+            'department': 'Sales',
+            'date': '2025-06-02',
+            'check_in_time': '08:00:00',
+            'check_out_time': '18:00:00',
+            'status': 'Present',
+            'overtime_hours': 2.0,
+        })
+
+    def test_department_and_dates_filter_the_rows(self):
+        _, body = self.export('/api/attendance/export/', output='ndjson', department='Sales', start='2025-06-03', end='2025-06-03')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([(row['employee'], row['date']) for row in rows], [(self.employee.pk, '2025-06-03')])
+
+        _, body = self.export('/api/employees/export/', department='Ops')
+        self.assertEqual([row[1] for row in csv.reader(io.StringIO(body))], ['name', 'Ben Ong'])
+
+    def test_many_rows_stream_in_chunks(self):
+        Employee.objects.bulk_create(Employee(name=f'Clerk {i}', department='Ops', position='Clerk') for i in range(1200))
+        response = self.client.get('/api/employees/export/', {'output': 'ndjson'})
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b''.join(chunks).count(b'\n'), 1202)
+
+    def test_invalid_options_are_rejected(self):
+        for url, params, field in (
+            ('/api/employees/export/', {'output': 'xlsx'}, 'output'),
+            ('/api/attendance/export/', {'start': '2025-13-01'}, 'start'),
+            ('/api/salary/export/', {'end': 'soon'}, 'end'),
+        ):
+            with self.subTest(url=url, params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data)
@@ -0,0 +1,56 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import override_settings
+
+from employee.fastpath import FastPathUnsupported, FieldPlan, compile_plan
+from employee.models import Attendance, Employee, PerformanceReview, SalaryHistory
+from employee.serializers import EmployeeSerializer, JobSerializer
+from employee.tests.base import APITestCase
+
+
+class FastListTests(APITestCase):
+    """With FAST_READ_SERIALIZERS on, list pages render byte for byte as before."""
+
+    employee_fields = {'salary': Decimal('1234567.50')}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        other = Employee.objects.create(name='Ben Ong', department='Ops', position='Clerk', salary=Decimal('25000.00'), active=False)
+        SalaryHistory.objects.create(employee=cls.employee, previous_salary=Decimal('1000000.00'), new_salary=Decimal('1234567.50'))
+        PerformanceReview.objects.create(employee=other, review='Steady.', rating=7)
+        Attendance.objects.create(
+            employee=cls.employee, date=datetime.date(2025, 6, 2), check_in_time=datetime.time(8, 15), check_out_time=datetime.time(18), overtime_hours=1.75
+        )
+
+    def assertSameBody(self, url):
+        with override_settings(FAST_READ_SERIALIZERS=False):
+            slow = self.client.get(url)
+        with override_settings(FAST_READ_SERIALIZERS=True), mock.patch('employee.fastpath.FieldPlan.serialize', autospec=True, side_effect=FieldPlan.serialize) as serialize:
+            fast = self.client.get(url)
+        self.assertEqual(fast.status_code, 200)
+        self.assertTrue(serialize.called, url)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_lists_match_the_serializers(self):
+        for url in ('/api/employees/', '/api/salary/', '/api/performance/', '/api/attendance/'):
+            with self.subTest(url=url):
+                self.assertSameBody(url)
+
+    def test_sparse_fields_and_filters(self):
+        for url in ('/api/employees/?fields=id,salary', '/api/employees/?active=false', '/api/salary/?fields=employee_name,new_salary', '/api/attendance/?ordering=-date'):
+            with self.subTest(url=url):
+                self.assertSameBody(url)
+
+    def test_plans_are_compiled_once_per_field_set(self):
+        self.assertIs(compile_plan(EmployeeSerializer(many=True)), compile_plan(EmployeeSerializer()))
+        narrowed = EmployeeSerializer()
+        narrowed.fields.pop('salary')
+        self.assertIsNot(compile_plan(narrowed), compile_plan(EmployeeSerializer()))
+        self.assertNotIn('salary', compile_plan(narrowed).columns)
+
+    def test_method_fields_need_a_model_field(self):
+        with self.assertRaises(FastPathUnsupported):
+            FieldPlan(JobSerializer())
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from employee import filters
+from employee.tests.base import APITestCase
+
+
+class DecimalParserTests(SimpleTestCase):
+    def test_parses_numbers(self):
+        self.assertEqual(filters.decimal('1250.50'), Decimal('1250.50'))
+
+    def test_rejects_non_finite_values(self):
+        for value in ('NaN', 'nan', 'sNaN', 'Infinity', '-Infinity', 'inf'):
+            with self.subTest(value=value), self.assertRaisesMessage(ValueError, 'Enter a number.'):
+                filters.decimal(value)
+
+
+class SalaryFilterTests(APITestCase):
+    employee_fields = {'salary': Decimal('30000')}
+
+    def test_non_finite_bounds_are_a_validation_error(self):
+        for param in ('salary_min', 'salary_max'):
+            for value in ('NaN', 'Infinity', '-Infinity'):
+                with self.subTest(param=param, value=value):
+                    response = self.client.get('/api/employees/', {param: value})
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.data, {param: ['Enter a number.']})
+
+    def test_finite_bounds_filter(self):
+        response = self.client.get('/api/employees/', {'salary_min': '25000', 'salary_max': '35000'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
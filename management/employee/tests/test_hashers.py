@@ -0,0 +1,27 @@
+from django.contrib.auth import hashers as django_hashers
+from django.test import SimpleTestCase, override_settings
+
+from employee import hashers
+
+
+def django_default_hash():
+    hasher = django_hashers.PBKDF2PasswordHasher()
+    return hasher.encode('secret', hasher.salt())
+
+
+class HasherCostTests(SimpleTestCase):
+    @override_settings(PASSWORD_HASHER_COST={})
+    def test_defaults_follow_django(self):
+        self.assertEqual(hashers.PBKDF2PasswordHasher().iterations, django_hashers.PBKDF2PasswordHasher.iterations)
+        self.assertEqual(hashers.BCryptSHA256PasswordHasher().rounds, django_hashers.BCryptSHA256PasswordHasher.rounds)
+        self.assertEqual(hashers.Argon2PasswordHasher().memory_cost, django_hashers.Argon2PasswordHasher.memory_cost)
+
+        # A hash at Django's default cost is not rewritten on login.
+        encoded = django_default_hash()
+        self.assertFalse(hashers.PBKDF2PasswordHasher().must_update(encoded))
+
+    @override_settings(PASSWORD_HASHER_COST={'pbkdf2': {'iterations': 2000000}})
+    def test_operator_cost(self):
+        hasher = hashers.PBKDF2PasswordHasher()
+        self.assertEqual(hasher.iterations, 2000000)
+        self.assertTrue(hasher.must_update(django_default_hash()))
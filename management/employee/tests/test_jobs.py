@@ -0,0 +1,125 @@
+import datetime
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from employee.jobs import enqueue, export_dir, run_job
+from employee.models import Attendance, AttendanceRollup, Employee, Job
+from employee.rollups import rebuild_attendance_rollups
+
+User = get_user_model()
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False}, DATABASE_REPLICAS=[])
+class JobTests(TransactionTestCase):
+    """
+    Jobs run inline when their transaction commits (JOBS['EAGER']). A
+    TransactionTestCase, because run_job closes stale connections between
+    steps the way a worker does.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='tester-password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.employees = [
+            Employee.objects.create(name=f'Clerk {index}', department='Ops', position='Clerk', salary=Decimal('20000.00'))
+            for index in range(5)
+        ]
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings = override_settings(JOBS={'EAGER': True, 'CHUNK_SIZE': 2, 'INLINE_LIMIT': 3, 'EXPORT_DIR': self.directory})
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def accepted(self, response):
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Location'], response.data['url'])
+        return self.client.get(response.data['url'])
+
+    def test_background_export_matches_the_streamed_one(self):
+        streamed = self.client.get('/api/employees/export/', {'output': 'ndjson'})
+        job = self.accepted(self.client.get('/api/employees/export/', {'output': 'ndjson', 'background': 'true'}))
+        self.assertEqual(job.data['status'], 'succeeded')
+        self.assertEqual(job.data['progress'], {'done': 5, 'total': 5, 'percent': 100.0})
+        self.assertEqual(job.data['result']['rows'], 5)
+
+        download = self.client.get(job.data['download'])
+        self.assertEqual(download['Content-Disposition'], 'attachment; filename="employees.ndjson"')
+        self.assertEqual(b''.join(download.streaming_content), b''.join(streamed.streaming_content))
+        self.assertEqual([path.name for path in export_dir().iterdir()], [job.data['result']['file']])
+
+    def test_background_export_filters_and_header(self):
+        Employee.objects.filter(pk=self.employees[0].pk).update(department='Sales')
+        job = self.accepted(self.client.get('/api/employees/export/', {'department': 'Ops', 'background': 'true'}))
+        body = b''.join(self.client.get(job.data['download']).streaming_content).decode()
+        self.assertEqual(body.splitlines()[0], 'id,name,department,position,salary,active,archived')
+        self.assertEqual(len(body.splitlines()), 5)
+
+    def test_large_salary_adjustment_becomes_a_job(self):
+        job = self.accepted(self.client.post('/api/salary/bulk_adjust/', {'percentage': '10'}, format='json'))
+        self.assertEqual(job.data['status'], 'succeeded')
+        self.assertEqual(job.data['result']['adjusted'], 5)
+        self.assertIsNone(job.data['download'])
+        self.assertEqual(set(Employee.objects.values_list('salary', flat=True)), {Decimal('22000.00')})
+
+        # At or under the limit it still runs in the request.
+        response = self.client.post('/api/salary/bulk_adjust/', {'percentage': '10', 'department': 'Nobody'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_large_attendance_delete_becomes_a_job(self):
+        employee = self.employees[0]
+        Attendance.objects.bulk_create(
+            Attendance(employee=employee, date=datetime.date(2025, 6, 1) + datetime.timedelta(days=day), status='Present') for day in range(5)
+        )
+        rebuild_attendance_rollups()
+        job = self.accepted(self.client.delete(f'/api/attendance/{employee.pk}/delete_all_attendance/'))
+        self.assertEqual(job.data['result'], {'employee_id': employee.pk, 'deleted': 5})
+        self.assertEqual(job.data['progress']['total'], 5)
+        self.assertFalse(Attendance.objects.exists())
+        self.assertFalse(AttendanceRollup.objects.exists())
+
+    def test_jobs_are_visible_to_their_owner_and_staff(self):
+        job = enqueue('export', {'target': 'employees', 'output': 'csv'}, self.user)
+        stranger = User.objects.create_user(username='stranger', password='stranger-password')
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/jobs/').data['results'], [])
+
+        stranger.is_staff = True
+        stranger.save()
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/').status_code, 200)
+
+    def test_queued_jobs_wait_for_run_jobs(self):
+        out = StringIO()
+        with self.settings(JOBS={'RUN_IN_PROCESS': False, 'EXPORT_DIR': self.directory}):
+            job = enqueue('export', {'target': 'employees', 'output': 'csv'}, self.user)
+            response = self.client.get(f'/api/jobs/{job.pk}/download/')
+            self.assertEqual((response.status_code, response.data['status']), (409, 'queued'))
+
+            call_command('run_jobs', '--inline', stdout=out)
+            self.assertIn(f'Job {job.pk} (export): succeeded', out.getvalue())
+            self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/download/').status_code, 200)
+        self.assertFalse(run_job(job.pk))
+
+    def test_failures_and_missing_files(self):
+        job = Job.objects.create(kind='retired_kind', requested_by=self.user)
+        with self.assertLogs('employee.jobs', 'ERROR'):
+            self.assertTrue(run_job(job.pk, inline=True))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', "Unknown job kind 'retired_kind'."))
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/download/').status_code, 404)
+
+        with self.assertRaises(ValueError):
+            enqueue('retired_kind', {})
+
+        export = enqueue('export', {'target': 'employees', 'output': 'csv'}, self.user)
+        export.refresh_from_db()
+        (export_dir() / export.result['file']).unlink()
+        self.assertEqual(self.client.get(f'/api/jobs/{export.pk}/download/').status_code, 410)
@@ -0,0 +1,77 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from employee import logins
+
+User = get_user_model()
+
+START = timezone.make_aware(datetime.datetime(2025, 6, 2, 9, 0))
+
+
+@override_settings(LAST_LOGIN_INTERVAL=300)
+class CoalescedLoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(username=f'user{i}', password='user-password') for i in range(3)]
+
+    def setUp(self):
+        self.clock = 1000.0
+        for patcher in (
+            mock.patch.object(logins, '_pending', {}),
+            mock.patch.object(logins, '_written', {}),
+            mock.patch.object(logins, '_next_flush', 0.0),
+            mock.patch.object(logins, '_next_prune', 0.0),
+            mock.patch.object(logins.time, 'monotonic', lambda: self.clock),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def login(self, user, seconds):
+        """Log `user` in `seconds` after START."""
+        self.clock = 1000.0 + seconds
+        with mock.patch.object(logins.timezone, 'now', return_value=START + datetime.timedelta(seconds=seconds)):
+            logins.record_login(user)
+
+    def stored(self, user):
+        return User.objects.values_list('last_login', flat=True).get(pk=user.pk)
+
+    def test_first_login_is_written_and_later_ones_buffered(self):
+        user = self.users[0]
+        self.login(user, 0)
+        self.assertEqual(self.stored(user), START)
+
+        with self.assertNumQueries(0):
+            self.login(user, 10)
+            self.login(user, 20)
+        self.assertEqual(self.stored(user), START)
+        self.assertEqual(user.last_login, START + datetime.timedelta(seconds=20))
+
+        self.assertEqual(logins.flush_last_logins(force=True), 1)
+        self.assertEqual(self.stored(user), START + datetime.timedelta(seconds=20))
+
+    def test_due_users_are_flushed_together_by_the_next_login(self):
+        first, second, third = self.users
+        self.login(first, 0)
+        self.login(second, 0)
+        self.login(first, 10)
+        self.login(second, 10)
+        # An interval later the next login writes both buffered ones.
+        self.login(third, 400)
+        self.assertEqual(self.stored(first), START + datetime.timedelta(seconds=10))
+        self.assertEqual(self.stored(second), START + datetime.timedelta(seconds=10))
+        self.assertEqual(logins._pending, {})
+
+    def test_old_writes_are_forgotten(self):
+        for user in self.users:
+            self.login(user, 0)
+        self.login(self.users[0], 100)
+        self.assertEqual(len(logins._written), 3)
+
+        # The buffered user stays until flushed; the others go.
+        self.login(self.users[1], 350)
+        self.assertEqual(set(logins._written), {self.users[0].pk, self.users[1].pk})
+        self.assertEqual(self.stored(self.users[1]), START + datetime.timedelta(seconds=350))
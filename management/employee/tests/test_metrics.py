@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from employee.authentication import tokens_for
+from employee.metrics import get_registry, view_labels
+
+METRICS = {'ENABLED': True, 'SLOW_REQUEST_SECONDS': None, 'TOKEN': 'scrape-token'}
+
+
+@override_settings(METRICS=METRICS, RESPONSE_CACHE={'ENABLED': False}, DATABASE_REPLICAS=[])
+class MetricsAccessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.staff = User.objects.create_user(username='ops', password='ops-password', employee_id='ops', is_staff=True)
+        cls.user = User.objects.create_user(username='clerk', password='clerk-password', employee_id='clerk')
+
+    def get(self, **headers):
+        return APIClient().get('/metrics', **headers)
+
+    def bearer(self, user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {tokens_for(user).access_token}'}
+
+    def test_anonymous_and_non_staff_are_refused(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="metrics"')
+        self.assertEqual(self.get(**self.bearer(self.user)).status_code, 401)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer wrong-token').status_code, 401)
+
+    def test_scrape_token(self):
+        response = self.get(HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'# TYPE ems_request_duration_seconds histogram', response.content)
+
+    @override_settings(METRICS={**METRICS, 'TOKEN': None})
+    def test_no_token_configured(self):
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer ').status_code, 401)
+
+    def test_staff(self):
+        self.assertEqual(self.get(**self.bearer(self.staff)).status_code, 200)
+        client = APIClient()
+        client.force_login(self.staff)
+        self.assertEqual(client.get('/metrics').status_code, 200)
+
+
+@override_settings(METRICS=METRICS, RESPONSE_CACHE={'ENABLED': False}, DATABASE_REPLICAS=[])
+class MethodLabelTests(TestCase):
+    def setUp(self):
+        get_registry().clear()
+        self.addCleanup(get_registry().clear)
+
+    def test_unknown_methods_are_other(self):
+        self.assertEqual(view_labels(RequestFactory().generic('BREW', '/nowhere')), ('unmatched', '', 'other'))
+        self.assertEqual(view_labels(RequestFactory().get('/nowhere')), ('unmatched', '', 'GET'))
+
+    def test_recorded_labels(self):
+        for method in ('PURGE', 'X-ANYTHING', 'GET'):
+            self.client.generic(method, '/no-such-page/')
+        methods = {labels[2] for labels in get_registry().snapshot()}
+        self.assertEqual(methods, {'other', 'GET'})
@@ -0,0 +1,59 @@
+import datetime
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+BEFORE = [('employee', '0005_pagination_indexes')]
+AFTER = [('employee', '0006_attendance_constraints')]
+DAY = datetime.date(2025, 6, 2)
+
+
+def _migrate(targets):
+    executor = MigrationExecutor(connection)
+    executor.migrate(targets)
+    return executor.loader.project_state(targets).apps
+
+
+class MergeDuplicateAttendanceTests(TransactionTestCase):
+    def setUp(self):
+        apps = _migrate(BEFORE)
+        self.Attendance = apps.get_model('employee', 'Attendance')
+        self.employee = apps.get_model('employee', 'Employee').objects.create(name='Ana Cruz', department='Sales', position='Analyst')
+
+    def tearDown(self):
+        _migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def add(self, **fields):
+        return self.Attendance.objects.create(employee=self.employee, date=DAY, **fields)
+
+    def test_keeps_the_times_and_overtime_of_every_duplicate(self):
+        # The first check-in, a duplicate check-in a moment later, and the
+        # check-out that landed on the duplicate.
+        first = self.add(status='Present', check_in_time=datetime.time(8, 55))
+        self.add(status='Late', check_in_time=datetime.time(9, 20), check_out_time=datetime.time(19, 30), overtime_hours=1.5)
+
+        _migrate(AFTER)
+
+        rows = list(self.Attendance.objects.values('id', 'status', 'check_in_time', 'check_out_time', 'overtime_hours'))
+        self.assertEqual(rows, [{
+            'id': rows[0]['id'],
+            'status': 'Present',
+            'check_in_time': datetime.time(8, 55),
+            'check_out_time': datetime.time(19, 30),
+            'overtime_hours': 1.5,
+        }])
+        self.assertNotEqual(rows[0]['id'], first.id)
+
+    def test_refuses_to_guess_between_conflicting_statuses(self):
+        absent = self.add(status='Absent')
+        self.add(status='Present', check_in_time=datetime.time(9, 0))
+
+        with self.assertRaisesMessage(RuntimeError, f'employee {self.employee.id} on {DAY}'):
+            _migrate(AFTER)
+        self.assertEqual(self.Attendance.objects.count(), 2)
+
+        # What the operator would do before running it again.
+        absent.delete()
+        _migrate(AFTER)
+        self.assertEqual(self.Attendance.objects.count(), 1)
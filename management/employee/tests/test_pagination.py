@@ -0,0 +1,102 @@
+import datetime
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from employee.models import Attendance, Employee
+from employee.pagination import KeysetPagination
+from employee.tests.base import APITestCase
+
+DAY = datetime.date(2025, 6, 2)
+
+
+class KeysetPaginationTests(APITestCase):
+    employee_fields = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        employees = Employee.objects.bulk_create(
+            Employee(name=f'Employee {i}', department='Engineering', position='Analyst') for i in range(1200)
+        )
+        # More rows on one date than DRF's cursor offset cutoff of 1000.
+        Attendance.objects.bulk_create(Attendance(employee=employee, date=DAY, status='Present') for employee in employees)
+        Attendance.objects.bulk_create(
+            Attendance(employee=employee, date=DAY - datetime.timedelta(days=1), status='Late') for employee in employees[:30]
+        )
+
+    def pages(self, url):
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            yield response.data
+            url = response.data['next']
+
+    def test_pages_through_rows_that_share_a_date(self):
+        pages = list(self.pages('/api/attendance/?page_size=100'))
+        rows = [(row['date'], row['id']) for page in pages for row in page['results']]
+
+        self.assertEqual(len(pages), 13)
+        self.assertEqual(len(rows), 1230)
+        self.assertEqual(len(set(rows)), 1230)
+        self.assertEqual(rows, sorted(rows, reverse=True))
+
+    @override_settings(FAST_READ_SERIALIZERS=True)
+    def test_pages_values_rows_on_the_fast_path(self):
+        ids = [row['id'] for page in self.pages('/api/attendance/?page_size=500') for row in page['results']]
+        self.assertEqual(len(set(ids)), 1230)
+
+    def test_previous_link_returns_the_page_before(self):
+        pages = self.pages('/api/attendance/?page_size=100')
+        _, second, third = next(pages), next(pages), next(pages)
+        self.assertIsNotNone(third['previous'])
+
+        previous = self.client.get(third['previous']).data
+        self.assertEqual([row['id'] for row in previous['results']], [row['id'] for row in second['results']])
+        self.assertEqual(previous['next'].split('cursor=')[1], second['next'].split('cursor=')[1])
+
+    def test_deep_pages_use_no_offset(self):
+        pages = self.pages('/api/attendance/?page_size=100')
+        for _ in range(11):
+            page = next(pages)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(page['next'])
+        self.assertFalse(any('OFFSET' in query['sql'] for query in queries.captured_queries))
+
+    def test_nullable_ordering_field(self):
+        Employee.objects.filter(pk__in=Employee.objects.order_by('id').values('pk')[:150]).update(salary=None)
+        paginator = KeysetPagination()
+        paginator.ordering = ('salary', 'id')
+        ids, url = [], '/api/employees/?page_size=100'
+        while url:
+            page = paginator.paginate_queryset(Employee.objects.all(), Request(APIRequestFactory().get(url)))
+            ids += [employee.id for employee in page]
+            url = paginator.get_next_link()
+
+        self.assertEqual(len(ids), 1200)
+        self.assertEqual(len(set(ids)), 1200)
+        # NULLs first, then by salary.
+        self.assertEqual(ids[:150], sorted(ids[:150]))
+
+    def test_ordering_by_a_shared_value(self):
+        Employee.objects.filter(pk__in=Employee.objects.order_by('id').values('pk')[:100]).update(department='Sales')
+        for ordering in ('department', '-department', 'name', '-position'):
+            with self.subTest(ordering=ordering):
+                pages = list(self.pages(f'/api/employees/?ordering={ordering}&page_size=100'))
+                ids = [row['id'] for page in pages for row in page['results']]
+                self.assertEqual(len(ids), 1200)
+                self.assertEqual(len(set(ids)), 1200)
+
+    def test_ordering_without_id_gets_it_as_tiebreaker(self):
+        paginator = KeysetPagination()
+        paginator.ordering = ('-created_at',)
+        request = Request(APIRequestFactory().get('/'))
+        self.assertEqual(paginator.get_ordering(request, Employee.objects.all(), None), ['-created_at', '-id'])
+        paginator.ordering = ('name', 'id', 'department')
+        self.assertEqual(paginator.get_ordering(request, Employee.objects.all(), None), ['name', 'id'])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/attendance/?cursor=not-a-cursor').status_code, 404)
@@ -0,0 +1,59 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from employee import payroll
+from employee.models import Attendance, Employee, Payslip, SalaryHistory
+from employee.rollups import rebuild_attendance_rollups
+
+MONTH = datetime.date(2025, 1, 1)
+
+
+class PayrollTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hired = datetime.datetime(2024, 6, 1, tzinfo=datetime.timezone.utc)
+        cls.employee = Employee.objects.create(name='Ana Cruz', department='Sales', position='Analyst', salary=Decimal('24000.00'), created_at=hired)
+        # Raised after January, so January is paid at the old salary.
+        change = SalaryHistory.objects.create(employee=cls.employee, previous_salary=Decimal('22000.00'), new_salary=Decimal('24000.00'))
+        SalaryHistory.objects.filter(pk=change.pk).update(changed_at=datetime.datetime(2025, 2, 10, tzinfo=datetime.timezone.utc))
+        Attendance.objects.bulk_create([
+            Attendance(employee=cls.employee, date=datetime.date(2025, 1, 6), status='on leave'),
+            Attendance(employee=cls.employee, date=datetime.date(2025, 1, 7), status='Leave'),
+            Attendance(employee=cls.employee, date=datetime.date(2025, 1, 8), status='on leave'),
+            # Not approved yet: not deducted.
+            Attendance(employee=cls.employee, date=datetime.date(2025, 1, 9), status='leave'),
+            Attendance(employee=cls.employee, date=datetime.date(2025, 1, 10), status='Present', overtime_hours=2),
+        ])
+        rebuild_attendance_rollups()
+
+    def test_run_payroll(self):
+        payroll.run_payroll(MONTH)
+        payslip = Payslip.objects.get(employee=self.employee, month=MONTH)
+        self.assertEqual(payslip.base_pay, Decimal('22000.00'))
+        self.assertEqual(payslip.leave_days, 3)
+        # Two unpaid days at 22000 / 22 a day.
+        self.assertEqual(payslip.leave_deduction, Decimal('2000.00'))
+        # Two hours at 1000 / 8 an hour, times 1.25.
+        self.assertEqual(payslip.overtime_pay, Decimal('312.50'))
+        self.assertEqual(payslip.gross_pay, Decimal('20312.50'))
+
+    def test_halves_round_up(self):
+        # 353.76 / 22 / 8 * 1.25 * 2 hours = 5.025
+        for engine in (payroll.numpy, None):
+            with self.subTest(numpy=engine is not None), mock.patch.object(payroll, 'numpy', engine):
+                if engine is not None:
+                    period = (engine.array([1]), engine.array([35376]), engine.array([2.0]), engine.array([0]))
+                else:
+                    period = ([1], [35376], [2.0], [0])
+                columns = payroll.compute_pay(*period)
+                self.assertEqual(columns[3], [503])
+                self.assertEqual(columns[6], [35879])
+
+    def test_engines_agree(self):
+        period = payroll.load_period(MONTH)
+        with mock.patch.object(payroll, 'numpy', None):
+            fallback = payroll.compute_pay(*payroll.load_period(MONTH))
+        self.assertEqual(payroll.compute_pay(*period), fallback)
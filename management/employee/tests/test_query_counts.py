@@ -0,0 +1,79 @@
+from django.test import TestCase, override_settings, tag
+
+from employee.benchmarking import api_client, seed
+from employee.models import Attendance, PerformanceReview, SalaryHistory
+
+# Queries per action whatever the table size: the table versions behind the
+# ETag, then the page or the object, after the employee and the existence
+# checks of the per-employee actions.
+EXPECTED = {
+    'employees list': 2,
+    'employees detail': 2,
+    'employees archived': 2,
+    'salary list': 2,
+    'salary detail': 2,
+    'salary salary_history': 4,
+    'performance list': 2,
+    'performance detail': 2,
+    'performance performance_reviews': 3,
+    'performance top_performers': 2,
+    'attendance list': 2,
+    'attendance detail': 2,
+    'attendance employee_attendance': 4,
+    'attendance leave_history': 4,
+    'attendance overtime_hours': 3,
+}
+
+
+def endpoints(employee_id):
+    salary_id = SalaryHistory.objects.filter(employee_id=employee_id).values_list('id', flat=True).first()
+    review_id = PerformanceReview.objects.filter(employee_id=employee_id).values_list('id', flat=True).first()
+    attendance_id = Attendance.objects.filter(employee_id=employee_id).values_list('id', flat=True).first()
+    return [
+        ('employees list', '/api/employees/'),
+        ('employees detail', f'/api/employees/{employee_id}/'),
+        ('employees archived', '/api/employees/archived/'),
+        ('salary list', '/api/salary/'),
+        ('salary detail', f'/api/salary/{salary_id}/'),
+        ('salary salary_history', f'/api/salary/{employee_id}/salary_history/'),
+        ('performance list', '/api/performance/'),
+        ('performance detail', f'/api/performance/{review_id}/'),
+        ('performance performance_reviews', f'/api/performance/{employee_id}/performance_reviews/'),
+        ('performance top_performers', '/api/performance/top_performers/'),
+        ('attendance list', '/api/attendance/'),
+        ('attendance detail', f'/api/attendance/{attendance_id}/'),
+        ('attendance employee_attendance', f'/api/attendance/{employee_id}/employee_attendance/'),
+        ('attendance leave_history', f'/api/attendance/{employee_id}/leave_history/'),
+        ('attendance overtime_hours', f'/api/attendance/{employee_id}/overtime_hours/'),
+    ]
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False}, DATABASE_REPLICAS=[])
+class QueryCountTests(TestCase):
+    """
+    Every list and detail action issues a fixed number of queries, so
+    related rows are never fetched one by one. `rows` per table, spread
+    over rows / 100 employees.
+    """
+    rows = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        employees = max(1, cls.rows // 100)
+        cls.employee_id = seed(employees, max(1, cls.rows // employees))[0]
+
+    def test_query_counts(self):
+        client = api_client()
+        for name, url in endpoints(self.employee_id):
+            with self.subTest(name, rows=self.rows), self.assertNumQueries(EXPECTED[name]):
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, name)
+
+
+class ThousandRowQueryCountTests(QueryCountTests):
+    rows = 1000
+
+
+@tag('slow')
+class HundredThousandRowQueryCountTests(QueryCountTests):
+    rows = 100000
@@ -0,0 +1,202 @@
+import json
+import threading
+from unittest import mock, skipUnless
+
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from employee import leaderboard
+from employee.bulk import submit_reviews
+from employee.leaderboard import rebuild_leaderboard, record_review, refresh_leaderboard
+from employee.models import Employee, LeaderboardEntry, PerformanceReview
+from employee.tests.base import APITestCase
+
+
+class ReviewRatingTests(APITestCase):
+    def submit(self, rating):
+        return self.client.post(
+            f'/api/performance/{self.employee.pk}/submit_performance_review/', {'review': 'Fine.', 'rating': rating}, format='json'
+        )
+
+    def test_ratings_outside_the_scale_are_rejected(self):
+        for rating in (0, 11, 500, -3):
+            with self.subTest(rating=rating):
+                response = self.submit(rating)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {'rating': ['Enter a whole number from 1 to 10.']})
+        self.assertFalse(PerformanceReview.objects.exists())
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_ratings_on_the_scale_are_recorded(self):
+        for rating in (1, 10):
+            self.assertEqual(self.submit(rating).status_code, 201)
+        self.assertEqual(sorted(PerformanceReview.objects.values_list('rating', flat=True)), [1, 10])
+
+    def test_create_checks_the_scale_too(self):
+        response = self.client.post('/api/performance/', {'employee': self.employee.pk, 'review': 'Fine.', 'rating': 500}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('rating', response.data)
+
+
+class BulkSubmitTests(APITestCase):
+    url = '/api/performance/bulk_submit/'
+
+    def test_reviews_and_leaderboard_are_written(self):
+        other = Employee.objects.create(name='Ben Ong', department='Ops', position='Clerk')
+        reviews = [
+            {'employee_id': self.employee.pk, 'review': 'Fine.', 'rating': 6},
+            {'employee_id': str(other.pk), 'review': 'Great.', 'rating': '9'},
+            {'employee_id': self.employee.pk, 'review': 'Better.', 'rating': 8},
+        ]
+        response = self.client.post(self.url, {'reviews': reviews}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['errors']), (3, 0))
+        created = PerformanceReview.objects.order_by('pk')
+        self.assertEqual([result['review_id'] for result in response.data['results']], [review.pk for review in created])
+        self.assertEqual([(review.employee_id, review.rating) for review in created], [(self.employee.pk, 6), (other.pk, 9), (self.employee.pk, 8)])
+
+        entries = {entry.employee_id: entry for entry in LeaderboardEntry.objects.all()}
+        self.assertEqual((entries[self.employee.pk].review_count, entries[self.employee.pk].average_rating), (2, 7.0))
+        self.assertEqual((entries[other.pk].review_count, entries[other.pk].latest_rating), (1, 9))
+
+    def test_invalid_items_are_reported_and_skipped(self):
+        reviews = [
+            ['not', 'a', 'review'],
+            {'review': 'Fine.', 'rating': 5},
+            {'employee_id': 'ana', 'review': 'Fine.', 'rating': 5},
+            {'employee_id': self.employee.pk, 'review': '  ', 'rating': 5},
+            {'employee_id': self.employee.pk, 'review': 'Fine.', 'rating': 11},
+            {'employee_id': self.employee.pk, 'review': 'Fine.', 'rating': True},
+            {'employee_id': self.employee.pk + 1000, 'review': 'Fine.', 'rating': 5},
+            {'employee_id': self.employee.pk, 'review': 'Fine.', 'rating': 5},
+        ]
+        response = self.client.post(self.url, reviews, format='json')
+        self.assertEqual((response.data['created'], response.data['errors']), (1, 7))
+        self.assertEqual([result.get('error') for result in response.data['results']], [
+            'Each review must be an object.',
+            'employee_id is required.',
+            'employee_id must be an integer.',
+            'review is required.',
+            'rating must be a whole number from 1 to 10.',
+            'rating must be a whole number from 1 to 10.',
+            'Employee not found',
+            None,
+        ])
+        self.assertEqual(PerformanceReview.objects.get().pk, response.data['results'][-1]['review_id'])
+
+    def test_ndjson_body(self):
+        body = '\n'.join(json.dumps({'employee_id': self.employee.pk, 'review': 'Fine.', 'rating': rating}) for rating in (4, 7))
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.data['created'], 2)
+
+    def test_empty_batch_is_rejected(self):
+        for body in ({'reviews': []}, [], {'reviews': 'Fine.'}):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post(self.url, body, format='json').status_code, 400)
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        reviews = [{'employee_id': self.employee.pk, 'review': 'Fine.', 'rating': 1 + index % 10} for index in range(200)]
+        with CaptureQueriesContext(connection) as small:
+            submit_reviews(reviews[:2])
+        with CaptureQueriesContext(connection) as large:
+            submit_reviews(reviews)
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(LeaderboardEntry.objects.get().review_count, 202)
+
+    def test_batches_share_one_transaction(self):
+        reviews = [{'employee_id': self.employee.pk, 'review': 'Fine.', 'rating': 5}] * 5
+        with mock.patch('employee.bulk.refresh_leaderboard', side_effect=[None, None, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                submit_reviews(reviews, batch_size=2)
+        self.assertFalse(PerformanceReview.objects.exists())
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': True, 'BACKEND': 'employee.cache.LRUBackend'})
+class LeaderboardRebuildTests(APITestCase):
+    def test_rebuild_drops_cached_rankings(self):
+        PerformanceReview.objects.bulk_create([PerformanceReview(employee=self.employee, review='Fine.', rating=8)])
+        url = '/api/performance/top_performers/'
+        first = self.client.get(url)
+        self.assertEqual(first.data, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_leaderboard()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((response.status_code, response['X-Cache']), (200, 'MISS'))
+        self.assertEqual([row['employee_id'] for row in json.loads(response.content)], [self.employee.pk])
+
+
+class LeaderboardRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create(name='Ana Cruz', department='Sales', position='Analyst')
+
+    def test_entries_follow_the_reviews(self):
+        PerformanceReview.objects.bulk_create(PerformanceReview(employee=self.employee, review='Fine.', rating=rating) for rating in (6, 9))
+        refresh_leaderboard([self.employee.pk])
+        entry = LeaderboardEntry.objects.get()
+        self.assertEqual((entry.department, entry.review_count, entry.rating_total, entry.average_rating), ('Sales', 2, 15, 7.5))
+
+        PerformanceReview.objects.all().delete()
+        refresh_leaderboard([self.employee.pk])
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_no_placeholder_is_left_behind(self):
+        refresh_leaderboard([self.employee.pk, self.employee.pk + 1000])
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    @skipUnless(connection.features.has_select_for_update, 'needs SELECT ... FOR UPDATE')
+    def test_entries_are_locked_before_the_reviews_are_read(self):
+        PerformanceReview.objects.create(employee=self.employee, review='Fine.', rating=6)
+        with CaptureQueriesContext(connection) as queries:
+            refresh_leaderboard([self.employee.pk])
+        sql = [query['sql'] for query in queries.captured_queries]
+        lock = next(index for index, query in enumerate(sql) if 'FOR UPDATE' in query)
+        read = next(index for index, query in enumerate(sql) if 'employee_performancereview' in query)
+        self.assertLess(lock, read)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'needs concurrent transactions')
+class ConcurrentRefreshTests(TransactionTestCase):
+    def test_review_recorded_during_a_refresh_counts(self):
+        employee = Employee.objects.create(name='Ana Cruz', department='Sales', position='Analyst')
+        with transaction.atomic():
+            record_review(PerformanceReview.objects.create(employee=employee, review='Fine.', rating=4))
+        aggregated, release = threading.Event(), threading.Event()
+        entries = leaderboard._entries
+
+        def held_entries(*args, **kwargs):
+            rows = list(entries(*args, **kwargs))
+            aggregated.set()
+            release.wait(5)
+            return rows
+
+        def refresh():
+            try:
+                with mock.patch.object(leaderboard, '_entries', held_entries), transaction.atomic():
+                    refresh_leaderboard([employee.pk])
+            finally:
+                connections.close_all()
+
+        def review():
+            try:
+                with transaction.atomic():
+                    record_review(PerformanceReview.objects.create(employee=employee, review='Great.', rating=10))
+            finally:
+                connections.close_all()
+
+        first = threading.Thread(target=refresh)
+        first.start()
+        aggregated.wait(5)
+        second = threading.Thread(target=review)
+        second.start()
+        # The increment waits on the refresh's lock instead of being overwritten by it.
+        second.join(0.5)
+        self.assertTrue(second.is_alive())
+        release.set()
+        first.join()
+        second.join()
+
+        entry = LeaderboardEntry.objects.get(employee=employee)
+        self.assertEqual((entry.review_count, entry.rating_total), (2, 14))
@@ -0,0 +1,113 @@
+import datetime
+import json
+import threading
+from unittest import skipUnless
+
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from employee.models import Attendance, AttendanceRollup, Employee
+from employee.rollups import rebuild_attendance_rollups, refresh_attendance_rollups
+from employee.tests.base import APITestCase
+
+DAY = datetime.date(2025, 6, 2)
+MONTH = DAY.replace(day=1)
+
+
+class RefreshRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create(name='Ana Cruz', department='Sales', position='Analyst')
+
+    def refresh(self, *days):
+        refresh_attendance_rollups([(self.employee.pk, day) for day in days])
+
+    def test_refresh_follows_the_attendance(self):
+        Attendance.objects.create(employee=self.employee, date=DAY, status='Present', overtime_hours=1.5)
+        Attendance.objects.create(employee=self.employee, date=DAY + datetime.timedelta(days=1), status='on leave')
+        self.refresh(DAY, DAY + datetime.timedelta(days=1))
+        rollup = AttendanceRollup.objects.get(employee=self.employee, month=MONTH)
+        self.assertEqual((rollup.records, rollup.days_present, rollup.days_leave, rollup.overtime_hours), (2, 1, 1, 1.5))
+
+        Attendance.objects.filter(employee=self.employee).delete()
+        self.refresh(DAY)
+        self.assertFalse(AttendanceRollup.objects.exists())
+
+    def test_month_without_attendance_leaves_no_rollup(self):
+        self.refresh(DAY)
+        self.assertFalse(AttendanceRollup.objects.exists())
+
+    def test_batch_over_a_thousand_keys(self):
+        employees = Employee.objects.bulk_create(
+            Employee(name=f'Employee {i}', department='Sales', position='Analyst') for i in range(1100)
+        )
+        Attendance.objects.bulk_create(Attendance(employee=employee, date=DAY, status='Present') for employee in employees)
+        keys = [(employee.pk, DAY) for employee in employees]
+        refresh_attendance_rollups(keys)
+        self.assertEqual(AttendanceRollup.objects.filter(month=MONTH, records=1).count(), 1100)
+
+        # Emptied months are deleted, the rest of the locked range is kept.
+        earlier = DAY - datetime.timedelta(days=40)
+        Attendance.objects.create(employee=employees[0], date=earlier, status='Present')
+        refresh_attendance_rollups([(employees[0].pk, earlier)])
+        Attendance.objects.filter(date=DAY).delete()
+        refresh_attendance_rollups(keys + [(employees[0].pk, earlier)])
+        self.assertEqual(list(AttendanceRollup.objects.values_list('employee_id', 'month')), [(employees[0].pk, earlier.replace(day=1))])
+
+    @skipUnless(connection.features.has_select_for_update, 'needs SELECT ... FOR UPDATE')
+    def test_rollups_are_locked_before_the_month_is_read(self):
+        Attendance.objects.create(employee=self.employee, date=DAY, status='Present')
+        with CaptureQueriesContext(connection) as queries:
+            self.refresh(DAY)
+        sql = [query['sql'] for query in queries.captured_queries]
+        lock = next(index for index, query in enumerate(sql) if 'FOR UPDATE' in query)
+        read = next(index for index, query in enumerate(sql) if 'employee_attendance' in query)
+        self.assertLess(lock, read)
+
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': True, 'BACKEND': 'employee.cache.LRUBackend'})
+class RebuildRollupTests(APITestCase):
+    def test_rebuild_drops_cached_overtime(self):
+        Attendance.objects.bulk_create([Attendance(employee=self.employee, date=DAY, status='Present', overtime_hours=2)])
+        url = '/api/attendance/overtime_summary/'
+        first = self.client.get(url)
+        self.assertEqual(first.data, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_attendance_rollups()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((response.status_code, response['X-Cache']), (200, 'MISS'))
+        self.assertEqual(json.loads(response.content)[0]['overtime_hours'], 2)
+
+@skipUnless(connection.vendor == 'postgresql', 'needs concurrent transactions')
+class ConcurrentRefreshTests(TransactionTestCase):
+    def test_concurrent_writers_both_count(self):
+        employee = Employee.objects.create(name='Ana Cruz', department='Sales', position='Analyst')
+        refreshed, release = threading.Event(), threading.Event()
+
+        def write(day, hold):
+            try:
+                with transaction.atomic():
+                    Attendance.objects.create(employee=employee, date=day, status='Present')
+                    refresh_attendance_rollups([(employee.pk, day)])
+                    if hold:
+                        refreshed.set()
+                        release.wait(5)
+            finally:
+                connections.close_all()
+
+        first = threading.Thread(target=write, args=(DAY, True))
+        first.start()
+        refreshed.wait(5)
+        second = threading.Thread(target=write, args=(DAY + datetime.timedelta(days=1), False))
+        second.start()
+        # The second writer waits on the first one's rollup lock.
+        second.join(0.5)
+        self.assertTrue(second.is_alive())
+        release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(AttendanceRollup.objects.get(employee=employee, month=MONTH).records, 2)
@@ -0,0 +1,164 @@
+import contextvars
+import time
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from employee.models import Employee
+from employee.routers import _pinned, PIN_COOKIE, PrimaryReplicaRouter, ReadYourWritesMiddleware, pin_to_primary, pinned_to_primary
+
+REPLICA = 'replica_test'
+
+
+@skipUnless(connections['default'].vendor == 'sqlite', 'needs SQLite')
+@override_settings(DATABASE_REPLICAS=[REPLICA], RESPONSE_CACHE={'ENABLED': False}, REPLICA_PIN_SECONDS=5)
+class PrimaryReplicaTests(TransactionTestCase):
+    """
+    The test database is the primary; a second SQLite database is the replica.
+    Nothing replicates between them, so a row shows up only in the database
+    it was written to, and each read shows where it was routed.
+    """
+    # The replica joins in setUpClass: the alias only exists while this
+    # class runs, so the test runner neither checks nor creates it.
+    databases = {'default'}
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[REPLICA] = {
+            **connections['default'].settings_dict,
+            'NAME': ':memory:',
+            'TEST': {**connections['default'].settings_dict['TEST'], 'NAME': None, 'MIRROR': None},
+        }
+        cls.addClassCleanup(cls.remove_replica)
+        connections[REPLICA].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica(cls):
+        connections[REPLICA].creation.destroy_test_db(':memory:', verbosity=0)
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        # Outside a request a write pins the rest of the context to the
+        # primary, so each test starts unpinned and leaves it as it was.
+        self.addCleanup(_pinned.reset, _pinned.set(False))
+        contextvars.copy_context().run(self.create_rows)
+
+    def create_rows(self):
+        Employee.objects.using('default').create(name='On the primary', department='Sales', position='Analyst')
+        Employee.objects.using(REPLICA).create(name='On the replica', department='Sales', position='Analyst')
+
+    def names(self):
+        return list(Employee.objects.values_list('name', flat=True))
+
+    def test_reads_go_to_the_replica(self):
+        self.assertEqual(self.router.db_for_read(Employee), REPLICA)
+        self.assertEqual(self.names(), ['On the replica'])
+
+    def test_writes_go_to_the_primary(self):
+        self.assertEqual(self.router.db_for_write(Employee), 'default')
+        Employee.objects.create(name='Written', department='Sales', position='Analyst')
+        self.assertTrue(Employee.objects.using('default').filter(name='Written').exists())
+        self.assertFalse(Employee.objects.using(REPLICA).filter(name='Written').exists())
+
+    def test_reads_inside_a_transaction_stay_on_the_primary(self):
+        with transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Employee), 'default')
+            self.assertEqual(self.names(), ['On the primary'])
+
+    def test_pinned_reads_stay_on_the_primary(self):
+        def pinned_names():
+            pin_to_primary()
+            return self.names()
+
+        # The pin lives in a contextvar, so run it in a copy of the context.
+        self.assertEqual(contextvars.copy_context().run(pinned_names), ['On the primary'])
+        self.assertFalse(pinned_to_primary())
+        self.assertEqual(self.names(), ['On the replica'])
+
+    def test_other_apps_are_left_to_the_default_routing(self):
+        self.assertIsNone(self.router.db_for_read(ContentType))
+        self.assertIsNone(self.router.db_for_write(ContentType))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Employee), 'default')
+
+    def test_a_client_reads_its_own_writes(self):
+        user = get_user_model().objects.create_user(username='writer', password='writer-password')
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.post('/api/employees/', {'name': 'New Hire', 'department': 'Sales', 'position': 'Analyst', 'salary': '30000.00'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        # The client sends the pin cookie back, so its next read sees the new row ...
+        self.assertEqual(client.get(f'/api/employees/{response.data["id"]}/').status_code, 200)
+        # ... while a client without it reads the replica, which hasn't got it.
+        client.cookies.clear()
+        self.assertEqual(client.get(f'/api/employees/{response.data["id"]}/').status_code, 404)
+
+
+@override_settings(REPLICA_PIN_SECONDS=5)
+class ReadYourWritesMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(_pinned.reset, _pinned.set(False))
+        self.factory = RequestFactory()
+        self.seen = []
+
+        def view(request):
+            self.seen.append(pinned_to_primary())
+            return HttpResponse()
+
+        self.middleware = ReadYourWritesMiddleware(view)
+
+    def test_safe_requests_are_not_pinned(self):
+        response = self.middleware(self.factory.get('/'))
+        self.assertEqual(self.seen, [False])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_writes_are_pinned_and_set_the_cookie(self):
+        before = time.time()
+        response = self.middleware(self.factory.post('/'))
+        self.assertEqual(self.seen, [True])
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 5)
+        self.assertTrue(cookie['httponly'])
+        self.assertAlmostEqual(float(cookie.value), before + 5, delta=1)
+
+    def test_cookie_pins_reads_until_it_expires(self):
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = str(time.time() + 5)
+        self.middleware(request)
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = str(time.time() - 1)
+        self.middleware(request)
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = 'garbage'
+        self.middleware(request)
+        self.assertEqual(self.seen, [True, False, False])
+
+    def test_pin_ends_with_the_request(self):
+        self.middleware(self.factory.post('/'))
+        self.assertFalse(pinned_to_primary())
+
+    def test_async_requests(self):
+        async def view(request):
+            self.seen.append(pinned_to_primary())
+            return HttpResponse()
+
+        middleware = ReadYourWritesMiddleware(view)
+        async_to_sync(middleware)(self.factory.get('/'))
+        async_to_sync(middleware)(self.factory.post('/'))
+        self.assertEqual(self.seen, [False, True])
+        self.assertFalse(pinned_to_primary())
@@ -0,0 +1,112 @@
+import datetime
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from employee.models import Employee, PayrollSnapshot, SalaryHistory
+from employee.salaries import _department_totals, snapshot_payroll
+from employee.tests.base import APITestCase
+
+MONTH = datetime.date(2025, 1, 1)
+
+
+def moment(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(12)))
+
+
+class PayrollTests(APITestCase):
+    employee_fields = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        hired = moment(datetime.date(2024, 6, 1))
+        cls.staying = Employee.objects.create(name='Staying', department='Sales', position='Analyst', salary=Decimal('30000.00'), created_at=hired)
+        # Left after January: still on January's payroll.
+        cls.left = Employee.objects.create(
+            name='Left', department='Sales', position='Analyst', salary=Decimal('25000.50'),
+            created_at=hired, archived=True, archived_at=moment(datetime.date(2025, 3, 1)),
+        )
+        # Left before January, and joined after it: on neither.
+        Employee.objects.create(
+            name='Gone', department='Sales', position='Analyst', salary=Decimal('40000.00'),
+            created_at=hired, archived=True, archived_at=moment(datetime.date(2024, 12, 1)),
+        )
+        Employee.objects.create(name='New', department='Sales', position='Analyst', salary=Decimal('50000.00'))
+        SalaryHistory.objects.filter(employee=cls.staying).delete()
+        change = SalaryHistory.objects.create(employee=cls.staying, previous_salary=Decimal('28000.00'), new_salary=Decimal('30000.00'))
+        SalaryHistory.objects.filter(pk=change.pk).update(changed_at=moment(datetime.date(2025, 2, 10)))
+
+    def test_past_month_counts_who_was_employed_then(self):
+        response = self.client.get('/api/salary/payroll/?start=2025-01&end=2025-01')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{
+            'month': '2025-01',
+            'headcount': 2,
+            'total_salary': '₱53,000.50',
+            'departments': {'Sales': {'headcount': 2, 'total_salary': '₱53,000.50'}},
+        }])
+        self.assertFalse(PayrollSnapshot.objects.exists())
+
+    def test_stored_snapshots_are_served(self):
+        out = StringIO()
+        call_command('snapshot_payroll', start='2025-01', stdout=out)
+        self.assertEqual(out.getvalue(), '2025-01: 1 departments, total 53,000.50\n')
+        PayrollSnapshot.objects.filter(month=MONTH).update(headcount=7)
+        response = self.client.get('/api/salary/payroll/?start=2025-01&end=2025-01')
+        self.assertEqual(response.data[0]['headcount'], 7)
+
+    @override_settings(RESPONSE_CACHE={'ENABLED': True, 'BACKEND': 'employee.cache.LRUBackend'})
+    def test_replacing_a_snapshot_drops_cached_payroll(self):
+        url = '/api/salary/payroll/?start=2025-01&end=2025-01'
+        snapshot_payroll(MONTH)
+        PayrollSnapshot.objects.filter(month=MONTH).update(headcount=7)
+        first = self.client.get(url)
+        self.assertEqual(json.loads(first.content)[0]['headcount'], 7)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            snapshot_payroll(MONTH, replace=True)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((response.status_code, response['X-Cache']), (200, 'MISS'))
+        self.assertEqual(json.loads(response.content)[0]['headcount'], 2)
+
+    def test_running_month_is_live(self):
+        this_month = timezone.localdate().replace(day=1)
+        response = self.client.get('/api/salary/payroll/', {'start': f'{this_month:%Y-%m}', 'end': f'{this_month.year + 1}-{this_month:%m}'})
+        self.assertEqual([row['month'] for row in response.data], [f'{this_month:%Y-%m}'])
+        self.assertEqual(response.data[0]['headcount'], 2)
+        self.assertFalse(PayrollSnapshot.objects.exists())
+        with self.assertRaisesMessage(ValueError, 'has not finished yet'):
+            snapshot_payroll(this_month)
+
+    def test_as_of_formats_salaries(self):
+        response = self.client.get('/api/salary/as_of/?date=2025-01-31')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row['employee_name'], row['salary']) for row in response.data['results']],
+            [('Staying', '₱28,000.00'), ('Left', '₱25,000.50')],
+        )
+
+    def test_concurrent_first_snapshot(self):
+        def racing(month):
+            # Another request stores the month between our check and insert.
+            PayrollSnapshot.objects.bulk_create(_department_totals(month))
+            return _department_totals(month)
+
+        with mock.patch('employee.salaries._department_totals', side_effect=racing):
+            snapshots = snapshot_payroll(MONTH)
+        self.assertEqual([(s.department, s.headcount, s.total_salary) for s in snapshots], [('Sales', 2, Decimal('53000.50'))])
+        self.assertEqual(PayrollSnapshot.objects.filter(month=MONTH).count(), 1)
+
+    def test_as_of_pages_by_employee_whatever_the_ordering(self):
+        for ordering in ('-changed_at', 'name', '-id'):
+            with self.subTest(ordering=ordering):
+                response = self.client.get('/api/salary/as_of/', {'date': '2025-01-31', 'ordering': ordering, 'page_size': 1})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([row['employee_name'] for row in response.data['results']], ['Staying'])
+                self.assertIsNotNone(response.data['next'])
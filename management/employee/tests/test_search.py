@@ -0,0 +1,108 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from employee import search
+from employee.models import Employee
+from employee.search import InProcessSearch, SQLiteSearch, rebuild_search_index, search_employees, tokenize
+from employee.tests.base import APITestCase
+
+PEOPLE = [
+    ('José Álvarez', 'Engineering', 'Backend Developer'),
+    ('Maria Santos', 'Engineering', 'Frontend Developer'),
+    ('Mario Reyes', 'Sales', 'Account Manager'),
+    ('Marianne Lim', 'Finance', 'Accountant'),
+]
+
+
+class SearchBackendTests:
+    """Runs against the backend named by `backend`, through the API and directly."""
+
+    employee_fields = None
+    backend = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.people = {
+            name: Employee.objects.create(name=name, department=department, position=position)
+            for name, department, position in PEOPLE
+        }
+
+    def setUp(self):
+        super().setUp()
+        settings = override_settings(EMPLOYEE_SEARCH_BACKEND=f'{self.backend.__module__}.{self.backend.__qualname__}')
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.assertIsInstance(search.get_backend(), self.backend)
+
+    def names(self, query, mode='prefix', limit=20):
+        return [self.by_id[pk] for pk in search_employees(query, mode, limit)]
+
+    @property
+    def by_id(self):
+        return {employee.pk: name for name, employee in self.people.items()}
+
+    def test_prefix(self):
+        self.assertEqual(self.names('mari'), ['Maria Santos', 'Mario Reyes', 'Marianne Lim'])
+        self.assertEqual(self.names('mari eng'), ['Maria Santos'])
+        self.assertEqual(self.names('acc'), ['Mario Reyes', 'Marianne Lim'])
+
+    def test_fulltext_matches_whole_words(self):
+        self.assertEqual(self.names('developer', 'fulltext'), ['José Álvarez', 'Maria Santos'])
+        self.assertEqual(self.names('develop', 'fulltext'), [])
+
+    def test_accents_are_ignored(self):
+        self.assertEqual(self.names('jose alvarez', 'fulltext'), ['José Álvarez'])
+        self.assertEqual(self.names('Álv'), ['José Álvarez'])
+
+    def test_fuzzy_tolerates_typos(self):
+        self.assertEqual(self.names('santso', 'fuzzy'), ['Maria Santos'])
+        self.assertEqual(self.names('enginering develper', 'fuzzy'), ['José Álvarez', 'Maria Santos'])
+
+    def test_limit_keeps_id_order(self):
+        self.assertEqual(self.names('mari', limit=2), ['Maria Santos', 'Mario Reyes'])
+
+    def test_archived_and_renamed_employees(self):
+        maria, mario = self.people['Maria Santos'], self.people['Mario Reyes']
+        with self.captureOnCommitCallbacks(execute=True):
+            maria.name = 'Maria Cortez'
+            maria.save()
+            mario.archived = True
+            mario.save()
+        self.assertEqual(self.names('cortez'), ['Maria Santos'])
+        self.assertEqual(self.names('mari'), ['Maria Santos', 'Marianne Lim'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.people['Marianne Lim'].delete()
+        self.assertEqual(self.names('mari'), ['Maria Santos'])
+
+    def test_rebuild(self):
+        self.assertEqual(rebuild_search_index(), len(PEOPLE))
+        self.assertEqual(self.names('mari'), ['Maria Santos', 'Mario Reyes', 'Marianne Lim'])
+
+    def test_endpoint(self):
+        response = self.client.get('/api/employees/search/', {'q': 'santso', 'mode': 'fuzzy'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['name'] for row in response.data], ['Maria Santos'])
+
+        for params, field in (({}, 'q'), ({'q': 'ana', 'mode': 'regex'}, 'mode'), ({'q': 'ana', 'limit': 'all'}, 'limit')):
+            with self.subTest(params=params):
+                response = self.client.get('/api/employees/search/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 search runs on SQLite')
+class SQLiteSearchTests(SearchBackendTests, APITestCase):
+    backend = SQLiteSearch
+
+
+class InProcessSearchTests(SearchBackendTests, APITestCase):
+    backend = InProcessSearch
+
+
+class TokenizeTests(SimpleTestCase):
+    def test_words_are_folded(self):
+        self.assertEqual(tokenize('José  ÁLVAREZ-Núñez, 2nd'), ['jose', 'alvarez', 'nunez', '2nd'])
@@ -0,0 +1,151 @@
+import datetime
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+
+from employee.cache import models_changed
+from employee.models import Attendance, Employee, TableVersion
+from employee.tests.base import APITestCase
+from employee.versions import SLOTS, bump_table_versions, table_versions
+
+TABLE = Employee._meta.label_lower
+
+
+class ConditionalRequestTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/employees/{self.employee.pk}/'
+
+    def changed_at(self, when):
+        TableVersion.objects.filter(table=TABLE).update(updated_at=when)
+
+    def rename(self, name):
+        Employee.objects.filter(pk=self.employee.pk).update(name=name)
+        bump_table_versions(Employee)
+
+    def test_if_modified_since_after_the_second_is_over(self):
+        earlier = timezone.now() - datetime.timedelta(seconds=10)
+        self.changed_at(earlier)
+        response = self.client.get(self.url)
+        self.assertEqual(response['Last-Modified'], http_date(int(earlier.timestamp()) + 1))
+
+        since = response['Last-Modified']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since).status_code, 304)
+        self.rename('Ana Reyes')
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['name'], 'Ana Reyes')
+
+    def test_change_within_the_same_second(self):
+        now = timezone.now().replace(microsecond=100000)
+        self.changed_at(now)
+        with mock.patch('employee.versions.time') as clock:
+            clock.time.return_value = now.timestamp() + 0.1
+            first = self.client.get(self.url)
+            self.assertNotIn('Last-Modified', first)
+
+            # Another write in the same second; a date from that second
+            # must not get a 304.
+            self.rename('Ana Reyes')
+            self.changed_at(now + datetime.timedelta(milliseconds=500))
+            clock.time.return_value = now.timestamp() + 0.6
+            response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(int(now.timestamp())))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['name'], 'Ana Reyes')
+
+    def test_etag_is_compared_first(self):
+        self.changed_at(timezone.now() - datetime.timedelta(seconds=10))
+        response = self.client.get(self.url)
+        etag, since = response['ETag'], response['Last-Modified']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.rename('Ana Reyes')
+        self.changed_at(timezone.now() - datetime.timedelta(seconds=10))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class TableVersionTests(TestCase):
+    def test_writes_are_spread_over_slots(self):
+        TableVersion.objects.all().delete()
+        versions = []
+        for _ in range(100):
+            bump_table_versions(Employee)
+            versions.append(table_versions(Employee)[TABLE][0])
+
+        self.assertEqual(versions, list(range(1, 101)))
+        slots = set(TableVersion.objects.filter(table=TABLE).values_list('slot', flat=True))
+        self.assertGreater(len(slots), 1)
+        self.assertLessEqual(max(slots), SLOTS - 1)
+
+    def test_last_change_is_the_latest_slot(self):
+        TableVersion.objects.all().delete()
+        earlier = timezone.now() - datetime.timedelta(hours=1)
+        TableVersion.objects.create(table=TABLE, slot=0, version=5, updated_at=earlier)
+        TableVersion.objects.create(table=TABLE, slot=1, version=2, updated_at=earlier - datetime.timedelta(hours=1))
+        self.assertEqual(table_versions(Employee), {TABLE: (7, earlier)})
+
+
+class ModelsChangedTests(TestCase):
+    def version(self, model=Employee):
+        return table_versions(model).get(model._meta.label_lower, (0,))[0]
+
+    def create(self, name):
+        return Employee.objects.create(name=name, department='Sales', position='Analyst')
+
+    def test_once_per_transaction(self):
+        before = self.version()
+        with mock.patch('employee.cache.invalidate') as invalidate:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks, transaction.atomic():
+                for i in range(5):
+                    self.create(f'Employee {i}')
+                models_changed(Employee, Attendance)
+        self.assertEqual(self.version(), before + 1)
+        self.assertEqual(self.version(Attendance), 1)
+        self.assertEqual(len(callbacks), 1)
+        invalidate.assert_called_once()
+        self.assertEqual(set(invalidate.call_args.args), {Employee, Attendance})
+
+    def test_rolled_back_savepoint_bumps_again(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks() as callbacks, transaction.atomic():
+            try:
+                with transaction.atomic():
+                    self.create('Rolled back')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.assertEqual(self.version(), before)
+            self.create('Kept')
+            self.create('Kept too')
+        self.assertEqual(self.version(), before + 1)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_inner_savepoint_keeps_its_own_callback(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks() as callbacks, transaction.atomic():
+            self.create('Outer')
+            try:
+                with transaction.atomic():
+                    models_changed(Attendance)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            models_changed(Attendance)
+        self.assertEqual((self.version(), self.version(Attendance)), (before + 1, 1))
+        self.assertEqual([func.models for func in callbacks], [{Employee, Attendance}])
+
+    def test_outer_savepoints_bump_again_inside(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks() as callbacks, transaction.atomic():
+            self.create('Outer')
+            with transaction.atomic():
+                self.create('Inner')
+                self.create('Inner too')
+            self.create('Outer again')
+        self.assertEqual(self.version(), before + 2)
+        self.assertEqual(len(callbacks), 2)
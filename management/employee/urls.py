@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EmployeeViewSet, SalaryViewSet, PerformanceViewSet, AttendanceViewSet, AuthViewSet
+from .views import EmployeeViewSet, SalaryViewSet, PerformanceViewSet, AttendanceViewSet, AuthViewSet, AnalyticsViewSet, JobViewSet
+from . import async_views
 
 router = DefaultRouter()
 router.register('auth', AuthViewSet, basename='auth')
@@ -8,7 +9,12 @@ router.register(r'employees', EmployeeViewSet, basename='employees')
 router.register(r'salary', SalaryViewSet, basename='salary')
 router.register(r'performance', PerformanceViewSet, basename='performance')
 router.register(r'attendance', AttendanceViewSet, basename='attendance')
+router.register('analytics', AnalyticsViewSet, basename='analytics')
+router.register('jobs', JobViewSet, basename='jobs')
 
 urlpatterns = [
+    path('async/attendance/<int:pk>/employee_attendance/', async_views.employee_attendance, name='async-attendance-employee-attendance'),
+    path('async/attendance/<int:pk>/check_in/', async_views.check_in, name='async-attendance-check-in'),
+    path('async/attendance/<int:pk>/check_out/', async_views.check_out, name='async-attendance-check-out'),
     path('', include(router.urls)),
 ]
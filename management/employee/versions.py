@@ -0,0 +1,75 @@
+import hashlib
+import random
+import time
+
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import TableVersion
+
+# Rows each table's version is striped over. A write bumps one at random, so
+# concurrent writers to the same table mostly lock different rows. Migration
+# 0017 creates them for the tracked tables; others get theirs on first use.
+SLOTS = 16
+
+
+def bump_table_versions(*models):
+    """
+    Advance the version of each model's table. Runs inside the caller's
+    transaction, so the bump commits or rolls back with the data it describes.
+    """
+    tables = [model._meta.label_lower for model in models]
+    slot = random.randrange(SLOTS)
+    changed_at = timezone.now()
+    updated = TableVersion.objects.filter(table__in=tables, slot=slot).update(version=F('version') + 1, updated_at=changed_at)
+    if updated < len(tables):
+        for table in tables:
+            TableVersion.objects.get_or_create(table=table, slot=slot, defaults={'version': 1, 'updated_at': changed_at})
+
+
+def table_versions(*models):
+    """{table: (version, last change)} for each model's table that has been written to."""
+    tables = [model._meta.label_lower for model in models]
+    rows = (
+        TableVersion.objects.filter(table__in=tables)
+        .values('table').annotate(total=Sum('version'), latest=Max('updated_at')).order_by()
+    )
+    return {row['table']: (row['total'], row['latest']) for row in rows}
+
+
+def conditional(request, models, produce):
+    """
+    Answer If-None-Match / If-Modified-Since from the version rows of `models`
+    (one indexed lookup) before `produce()` runs the real query.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return produce()
+
+    tables = sorted(model._meta.label_lower for model in models)
+    versions = table_versions(*models)
+    query = '&'.join(f'{key}={value}' for key, value in sorted(request.GET.lists()))
+    user = getattr(request.user, 'pk', None)
+    raw = f'{request.path}?{query}|user={user}|' + ','.join(f'{table}={versions.get(table, (0,))[0]}' for table in tables)
+    etag = 'W/"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+
+    # HTTP dates only have whole seconds, so a second change within the same
+    # second would leave Last-Modified unchanged and If-Modified-Since would
+    # answer 304 with the old body. Last-Modified is the second after the
+    # last change, and only used once that second is over.
+    timestamp = None
+    if versions:
+        timestamp = int(max(latest for _, latest in versions.values()).timestamp()) + 1
+        if timestamp > time.time():
+            timestamp = None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = produce()
+        if response.status_code != 200:
+            return response
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    return response
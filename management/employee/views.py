@@ -1,18 +1,60 @@
+import datetime
+
+from django.http import FileResponse
 from django.shortcuts import render, get_object_or_404
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import Employee, SalaryHistory, PerformanceReview, Attendance
-from .serializers import EmployeeSerializer, SalaryHistorySerializer, PerformanceReviewSerializer, AttendanceSerializer, RegisterSerializer, LoginSerializer, UserSerializer
+from rest_framework.parsers import JSONParser
+from rest_framework.reverse import reverse
+from .models import Employee, SalaryHistory, PerformanceReview, Attendance, AttendanceRollup, LeaderboardEntry, PayrollSnapshot, Job, RATINGS
+from .serializers import EmployeeSerializer, SalaryHistorySerializer, PerformanceReviewSerializer, AttendanceSerializer, RegisterSerializer, LoginSerializer, UserSerializer, JobSerializer
+from .pagination import EmployeePagination, SalaryHistoryPagination, PerformanceReviewPagination, AttendancePagination, JobPagination
+from .planning import PlannedQuerysetMixin
+from .filters import SparseFieldsetMixin
+from . import filters
+from .fastpath import FastListMixin
+from .cache import CachedReadMixin, cache_response, models_changed
+from .parsers import NDJSONParser
+from .bulk import ingest_attendance, record_check_in, record_check_out, bulk_adjust_salaries, submit_reviews, salary_adjustment_size, adjustment_summary
+from .rollups import refresh_attendance_rollups
+from .search import search_employees, MODES as SEARCH_MODES
+from .exports import export_queryset, export_options, EMPLOYEE_COLUMNS, SALARY_HISTORY_COLUMNS, ATTENDANCE_COLUMNS
+from .jobs import enqueue, inline_limit, export_dir, EXPORTS
 from django.utils.timezone import now
+from django.db import IntegrityError, transaction
 from django.db.models import Sum
 from django.contrib.auth import authenticate, login, logout, get_user_model
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.contrib.auth.models import update_last_login
-from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import tokens_for, revoke_tokens
+from .logins import record_login
+from .analytics import department_analytics
+from .leaderboard import record_review, refresh_leaderboard, top_performers
+from .salaries import employed_at, salaries_as_of, payroll_totals
 
 User = get_user_model()
 
+
+def _accepted(request, job):
+    url = reverse('jobs-detail', args=[job.pk], request=request)
+    return Response({"job": job.pk, "status": job.status, "url": url}, status=status.HTTP_202_ACCEPTED, headers={'Location': url})
+
+
+def _queue_export(request, target):
+    """With ?background=true, run the export as a job and return the 202; otherwise None."""
+    try:
+        background = filters.boolean(request.query_params.get('background', 'false'))
+    except ValueError as error:
+        return Response({"background": [str(error)]}, status=status.HTTP_400_BAD_REQUEST)
+    if not background:
+        return None
+    options, errors = export_options(request.query_params, dated=EXPORTS[target][3] is not None)
+    if errors:
+        return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+    params = {param: request.query_params.get(param) for param in ('department', 'start', 'end')}
+    return _accepted(request, enqueue('export', {'target': target, 'output': options['output'], **params}, request.user))
+
+
 class AuthViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
 
@@ -30,8 +72,8 @@ class AuthViewSet(viewsets.ViewSet):
         if serializer.is_valid():
             user = authenticate(username=serializer.validated_data['username'], password=serializer.validated_data['password'])
             if user:
-                refresh = RefreshToken.for_user(user)
-                update_last_login(None, user)
+                refresh = tokens_for(user)
+                record_login(user)
                 return Response({
                     'access': str(refresh.access_token),
                     'refresh': str(refresh),
@@ -40,13 +82,37 @@ class AuthViewSet(viewsets.ViewSet):
             return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def logout(self, request):
+        revoke_tokens(User.objects.get(pk=request.user.pk))
+        return Response({"message": "Logged out"}, status=status.HTTP_200_OK)
+
+class EmployeeViewSet(CachedReadMixin, FastListMixin, PlannedQuerysetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = EmployeePagination
+    cache_models = (Employee,)
+    filter_params = {
+        'department': ('department', str),
+        'position': ('position', str),
+        'active': ('active', filters.boolean),
+        'archived': ('archived', filters.boolean),
+        'salary_min': ('salary__gte', filters.decimal),
+        'salary_max': ('salary__lte', filters.decimal),
+    }
+    ordering_fields = ('id', 'name', 'department', 'position', 'salary')
 
     def get_queryset(self):
+        if self.action == 'list' and 'archived' in self.request.query_params:
+            return Employee.objects.all()
         return Employee.objects.filter(archived=False)
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            # The delete cascades to the employee's history.
+            models_changed(Employee, SalaryHistory, PerformanceReview, Attendance)
+
     @action(detail=True, methods=['patch'])
     def request_department_transfer(self, request, pk=None):
         employee = self.get_object()
@@ -88,6 +154,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     def archive(self, request, pk=None):
         employee = self.get_object()
         employee.archived = True
+        employee.archived_at = now()
         employee.save()
         return Response({"message": f"{employee.name} archived"})
 
@@ -98,29 +165,74 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
         if employee.archived:
             employee.archived = False
+            employee.archived_at = None
             employee.save()
             return Response({"message": f"{employee.name} unarchived successfully"}, status=status.HTTP_200_OK)
         
         return Response({"error": f"{employee.name} is not archived"}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=['get'])
+    @cache_response()
     def archived(self, request):
-        archived_employees = Employee.objects.filter(archived=True)
-        serializer = self.get_serializer(archived_employees, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        archived_employees = self.plan_queryset(Employee.objects.filter(archived=True))
+        page = self.paginate_queryset(archived_employees)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        queued = _queue_export(request, 'employees')
+        if queued is not None:
+            return queued
+        return export_queryset(request, self.get_queryset(), EMPLOYEE_COLUMNS, 'employees', department_field='department')
 
-class SalaryViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    @cache_response()
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"q": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        mode = request.query_params.get('mode', 'prefix')
+        if mode not in SEARCH_MODES:
+            return Response({"mode": [f"Choose one of: {', '.join(SEARCH_MODES)}."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({"limit": ["Enter a whole number."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = search_employees(query, mode, limit)
+        employees = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer([employees[pk] for pk in ids if pk in employees], many=True)
+        return Response(serializer.data)
+
+class SalaryViewSet(CachedReadMixin, FastListMixin, PlannedQuerysetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = SalaryHistorySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = SalaryHistoryPagination
+    cache_models = (SalaryHistory, Employee)
+    filter_params = {
+        'employee': ('employee_id', filters.integer),
+        'start': ('changed_at__gte', filters.day_start),
+        'end': ('changed_at__lt', filters.next_day_start),
+    }
+    ordering_fields = ('changed_at', 'id')
 
     def get_queryset(self):
         return SalaryHistory.objects.filter(employee__archived=False)
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            models_changed(SalaryHistory)
+
     @action(detail=True, methods=['get'])
+    @cache_response()
     def salary_history(self, request, pk=None):
         try:
             employee = Employee.objects.get(pk=pk)
-            salary_history = SalaryHistory.objects.filter(employee=employee)
+            salary_history = self.plan_queryset(SalaryHistory.objects.filter(employee=employee).order_by('-changed_at', '-id'))
 
             if not salary_history.exists():
                 return Response({"message": f"{employee.name} has no salary changes yet."}, status=status.HTTP_200_OK)
@@ -133,19 +245,20 @@ class SalaryViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['patch'])
     def adjust_salary(self, request, pk=None):
-        employee = Employee.objects.get(pk=pk)
         new_salary = request.data.get('new_salary')
         
         if new_salary:
-            salary_record = SalaryHistory.objects.create(
-                employee=employee,
-                previous_salary=employee.salary,
-                new_salary=new_salary
-            )
-            serializer = SalaryHistorySerializer(salary_record)
-            
-            employee.salary = new_salary
-            employee.save()
+            with transaction.atomic():
+                employee = Employee.objects.select_for_update().get(pk=pk)
+                salary_record = SalaryHistory.objects.create(
+                    employee=employee,
+                    previous_salary=employee.salary,
+                    new_salary=new_salary
+                )
+                serializer = SalaryHistorySerializer(salary_record)
+
+                employee.salary = new_salary
+                employee.save()
             
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
@@ -155,19 +268,111 @@ class SalaryViewSet(viewsets.ModelViewSet):
                             ]
                         }, status=status.HTTP_400_BAD_REQUEST)
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        queued = _queue_export(request, 'salary')
+        if queued is not None:
+            return queued
+        return export_queryset(request, self.get_queryset(), SALARY_HISTORY_COLUMNS, 'salary_history', date_field='changed_at__date', department_field='employee__department')
+
+    @action(detail=False, methods=['get'])
+    @cache_response()
+    def as_of(self, request):
+        date, at = request.query_params.get('date'), request.query_params.get('at')
+        if bool(date) == bool(at):
+            return Response({"error": "Provide exactly one of date or at."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            # A date means the end of that day; a timestamp includes changes made at that instant.
+            until = filters.next_day_start(date) if date else filters.moment(at) + datetime.timedelta(microseconds=1)
+        except ValueError as error:
+            return Response({"date" if date else "at": [str(error)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        employees = employed_at(until)
+        department = request.query_params.get('department')
+        if department:
+            employees = employees.filter(department=department)
+
+        # No view, so the pages keep EmployeePagination's id order: this
+        # viewset's ordering fields are SalaryHistory's.
+        paginator = EmployeePagination()
+        page = paginator.paginate_queryset(salaries_as_of(until, employees.only('id', 'name', 'department')), request)
+        return paginator.get_paginated_response([
+            {
+                "employee_id": employee.id,
+                "employee_name": employee.name,
+                "department": employee.department,
+                "salary": None if employee.salary_as_of is None else f"₱{employee.salary_as_of:,.2f}",
+            } for employee in page
+        ])
+
+    @action(detail=False, methods=['get'])
+    @cache_response(SalaryHistory, Employee, PayrollSnapshot)
+    def payroll(self, request):
+        months = {}
+        for param in ('start', 'end'):
+            try:
+                months[param] = filters.month(request.query_params.get(param, ''))
+            except ValueError as error:
+                return Response({param: [str(error)]}, status=status.HTTP_400_BAD_REQUEST)
+        if months['start'] > months['end']:
+            return Response({"end": ["End month must not be before start month."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            return Response(payroll_totals(months['start'], months['end']))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'])
+    def bulk_adjust(self, request):
+        rules = {key: request.data.get(key) for key in ('salaries', 'percentage', 'department', 'department_percentages')}
+        try:
+            size = salary_adjustment_size(**rules)
+            if size > inline_limit():
+                return _accepted(request, enqueue('bulk_adjust_salaries', {**rules, 'size': size}, request.user))
+            changes, missing = bulk_adjust_salaries(**rules)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(adjustment_summary(changes, missing), status=status.HTTP_200_OK)
+
+class PerformanceViewSet(CachedReadMixin, FastListMixin, PlannedQuerysetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = PerformanceReviewSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PerformanceReviewPagination
+    cache_models = (PerformanceReview, Employee)
+    filter_params = {
+        'employee': ('employee_id', filters.integer),
+        'rating_min': ('rating__gte', filters.integer),
+        'rating_max': ('rating__lte', filters.integer),
+    }
+    ordering_fields = ('created_at', 'rating', 'id')
 
     def get_queryset(self):
             return PerformanceReview.objects.filter(employee__archived=False)
 
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            record_review(serializer.save())
+
+    def perform_update(self, serializer):
+        previous = serializer.instance.employee_id
+        with transaction.atomic():
+            review = serializer.save()
+            refresh_leaderboard([previous, review.employee_id])
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            models_changed(PerformanceReview)
+            refresh_leaderboard([instance.employee_id])
+
     @action(detail=True, methods=['get'])
+    @cache_response()
     def performance_reviews(self, request, pk=None):
         try:
             employee = Employee.objects.get(id=pk)
             reviews = PerformanceReview.objects.filter(employee=employee)
-            data = [{"employee_id": review.employee.id, "employee_name": review.employee.name, "review": review.review, "rating": review.rating} for review in reviews]
+            data = [{"employee_id": employee.id, "employee_name": employee.name, "review": review.review, "rating": review.rating} for review in reviews]
             return Response(data)
         except Employee.DoesNotExist:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -179,7 +384,7 @@ class PerformanceViewSet(viewsets.ModelViewSet):
             review = request.data.get('review')
             rating = request.data.get('rating')
 
-            if not review or not rating:
+            if not review or rating in (None, ''):
                 return Response({
                                     "review": [
                                                 "This field is required."
@@ -189,19 +394,66 @@ class PerformanceViewSet(viewsets.ModelViewSet):
                                             ],  
                                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            performance = PerformanceReview.objects.create(
-                employee=employee,
-                review=review,
-                rating=rating
-            )
+            try:
+                rating = filters.integer(str(rating))
+            except ValueError as error:
+                return Response({"rating": [str(error)]}, status=status.HTTP_400_BAD_REQUEST)
+            if rating not in RATINGS:
+                return Response({"rating": [f"Enter a whole number from {RATINGS[0]} to {RATINGS[-1]}."]}, status=status.HTTP_400_BAD_REQUEST)
+
+            with transaction.atomic():
+                performance = PerformanceReview.objects.create(
+                    employee=employee,
+                    review=review,
+                    rating=rating
+                )
+                record_review(performance)
             return Response({"message": f"Performance review submitted for {employee.name}"}, status=status.HTTP_201_CREATED)
         except Employee.DoesNotExist:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk_submit(self, request):
+        reviews = request.data.get('reviews') if isinstance(request.data, dict) else request.data
+        if not isinstance(reviews, list) or not reviews:
+            return Response({
+                                "reviews": [
+                                    "A non-empty list of reviews is required."
+                                ]
+                            }, status=status.HTTP_400_BAD_REQUEST)
+
+        results = submit_reviews(reviews)
+        errors = sum(1 for result in results if result['status'] == 'error')
+
+        return Response({
+            "created": len(results) - errors,
+            "errors": errors,
+            "results": results
+        }, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['get'])
+    @cache_response(PerformanceReview, Employee, LeaderboardEntry)
     def top_performers(self, request):
-        top_performers = PerformanceReview.objects.filter(rating__gte=9).select_related('employee')
-        data = [{"employee_id": review.employee.id, "employee_name": review.employee.name, "rating": review.rating} for review in top_performers]
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        except ValueError:
+            return Response({"limit": ["Enter a whole number."]}, status=status.HTTP_400_BAD_REQUEST)
+        min_rating = request.query_params.get('min_rating') or None
+        if min_rating:
+            try:
+                min_rating = float(filters.decimal(min_rating))
+            except ValueError as error:
+                return Response({"min_rating": [str(error)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = top_performers(limit, request.query_params.get('department'), min_rating)
+        data = [{
+            "employee_id": entry.employee_id,
+            "employee_name": entry.employee.name,
+            "department": entry.department,
+            "average_rating": round(entry.average_rating, 2),
+            "latest_rating": entry.latest_rating,
+            "review_count": entry.review_count,
+        } for entry in entries]
         return Response(data)
 
     @action(detail=True, methods=['delete'])
@@ -210,28 +462,58 @@ class PerformanceViewSet(viewsets.ModelViewSet):
         try:
             employee = Employee.objects.get(id=pk)
             review = PerformanceReview.objects.get(id=review_id, employee=employee)
-            review.delete()
+            with transaction.atomic():
+                review.delete()
+                models_changed(PerformanceReview)
+                refresh_leaderboard([employee.id])
             return Response({"message": "Performance review removed"}, status=status.HTTP_204_NO_CONTENT)
         except Employee.DoesNotExist:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
         except PerformanceReview.DoesNotExist:
             return Response({"review_id": ["This field is required."]}, status=status.HTTP_404_NOT_FOUND)
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(CachedReadMixin, FastListMixin, PlannedQuerysetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = AttendanceSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = AttendancePagination
+    cache_models = (Attendance, Employee)
+    filter_params = {
+        'employee': ('employee_id', filters.integer),
+        'status': ('status', str),
+        'start': ('date__gte', filters.date),
+        'end': ('date__lte', filters.date),
+    }
+    ordering_fields = ('date', 'id')
 
     def get_queryset(self):
             return Attendance.objects.filter(employee__archived=False)
 
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            attendance = serializer.save()
+            refresh_attendance_rollups([(attendance.employee_id, attendance.date)])
+
+    def perform_update(self, serializer):
+        previous = (serializer.instance.employee_id, serializer.instance.date)
+        with transaction.atomic():
+            attendance = serializer.save()
+            refresh_attendance_rollups([previous, (attendance.employee_id, attendance.date)])
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            models_changed(Attendance)
+            refresh_attendance_rollups([(instance.employee_id, instance.date)])
+
     @action(detail=True, methods=['get'])
+    @cache_response()
     def employee_attendance(self, request, pk=None):
         employee = Employee.objects.filter(pk=pk).first()
 
         if not employee:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        attendance = Attendance.objects.filter(employee=employee)
+        attendance = self.plan_queryset(Attendance.objects.filter(employee=employee))
         if not attendance.exists():
             return Response({"message": "No attendance records found for this employee."}, status=status.HTTP_404_NOT_FOUND)
         
@@ -244,15 +526,10 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         if not employee:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        today = now().date()
-        attendance, created = Attendance.objects.get_or_create(
-            employee=employee,
-            date=today,
-            defaults={'check_in_time': now().time(), 'status': 'Present'}
-        )
-
-        if not created:
-            return Response({"error": "Check-in already recorded"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            attendance = record_check_in(employee)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({
             "message": "Check-in recorded",
@@ -265,49 +542,103 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         if not employee:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        today = now().date()
-        attendance = Attendance.objects.filter(employee=employee, date=today).first()
-
-        if not attendance:
-            return Response({"error": "No check-in record found"}, status=status.HTTP_400_BAD_REQUEST)
-
-        if attendance.check_out_time:
-            return Response({"error": "Check-out already recorded"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            attendance = record_check_out(employee)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        attendance.check_out_time = now().time()
+        return Response({
+            "message": "Check-out recorded",
+            "attendance": AttendanceSerializer(attendance).data
+        }, status=status.HTTP_200_OK)
 
-        check_in_time = attendance.check_in_time
-        if check_in_time:
-            time_difference = (now() - now().replace(hour=check_in_time.hour, minute=check_in_time.minute)).total_seconds()
-            hours_worked = time_difference / 3600
-            overtime = max(0, hours_worked - 8)
-            attendance.overtime_hours = overtime
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        queued = _queue_export(request, 'attendance')
+        if queued is not None:
+            return queued
+        return export_queryset(request, self.get_queryset(), ATTENDANCE_COLUMNS, 'attendance', date_field='date', department_field='employee__department')
+
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def ingest(self, request):
+        events = request.data.get('events') if isinstance(request.data, dict) else request.data
+        if not isinstance(events, list) or not events:
+            return Response({
+                                "events": [
+                                    "A non-empty list of events is required."
+                                ]
+                            }, status=status.HTTP_400_BAD_REQUEST)
 
-        attendance.save()
+        results = ingest_attendance(events)
+        counts = {'created': 0, 'updated': 0, 'error': 0}
+        for result in results:
+            counts[result['status']] += 1
 
         return Response({
-            "message": "Check-out recorded",
-            "attendance": AttendanceSerializer(attendance).data
+            "created": counts['created'],
+            "updated": counts['updated'],
+            "errors": counts['error'],
+            "results": results
         }, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'])
+    @cache_response(Attendance, AttendanceRollup, Employee)
     def overtime_hours(self, request, pk=None):
         employee = Employee.objects.filter(pk=pk).first()
         
         if not employee:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        total_overtime = Attendance.objects.filter(employee=employee).aggregate(total=Sum('overtime_hours'))['total'] or 0
+        total_overtime = AttendanceRollup.objects.filter(employee=employee).aggregate(total=Sum('overtime_hours'))['total'] or 0
         return Response({"overtime_hours": total_overtime})
 
+    @action(detail=False, methods=['get'])
+    @cache_response(Attendance, AttendanceRollup, Employee)
+    def overtime_summary(self, request):
+        rollups = AttendanceRollup.objects.filter(employee__archived=False)
+
+        employee_ids = request.query_params.get('employee_ids')
+        if employee_ids:
+            try:
+                rollups = rollups.filter(employee_id__in=[int(value) for value in employee_ids.split(',')])
+            except ValueError:
+                return Response({"employee_ids": ["Enter a comma-separated list of employee ids."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        department = request.query_params.get('department')
+        if department:
+            rollups = rollups.filter(employee__department=department)
+
+        for param, lookup in (('start', 'month__gte'), ('end', 'month__lte')):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    month = datetime.datetime.strptime(value, '%Y-%m').date()
+                except ValueError:
+                    return Response({param: ["Enter a month as YYYY-MM."]}, status=status.HTTP_400_BAD_REQUEST)
+                rollups = rollups.filter(**{lookup: month})
+
+        totals = (
+            rollups.values('employee_id', 'employee__name')
+            .annotate(overtime_hours=Sum('overtime_hours'))
+            .order_by('employee_id')
+        )
+        return Response([
+            {
+                "employee_id": row['employee_id'],
+                "employee_name": row['employee__name'],
+                "overtime_hours": row['overtime_hours'] or 0
+            } for row in totals
+        ])
+
     @action(detail=True, methods=['get'])
+    @cache_response()
     def leave_history(self, request, pk=None):
         employee = Employee.objects.filter(pk=pk).first()
         
         if not employee:
             return Response({"error": "Employee not found"}, status=404)
         
-        leaves = Attendance.objects.filter(employee=employee, status='leave')
+        leaves = self.plan_queryset(Attendance.objects.filter(employee=employee, status='leave'))
 
         if not leaves.exists():
             return Response({"message": "No leave records found"}, status=404)
@@ -329,7 +660,12 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                                     ]
                             }, status=status.HTTP_400_BAD_REQUEST)
 
-        leave_record = Attendance.objects.create(employee=employee, date=date, status='leave')
+        try:
+            with transaction.atomic():
+                leave_record = Attendance.objects.create(employee=employee, date=date, status='leave')
+                refresh_attendance_rollups([(employee.id, leave_record.date)])
+        except IntegrityError:
+            return Response({"date": ["Attendance already recorded for this date."]}, status=status.HTTP_400_BAD_REQUEST)
         return Response(AttendanceSerializer(leave_record).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['patch'])
@@ -356,11 +692,16 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 }, status=status.HTTP_404_NOT_FOUND)
 
         if approval == "approve":
-            leave_record.status = "on leave"
-            leave_record.save()
+            with transaction.atomic():
+                leave_record.status = "on leave"
+                leave_record.save()
+                refresh_attendance_rollups([(employee.id, leave_record.date)])
             return Response({"message": "Leave approved"})
         elif approval == "reject":
-            leave_record.delete()
+            with transaction.atomic():
+                leave_record.delete()
+                models_changed(Attendance)
+                refresh_attendance_rollups([(employee.id, leave_record.date)])
             return Response({"message": "Leave rejected"})
         else:
             return Response({
@@ -385,7 +726,10 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                     ]
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        deleted_count, _ = Attendance.objects.filter(employee=employee, date__in=dates).delete()
+        with transaction.atomic():
+            deleted_count, _ = Attendance.objects.filter(employee=employee, date__in=dates).delete()
+            models_changed(Attendance)
+            refresh_attendance_rollups([(employee.id, date) for date in dates])
 
         if deleted_count == 0:
             return Response({"message": "No matching attendance records found"}, status=status.HTTP_404_NOT_FOUND)
@@ -399,12 +743,67 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         if not employee:
             return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
 
+        # Counts no further than the limit; bigger deletes run as a job, chunk by chunk.
+        limit = inline_limit()
+        if Attendance.objects.filter(employee=employee)[:limit + 1].count() > limit:
+            return _accepted(request, enqueue('delete_all_attendance', {'employee_id': employee.id}, request.user))
+
         # Delete all attendance records for the given employee
-        deleted_count, _ = Attendance.objects.filter(employee=employee).delete()
+        with transaction.atomic():
+            deleted_count, _ = Attendance.objects.filter(employee=employee).delete()
+            models_changed(Attendance)
+            AttendanceRollup.objects.filter(employee=employee).delete()
 
         if deleted_count == 0:
             return Response({"message": "No attendance records found for this employee"}, status=status.HTTP_404_NOT_FOUND)
 
         return Response({
             "message": f"Deleted {deleted_count} attendance records for {employee.name}"
-        }, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        }, status=status.HTTP_204_NO_CONTENT)
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+
+    @action(detail=False, methods=['get'])
+    @cache_response(Employee, PerformanceReview, Attendance)
+    def departments(self, request):
+        window = {}
+        for param in ('start', 'end'):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    window[param] = filters.date(value)
+                except ValueError as error:
+                    return Response({param: [str(error)]}, status=status.HTTP_400_BAD_REQUEST)
+        if 'start' in window and 'end' in window and window['start'] > window['end']:
+            return Response({"end": ["End date must not be before start date."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "start": window.get('start'),
+            "end": window.get('end'),
+            "departments": department_analytics(**window),
+        })
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = JobPagination
+
+    def get_queryset(self):
+        jobs = Job.objects.all()
+        if not self.request.user.is_staff:
+            jobs = jobs.filter(requested_by_id=self.request.user.pk)
+        return jobs
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.kind != 'export':
+            return Response({"error": "This job has no file to download"}, status=status.HTTP_404_NOT_FOUND)
+        if job.status != 'succeeded':
+            return Response({"error": f"The export is {job.status}", "status": job.status}, status=status.HTTP_409_CONFLICT)
+
+        path = export_dir() / job.result['file']
+        if not path.exists():
+            return Response({"error": "The export file no longer exists"}, status=status.HTTP_410_GONE)
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=job.result['filename'])
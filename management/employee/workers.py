@@ -0,0 +1,13 @@
+"""
+Set-up for the job worker processes. It lives apart from employee.jobs,
+which imports the models and so can't be loaded before django.setup().
+"""
+import django
+
+
+def setup(database_names):
+    django.setup()
+    from django.db import connections
+    # Follow the parent onto the database it is using, e.g. a test database.
+    for alias, name in database_names.items():
+        connections[alias].settings_dict['NAME'] = name
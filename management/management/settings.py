@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import importlib.util
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,11 +45,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'employee.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'employee.routers.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -76,12 +80,82 @@ WSGI_APPLICATION = 'management.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Pick a profile with DB_PROFILE=sqlite (default) or DB_PROFILE=postgres.
+
+DB_PROFILE = os.environ.get('DB_PROFILE', 'sqlite')
+
+if DB_PROFILE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'management'),
+            'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+        }
     }
+    if os.environ.get('POSTGRES_POOL', '0') == '1':
+        # psycopg's pool replaces persistent connections; Django requires
+        # CONN_MAX_AGE = 0 when it is enabled.
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.environ.get('POSTGRES_POOL_MIN', 2)),
+                'max_size': int(os.environ.get('POSTGRES_POOL_MAX', 20)),
+                'timeout': 10,
+            },
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # Take the write lock at BEGIN so concurrent writers queue on
+                # busy_timeout instead of failing with "database is locked".
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        }
+    }
+
+# Read replicas for the employee app, as comma-separated hosts (postgres) or
+# file paths (sqlite). employee.routers sends reads there and writes to
+# 'default'; a client's reads stay on the primary for REPLICA_PIN_SECONDS
+# after each of its writes.
+
+DATABASE_REPLICAS = []
+_replicas = [value for value in os.environ.get('DB_REPLICAS', '').split(',') if value]
+for _index, _replica in enumerate(_replicas, start=1):
+    _alias = f'replica{_index}'
+    DATABASES[_alias] = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if DB_PROFILE == 'postgres':
+        DATABASES[_alias]['HOST'] = _replica
+    else:
+        DATABASES[_alias]['NAME'] = _replica
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ['employee.routers.PrimaryReplicaRouter']
+
+REPLICA_PIN_SECONDS = 5
+
+# Applied to every new SQLite connection by employee.db. WAL lets reads run
+# alongside a write, but it converts the database file for good and keeps
+# -wal/-shm files next to it, so it's opt-in (SQLITE_WAL=1) for deployments
+# with their own database file rather than the checked-in db.sqlite3.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 20000,
+    'mmap_size': 268435456,
+    'cache_size': -65536,
+    'temp_store': 'MEMORY',
 }
+if os.environ.get('SQLITE_WAL', '0') == '1':
+    SQLITE_PRAGMAS.update({'journal_mode': 'WAL', 'synchronous': 'NORMAL'})
 
 
 # Password validation
@@ -103,6 +177,41 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Argon2 or bcrypt when their libraries are installed, else PBKDF2; the rest
+# stay listed so existing hashes still verify and get upgraded on login.
+# PASSWORD_HASHER_COST tunes the work factor of the employee.hashers classes.
+# Left empty they use Django's defaults, which rise with each release; set a
+# cost only to pin it, since every login rehashes to the configured cost.
+
+PASSWORD_HASHERS = [
+    hasher for library, hasher in [
+        ('argon2', 'employee.hashers.Argon2PasswordHasher'),
+        ('bcrypt', 'employee.hashers.BCryptSHA256PasswordHasher'),
+    ]
+    if importlib.util.find_spec(library) is not None
+] + [
+    'employee.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+PASSWORD_HASHER_COST = {}
+for _algorithm, _name, _variable in [
+    ('argon2', 'time_cost', 'ARGON2_TIME_COST'),
+    ('argon2', 'memory_cost', 'ARGON2_MEMORY_COST'),
+    ('argon2', 'parallelism', 'ARGON2_PARALLELISM'),
+    ('bcrypt', 'rounds', 'BCRYPT_ROUNDS'),
+    ('pbkdf2', 'iterations', 'PBKDF2_ITERATIONS'),
+]:
+    if os.environ.get(_variable):
+        PASSWORD_HASHER_COST.setdefault(_algorithm, {})[_name] = int(os.environ[_variable])
+
+# last_login is written at most once per LAST_LOGIN_INTERVAL seconds per
+# user; logins in between are buffered by employee.logins.
+
+LAST_LOGIN_INTERVAL = 5 * 60
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -133,19 +242,84 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.JSONParser',  # Parse JSON Input
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'employee.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
         'rest_framework.permissions.IsAuthenticated',  # Allow API access to everyone
     ],
+    'DEFAULT_PAGINATION_CLASS': 'employee.pagination.KeysetPagination',
+    'DEFAULT_FILTER_BACKENDS': [
+        'employee.filters.QueryParamFilter',
+        'employee.filters.StableOrderingFilter',
+    ],
+    'PAGE_SIZE': 50,
 }
 
 AUTH_USER_MODEL = 'employee.CustomUser'
 
+# Serve list endpoints from values() rows through a precompiled field plan
+# (employee.fastpath) instead of full ModelSerializer instances.
+FAST_READ_SERIALIZERS = False
+
+# Response cache for the read actions in employee.views. LRUBackend lives in
+# one process; when several workers serve the API use
+# {'BACKEND': 'employee.cache.RedisBackend', 'OPTIONS': {'url': 'redis://...'}}.
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'BACKEND': 'employee.cache.LRUBackend',
+    'OPTIONS': {'max_entries': 2000},
+    'TIMEOUT': 300,
+}
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
-}
\ No newline at end of file
+}
+
+# employee.authentication builds request.user from token claims. The active
+# flag and revocation time are re-read at most every STATE_TTL seconds per
+# user; STRICT loads the full user row on every request instead.
+JWT_CLAIMS_AUTH = {
+    'STRICT': False,
+    'STATE_TTL': 30,
+    'MAX_ENTRIES': 10000,
+}
+# employee.payroll: a month's salary covers WORKING_DAYS of HOURS_PER_DAY.
+# Overtime is paid at OVERTIME_MULTIPLIER times the hourly rate; leave days
+# beyond PAID_LEAVE_DAYS a month are deducted at the daily rate.
+PAYROLL = {
+    'WORKING_DAYS': 22,
+    'HOURS_PER_DAY': 8,
+    'OVERTIME_MULTIPLIER': 1.25,
+    'PAID_LEAVE_DAYS': 1,
+}
+
+# employee.metrics: per-action latency histograms, query counts and SQL,
+# serialization and render time, served at /metrics to staff users and to
+# scrapers sending `Authorization: Bearer $METRICS_TOKEN`. Requests slower
+# than SLOW_REQUEST_SECONDS are logged with their slowest
+# SLOW_REQUEST_QUERIES statements.
+METRICS = {
+    'ENABLED': True,
+    'SLOW_REQUEST_SECONDS': None,
+    'SLOW_REQUEST_QUERIES': 10,
+    'TOKEN': os.environ.get('METRICS_TOKEN') or None,
+}
+
+# employee.jobs: deletes, exports and salary adjustments bigger than
+# INLINE_LIMIT rows answer 202 and run as jobs, in CHUNK_SIZE-row chunks on a
+# pool of WORKERS processes (threads with POOL 'thread'). With RUN_IN_PROCESS
+# off, web processes only queue jobs and `manage.py run_jobs` runs them.
+# Background exports are written to EXPORT_DIR (default BASE_DIR/exports).
+JOBS = {
+    'RUN_IN_PROCESS': True,
+    'POOL': 'process',
+    'WORKERS': None,
+    'CONCURRENT_JOBS': 2,
+    'CHUNK_SIZE': 5000,
+    'INLINE_LIMIT': 10000,
+    'EXPORT_DIR': None,
+}